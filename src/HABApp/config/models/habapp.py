@@ -1,3 +1,5 @@
+from typing import Dict, Literal, Optional
+
 from pydantic import Field, conint
 
 from easyconfig import BaseModel
@@ -10,7 +12,33 @@ class ThreadPoolConfig(BaseModel):
     If the thread pool is disabled using blocking calls in functions can and will break HABApp"""
 
     threads: conint(ge=1, le=16) = 10
-    """Amount of threads to use for the executor"""
+    """Amount of threads to use for the executor. If ``min threads`` is set this is the maximum amount of threads"""
+
+    min_threads: Optional[conint(ge=1, le=16)] = Field(None, alias='min threads')
+    """If set the amount of callbacks that run in parallel is adjusted automatically between this value
+    and ``threads``. It is increased when callbacks have to wait longer than the target latency to be started and
+    decreased again when no callback had to wait for some time.
+    Threads that have been started once stay alive (idle) when the amount is decreased."""
+
+    target_latency: float = Field(0.05, alias='target latency', gt=0)
+    """Maximum time in seconds a callback should wait for a free thread before another thread is added"""
+
+    queue_size: conint(ge=0) = Field(0, alias='queue size')
+    """Maximum amount of callbacks waiting for a free thread. When the queue is full the policy of the
+    listener decides what happens (see ``queue_policy`` of ``listen_event``).
+    0 means unlimited (default), so no events are dropped."""
+
+    profiler: Literal['off', 'always', 'sampled', 'watchdog'] = 'watchdog'
+    """How the details for callbacks that take too long are collected:
+
+    - ``off``: no details
+    - ``always``: profile every call (high overhead)
+    - ``sampled``: profile only every n-th call of a callback (see ``profiler sample rate``)
+    - ``watchdog``: a background thread samples the stacks of the callbacks that are still running
+      after the warning threshold"""
+
+    profiler_sample_rate: conint(ge=1) = Field(10, alias='profiler sample rate')
+    """Profile every n-th call of a callback when the profiler is set to ``sampled``"""
 
 
 class LoggingConfig(BaseModel):
@@ -20,9 +48,40 @@ class LoggingConfig(BaseModel):
     flush_every: float = Field(0.5, alias='flush every', ge=0.1)
     """Wait time in seconds before the buffer gets flushed again when it was empty"""
 
+    sample_topics: Dict[str, conint(ge=1)] = Field({}, alias='sample topics')
+    """Write only every n-th event of a topic to the event log, e.g. ``Power_*: 10``.
+    The topic can contain ``*`` as a wildcard"""
+
+    sample_events: Dict[str, conint(ge=1)] = Field({}, alias='sample events')
+    """Write only every n-th event of an event class (per topic) to the event log, e.g. ``ItemStateEvent: 10``.
+    A matching entry in ``sample topics`` takes precedence"""
+
+
+class MetricsConfig(BaseModel):
+    enabled: bool = False
+    """Periodically post the internal HABApp metrics (e.g. thread pool queue size) to HABApp items"""
+
+    interval: float = Field(10, ge=1)
+    """Interval in seconds in which the metrics are posted"""
+
+    prefix: str = 'HABApp_'
+    """Prefix for the item names. The item name will be ``{prefix}{component}_{metric}``"""
+
+
+class ItemHistoryConfig(BaseModel):
+    items: Dict[str, conint(ge=1)] = {}
+    """Keep the last n values of the items in a history, e.g. ``Temperature_*: 1000``.
+    The name can contain ``*`` as a wildcard. The history is created when the item is added,
+    so a change of this value has no effect on items which already exist."""
+
+    max_entries: conint(ge=0) = Field(1_000_000, alias='max entries')
+    """Maximum amount of history entries of all items together. 0 means unlimited."""
+
 
 class HABAppConfig(BaseModel):
     """HABApp internal configuration. Only change values if you know what you are doing!"""
 
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     thread_pool: ThreadPoolConfig = Field(default_factory=ThreadPoolConfig, alias='thread pool')
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+    item_history: ItemHistoryConfig = Field(default_factory=ItemHistoryConfig, alias='item history')
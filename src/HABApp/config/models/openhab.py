@@ -27,6 +27,10 @@ class General(BaseModel):
         70, ge=0, le=100, in_file=False,
         description='Minimum openHAB start level to load items and listen to events',
     )
+    incremental_sync: bool = Field(
+        True, in_file=False,
+        description='On reconnect only create and update the items and things whose definition has changed',
+    )
 
 
 class Connection(BaseModel):
@@ -43,6 +47,12 @@ class Connection(BaseModel):
         'Increase only if you get error messages or disconnects e.g. if you use large images.'
     )
 
+    request_workers: int = Field(
+        4, ge=1, le=32, alias='request workers', in_file=False,
+        description='Amount of concurrent requests which are used to send the updates and commands to openHAB. '
+                    'The messages for an item are always sent in order.'
+    )
+
     topic_filter: str = Field(
         'openhab/items/*,'      # Item updates
         'openhab/channels/*,'   # Channel update
@@ -54,6 +64,17 @@ class Connection(BaseModel):
                     'matching this filter will be sent to HABApp.'
     )
 
+    auto_topic_filter: bool = Field(
+        False, alias='auto topic filter', in_file=False,
+        description='Create the topic filter automatically so openHAB only sends the events of the items which have '
+                    'a listener. The states of all other items will not be updated and will be outdated! '
+                    'Disabled by default.'
+    )
+    auto_topic_filter_debounce: float = Field(
+        5, gt=0, alias='auto topic filter debounce', in_file=False,
+        description='Seconds without a change of the listeners before the automatic topic filter is updated'
+    )
+
     @validator('buffer')
     def validate_see_buffer(cls, value: ByteSize):
         valid_values = (
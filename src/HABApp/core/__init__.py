@@ -11,6 +11,7 @@ from HABApp.core import internals
 
 from HABApp.core import wrapper
 from HABApp.core import logger
+from HABApp.core import metrics
 
 # isort: split
 
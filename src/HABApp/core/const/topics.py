@@ -7,11 +7,13 @@ TOPIC_ERRORS: Final   = 'HABApp.Errors'
 
 TOPIC_FILES: Final = 'HABApp.Files'
 
+TOPIC_ITEM_REGISTRY: Final = 'HABApp.ItemRegistry'
+
 
 ALL_TOPICS: Tuple[str, ...] = (
     TOPIC_INFOS, TOPIC_WARNINGS, TOPIC_ERRORS,
 
-    TOPIC_FILES
+    TOPIC_FILES, TOPIC_ITEM_REGISTRY
 )
 
 
@@ -1,5 +1,5 @@
 from . import habapp_events
 from .events import ComplexEventValue, ValueUpdateEvent, ValueChangeEvent, \
-    ItemNoChangeEvent, ItemNoUpdateEvent
+    ItemNoChangeEvent, ItemNoUpdateEvent, CoalescedEvent
 from .filter import NoEventFilter, OrFilterGroup, AndFilterGroup, ValueUpdateEventFilter, ValueChangeEventFilter, \
     EventFilter
@@ -74,3 +74,24 @@ class ItemNoUpdateEvent:
 
     def __repr__(self):
         return f'<{self.__class__.__name__} name: {self.name}, seconds: {self.seconds}>'
+
+
+class CoalescedEvent:
+    """Passed to the callback of a listener with ``coalesce``.
+
+    :ivar str   name: name of the item (or the topic if the event has no name)
+    :ivar       event: the latest event of the period
+    :ivar int   skipped: amount of events which were replaced by this event
+    """
+
+    name: str
+    event: Any
+    skipped: int
+
+    def __init__(self, name: str = None, event=None, skipped: int = 0):
+        self.name: str = name
+        self.event = event
+        self.skipped: int = skipped
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} name: {self.name}, event: {self.event}, skipped: {self.skipped}>'
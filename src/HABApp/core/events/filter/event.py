@@ -1,6 +1,8 @@
+from typing import Optional, Tuple
+
 from HABApp.core.const import MISSING
 from HABApp.core.const.hints import HINT_ANY_CLASS
-from HABApp.core.internals import EventFilterBase
+from HABApp.core.internals import EventFilterBase, EventFilterCompiler
 
 
 class EventFilter(EventFilterBase):
@@ -48,6 +50,24 @@ class EventFilter(EventFilterBase):
 
         return True
 
+    def get_event_classes(self) -> Optional[Tuple[type, ...]]:
+        # A custom trigger might also match other events
+        if self.__class__.trigger is not EventFilter.trigger:
+            return super().get_event_classes()
+        return (self.event_class, )
+
+    def get_trigger_expr(self, compiler: EventFilterCompiler) -> str:
+        # Subclasses with a custom trigger can not be inlined
+        if self.__class__.trigger is not EventFilter.trigger:
+            return super().get_trigger_expr(compiler)
+
+        # Same logic as in trigger
+        parts = [f'isinstance(event, {compiler.add_obj(self.event_class)})']
+        for name, value in ((self.attr_name1, self.attr_value1), (self.attr_name2, self.attr_value2)):
+            if name is not None:
+                parts.append(f'not getattr(event, {name!r}, None) != {compiler.add_obj(value)}')
+        return f'({" and ".join(parts)})'
+
     def describe(self) -> str:
 
         values = ''
@@ -1,6 +1,6 @@
-from typing import Any, Tuple
+from typing import Any, Optional, Tuple
 
-from HABApp.core.internals import EventFilterBase, HINT_EVENT_FILTER_OBJ
+from HABApp.core.internals import EventFilterBase, EventFilterCompiler, HINT_EVENT_FILTER_OBJ
 
 
 class EventFilterBaseGroup(EventFilterBase):
@@ -23,6 +23,23 @@ class OrFilterGroup(EventFilterBaseGroup):
                 return True
         return False
 
+    def get_event_classes(self) -> Optional[Tuple[type, ...]]:
+        # Union of the event classes, if one child can match every event the group can, too
+        classes = []
+        for f in self.filters:
+            f_classes = f.get_event_classes()
+            if f_classes is None:
+                return None
+            classes.extend(c for c in f_classes if c not in classes)
+        return tuple(classes)
+
+    def get_trigger_expr(self, compiler: EventFilterCompiler) -> str:
+        if self.__class__.trigger is not OrFilterGroup.trigger:
+            return super().get_trigger_expr(compiler)
+        if not self.filters:
+            return 'False'
+        return f'({" or ".join(f.get_trigger_expr(compiler) for f in self.filters)})'
+
     def describe(self) -> str:
         objs = [f.describe() for f in self.filters]
         return f'({" or ".join(objs)})'
@@ -37,6 +54,23 @@ class AndFilterGroup(EventFilterBaseGroup):
                 return False
         return True
 
+    def get_event_classes(self) -> Optional[Tuple[type, ...]]:
+        # Every child has to match so the event classes of any child are a valid restriction.
+        # Use the child with the fewest event classes.
+        ret = None
+        for f in self.filters:
+            f_classes = f.get_event_classes()
+            if f_classes is not None and (ret is None or len(f_classes) < len(ret)):
+                ret = f_classes
+        return ret
+
+    def get_trigger_expr(self, compiler: EventFilterCompiler) -> str:
+        if self.__class__.trigger is not AndFilterGroup.trigger:
+            return super().get_trigger_expr(compiler)
+        if not self.filters:
+            return 'True'
+        return f'({" and ".join(f.get_trigger_expr(compiler) for f in self.filters)})'
+
     def describe(self) -> str:
         objs = [f.describe() for f in self.filters]
         return f'({" and ".join(objs)})'
@@ -1,4 +1,4 @@
-from HABApp.core.internals import EventFilterBase
+from HABApp.core.internals import EventFilterBase, EventFilterCompiler
 
 
 class NoEventFilter(EventFilterBase):
@@ -7,5 +7,10 @@ class NoEventFilter(EventFilterBase):
     def trigger(self, event) -> bool:
         return True
 
+    def get_trigger_expr(self, compiler: EventFilterCompiler) -> str:
+        if self.__class__.trigger is not NoEventFilter.trigger:
+            return super().get_trigger_expr(compiler)
+        return 'True'
+
     def describe(self) -> str:
         return f'{self.__class__.__name__}()'
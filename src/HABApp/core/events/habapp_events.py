@@ -1,3 +1,6 @@
+from typing import Tuple
+
+
 class __FileEventBase:
     def __init__(self, name: str):
         self.name: str = name
@@ -38,3 +41,22 @@ class HABAppException:
     def to_str(self) -> str:
         """Create a readable str with all information"""
         return f'Exception in {self.func_name}: {self.exception}\n{self.traceback}'
+
+
+class ItemRegistrySyncEvent:
+    """Is posted once after the item registry was synchronized with the items of a connection (e.g. openHAB)
+
+    :ivar str source: name of the connection
+    :ivar Tuple[str, ...] added: names of the added items
+    :ivar Tuple[str, ...] updated: names of the updated items
+    :ivar Tuple[str, ...] removed: names of the removed items
+    """
+    def __init__(self, source: str, added: Tuple[str, ...], updated: Tuple[str, ...], removed: Tuple[str, ...]):
+        self.source: str = source
+        self.added: Tuple[str, ...] = added
+        self.updated: Tuple[str, ...] = updated
+        self.removed: Tuple[str, ...] = removed
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} source: {self.source}, added: {len(self.added):d}, ' \
+               f'updated: {len(self.updated):d}, removed: {len(self.removed):d}>'
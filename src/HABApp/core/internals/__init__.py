@@ -3,12 +3,13 @@ from .context import ContextProvidingObj, Context, ContextBoundObj, get_current_
 
 # isort: split
 
-from .event_filter import EventFilterBase, HINT_EVENT_FILTER_OBJ
+from .event_filter import EventFilterBase, EventFilterCompiler, HINT_EVENT_FILTER_OBJ
 from .event_bus import EventBus, HINT_EVENT_BUS
 from .item_registry import HINT_ITEM_REGISTRY, ItemRegistry, ItemRegistryItem
 
 # isort: split
 
-from .event_bus_listener import HINT_EVENT_BUS_LISTENER, EventBusListener, ContextBoundEventBusListener
+from .event_bus_listener import HINT_EVENT_BUS_LISTENER, EventBusListener, ContextBoundEventBusListener, \
+    CoalescingEventBusListener
 from .event_filter import EventFilterBase, HINT_EVENT_FILTER_OBJ
-from .wrapped_function import TYPE_WRAPPED_FUNC_OBJ, wrap_func
+from .wrapped_function import TYPE_WRAPPED_FUNC_OBJ, HINT_QUEUE_POLICY, HINT_SERIAL_MODE, wrap_func
@@ -1,2 +1,3 @@
 from .base_listener import EventBusBaseListener
+from .topic_index import TopicPattern, is_topic_pattern
 from .event_bus import EventBus, HINT_EVENT_BUS
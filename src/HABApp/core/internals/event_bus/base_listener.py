@@ -1,3 +1,6 @@
+from typing import Optional, Tuple
+
+
 class EventBusBaseListener:
     def __init__(self, topic: str, **kwargs):
         super().__init__(**kwargs)
@@ -9,3 +12,7 @@ class EventBusBaseListener:
 
     def describe(self) -> str:
         raise NotImplementedError()
+
+    def get_event_classes(self) -> Optional[Tuple[type, ...]]:
+        """Return the event classes the listener wants to be notified of or None to be notified of every event"""
+        return None
@@ -1,13 +1,14 @@
 import logging
 import threading
-from typing import Any, TypeVar
-from typing import Dict, List
+from typing import Any, Tuple, TypeVar
+from typing import Dict
 
 from HABApp.core.events import ComplexEventValue, ValueChangeEvent
 from .base_listener import EventBusBaseListener
-from HABApp.core.const.topics import TOPIC_EVENTS
+from .event_log import log_event
+from .listener_snapshot import EMPTY_SNAPSHOT, ListenerSnapshot
+from .topic_index import TopicIndex, is_topic_pattern
 
-event_log = logging.getLogger(TOPIC_EVENTS)
 habapp_log = logging.getLogger('HABApp')
 
 _TYPE_LISTENER = TypeVar('_TYPE_LISTENER', bound=EventBusBaseListener)
@@ -16,18 +17,21 @@ _TYPE_LISTENER = TypeVar('_TYPE_LISTENER', bound=EventBusBaseListener)
 class EventBus:
     def __init__(self):
         self._lock = threading.Lock()
-        self._listeners: Dict[str, List[EventBusBaseListener]] = {}
+        # The listeners are stored as immutable snapshots which get replaced on add/remove (copy-on-write).
+        # That way post_event can iterate without lock, and a listener that gets removed during the
+        # notification will not cause any other listener to be skipped.
+        self._listeners: Dict[str, ListenerSnapshot] = {}
+        self._pattern_listeners = TopicIndex()
+
+        # Incremented every time the listeners change
+        self.version: int = 0
 
     def post_event(self, topic: str, event: Any):
         assert isinstance(topic, str), type(topic)
 
-        if not isinstance(event, str):
-            event_prv = str(event)
-        else:
-            event_prv = event[:120] + ' ...' if len(event) > 120 else event
-            event_prv = "'" + event_prv.replace('\n', '\\n') + "'"
-
-        event_log.info(f'{topic:>20s}: {event_prv}')
+        # The log message is only created and formatted if it actually gets logged.
+        # This has to happen before the unpacking because the complex values have a custom str representation
+        log_event(topic, event)
 
         # Sometimes we have nested data structures which we need to set the value.
         # Once the value in the item registry is updated the data structures provide no benefit thus
@@ -40,27 +44,39 @@ class EventBus:
         except AttributeError:
             pass
 
-        # Notify all listeners
+        # Notify all listeners which can match the event
         listeners = self._listeners.get(topic, None)
         if listeners is not None:
-            for listener in listeners:
+            for listener in listeners.get(event.__class__):
+                listener.notify_listeners(event)
+
+        # Listeners which subscribed with a topic pattern
+        if self._pattern_listeners:
+            for listener in self._pattern_listeners.match(topic).get(event.__class__):
                 listener.notify_listeners(event)
         return None
 
+    def _get_listeners(self, topic: str) -> ListenerSnapshot:
+        if is_topic_pattern(topic):
+            return self._pattern_listeners.get_listeners(topic)
+        return self._listeners.get(topic, EMPTY_SNAPSHOT)
+
     def add_listener(self, listener: _TYPE_LISTENER):
         assert isinstance(listener, EventBusBaseListener)
         assert isinstance(listener.topic, str) and listener.topic
 
         with self._lock:
-            item_listeners = self._listeners.setdefault(listener.topic, [])
-
             # don't add the same listener twice
-            if listener in item_listeners:
+            if listener in self._get_listeners(listener.topic):
                 habapp_log.warning(f'Event listener for {listener.describe()} has already been added!')
                 return None
 
             # add listener
-            item_listeners.append(listener)
+            if is_topic_pattern(listener.topic):
+                self._pattern_listeners.add(listener)
+            else:
+                self._listeners[listener.topic] = self._listeners.get(listener.topic, EMPTY_SNAPSHOT).add(listener)
+            self.version += 1
             habapp_log.debug(f'Added event listener for {listener.describe()}')
             return None
 
@@ -69,21 +85,34 @@ class EventBus:
         assert isinstance(listener.topic, str) and listener.topic
 
         with self._lock:
-            item_listeners = self._listeners.get(listener.topic, [])
-
             # print warning if we try to remove it twice
-            if listener not in item_listeners:
+            if listener not in self._get_listeners(listener.topic):
                 habapp_log.warning(f'Event listener for {listener.describe()} has already been removed!')
                 return None
 
             # remove listener
-            item_listeners.remove(listener)
+            if is_topic_pattern(listener.topic):
+                self._pattern_listeners.remove(listener)
+            else:
+                listeners = self._listeners[listener.topic].remove(listener)
+                if listeners:
+                    self._listeners[listener.topic] = listeners
+                else:
+                    self._listeners.pop(listener.topic)
+            self.version += 1
             habapp_log.debug(f'Removed event listener for {listener.describe()}')
             return None
 
     def remove_all_listeners(self):
         with self._lock:
-            self._listeners.clear()
+            self._listeners = {}
+            self._pattern_listeners.clear()
+            self.version += 1
+
+    def get_listener_topics(self) -> Tuple[str, ...]:
+        """Return the topics and topic patterns which have listeners"""
+        with self._lock:
+            return tuple(self._listeners) + self._pattern_listeners.get_patterns()
 
 
 HINT_EVENT_BUS = TypeVar('HINT_EVENT_BUS', bound=EventBus)
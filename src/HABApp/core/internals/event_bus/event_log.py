@@ -0,0 +1,102 @@
+import logging
+from typing import Any, Dict, Optional, Tuple, Union
+
+from HABApp.config import CONFIG
+from HABApp.core.const.topics import TOPIC_EVENTS
+from .topic_index import TopicPattern, is_topic_pattern
+
+event_log = logging.getLogger(TOPIC_EVENTS)
+
+
+class EventLogMsg:
+    """Message for the event log which gets only formatted when the log entry is actually written"""
+    __slots__ = ('topic', 'event')
+
+    def __init__(self, topic: str, event: Any):
+        self.topic: str = topic
+        self.event: Any = event
+
+    def __str__(self):
+        event = self.event
+        if not isinstance(event, str):
+            event_prv = str(event)
+        else:
+            event_prv = event[:120] + ' ...' if len(event) > 120 else event
+            event_prv = "'" + event_prv.replace('\n', '\\n') + "'"
+
+        return f'{self.topic:>20s}: {event_prv}'
+
+
+class EventLogSampler:
+    """Logs only every n-th event of a topic or an event class to the event log"""
+
+    def __init__(self):
+        self._topics: Dict[str, int] = {}
+        self._patterns: Tuple[Tuple[TopicPattern, int], ...] = ()
+        self._events: Dict[str, int] = {}
+
+        self._topic_rates: Dict[str, Optional[int]] = {}
+        self._counters: Dict[Union[str, Tuple[str, str]], int] = {}
+
+    def set_rates(self, topics: Dict[str, int], events: Dict[str, int]):
+        self._topics = {k: v for k, v in topics.items() if not is_topic_pattern(k) and v > 1}
+        self._patterns = tuple((TopicPattern(k), v) for k, v in topics.items() if is_topic_pattern(k) and v > 1)
+        self._events = {k: v for k, v in events.items() if v > 1}
+
+        self._topic_rates.clear()
+        self._counters.clear()
+
+    def _get_topic_rate(self, topic: str) -> Optional[int]:
+        try:
+            return self._topic_rates[topic]
+        except KeyError:
+            pass
+
+        rate = self._topics.get(topic)
+        if rate is None:
+            for pattern, pattern_rate in self._patterns:
+                if pattern.matches(topic):
+                    rate = pattern_rate
+                    break
+
+        self._topic_rates[topic] = rate
+        return rate
+
+    def log_event(self, topic: str, event: Any) -> bool:
+        if not self._topics and not self._patterns and not self._events:
+            return True
+
+        key: Union[str, Tuple[str, str]] = topic
+        rate = self._get_topic_rate(topic)
+        if rate is None:
+            cls_name = event.__class__.__name__
+            rate = self._events.get(cls_name)
+            if rate is None:
+                return True
+            key = (topic, cls_name)
+
+        # always log the first event
+        ctr = self._counters.get(key, 0)
+        self._counters[key] = ctr + 1 if ctr + 1 < rate else 0
+        return not ctr
+
+
+EVENT_LOG_SAMPLER = EventLogSampler()
+
+
+def log_event(topic: str, event: Any):
+    # Check the level first so we don't create a log record when the events log is disabled
+    if not event_log.isEnabledFor(logging.INFO):
+        return None
+    if not EVENT_LOG_SAMPLER.log_event(topic, event):
+        return None
+
+    event_log.info(EventLogMsg(topic, event))
+
+
+def setup_sampler():
+    EVENT_LOG_SAMPLER.set_rates(LOGGING_CFG.sample_topics, LOGGING_CFG.sample_events)
+
+
+LOGGING_CFG = CONFIG.habapp.logging
+LOGGING_CFG.subscribe_for_changes(setup_sampler)
@@ -0,0 +1,49 @@
+from typing import Dict, Optional, Tuple
+
+from .base_listener import EventBusBaseListener
+
+
+class ListenerSnapshot:
+    """Immutable snapshot of listeners. Modifications return a new snapshot (copy-on-write).
+
+    The listeners are indexed by the event classes they can match. The listeners for an event class are
+    resolved once and then cached, so a posted event only touches the listeners which can match it."""
+    __slots__ = ('listeners', '_classes', '_by_class')
+
+    def __init__(self, listeners: Tuple[EventBusBaseListener, ...]):
+        self.listeners: Tuple[EventBusBaseListener, ...] = listeners
+        self._classes: Tuple[Optional[Tuple[type, ...]], ...] = tuple(
+            listener.get_event_classes() for listener in listeners)
+        self._by_class: Dict[type, Tuple[EventBusBaseListener, ...]] = {}
+
+    def __bool__(self):
+        return bool(self.listeners)
+
+    def __len__(self):
+        return len(self.listeners)
+
+    def __contains__(self, listener: EventBusBaseListener):
+        return listener in self.listeners
+
+    def add(self, listener: EventBusBaseListener) -> 'ListenerSnapshot':
+        return ListenerSnapshot(self.listeners + (listener, ))
+
+    def remove(self, listener: EventBusBaseListener) -> 'ListenerSnapshot':
+        pos = self.listeners.index(listener)
+        return ListenerSnapshot(self.listeners[:pos] + self.listeners[pos + 1:])
+
+    def get(self, event_cls: type) -> Tuple[EventBusBaseListener, ...]:
+        try:
+            return self._by_class[event_cls]
+        except KeyError:
+            pass
+
+        ret = tuple(
+            listener for listener, classes in zip(self.listeners, self._classes)
+            if classes is None or issubclass(event_cls, classes)
+        )
+        self._by_class[event_cls] = ret
+        return ret
+
+
+EMPTY_SNAPSHOT = ListenerSnapshot(())
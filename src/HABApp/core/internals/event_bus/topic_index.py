@@ -0,0 +1,171 @@
+from collections import OrderedDict
+from re import DOTALL, compile as re_compile, escape
+from typing import Callable, Dict, Optional, Tuple
+from typing import OrderedDict as TOrderedDict
+
+from .base_listener import EventBusBaseListener
+from .listener_snapshot import EMPTY_SNAPSHOT, ListenerSnapshot
+
+TOPIC_WILDCARD = '*'
+TOPIC_CACHE_SIZE = 4096
+
+
+def is_topic_pattern(topic: str) -> bool:
+    """Returns True if the topic is a pattern that can match multiple topics"""
+    return TOPIC_WILDCARD in topic
+
+
+class TopicPattern:
+    """A compiled topic pattern. The literal part in front of the first wildcard is used
+    as the key in the trie, the remainder is only evaluated when the prefix has matched."""
+
+    def __init__(self, pattern: str):
+        assert is_topic_pattern(pattern), pattern
+        self.pattern: str = pattern
+        self.prefix: str = pattern[:pattern.index(TOPIC_WILDCARD)]
+
+        # Prefix patterns (e.g. 'Temp_*') don't need any further check
+        self.matcher: Optional[Callable[[str], object]] = None
+        if pattern[len(self.prefix):] != TOPIC_WILDCARD:
+            # Only '*' is a wildcard, all other characters (e.g. '?' or '[') are matched literally
+            regex = '.*'.join(escape(part) for part in pattern.split(TOPIC_WILDCARD))
+            self.matcher = re_compile(regex + r'\Z', DOTALL).match
+
+    def matches(self, topic: str) -> bool:
+        if not topic.startswith(self.prefix):
+            return False
+        return self.matcher is None or self.matcher(topic) is not None
+
+
+class _TrieNode:
+    __slots__ = ('children', 'listeners')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.listeners: Dict[str, Tuple[TopicPattern, ListenerSnapshot]] = {}
+
+
+class TopicIndex:
+    """Character trie over the literal prefixes of the registered topic patterns.
+    A lookup walks the trie along the topic, so the cost depends on the topic length and the amount of
+    matching patterns, but not on the amount of registered patterns.
+    Lookups are cached per topic (least recently used topics are evicted when the cache is full)
+    and the cache is invalidated when the patterns change.
+
+    All modifications are copy-on-write and must be serialized by the caller, so lookups never require a lock."""
+
+    def __init__(self, cache_size: int = TOPIC_CACHE_SIZE):
+        self._root = _TrieNode()
+        self._cache: TOrderedDict[str, ListenerSnapshot] = OrderedDict()
+        self._cache_size: int = cache_size
+
+    def __bool__(self):
+        return bool(self._root.children) or bool(self._root.listeners)
+
+    def _get_node(self, prefix: str, create: bool) -> Optional[_TrieNode]:
+        node = self._root
+        for char in prefix:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[char] = _TrieNode()
+            node = child
+        return node
+
+    def get_listeners(self, pattern: str) -> ListenerSnapshot:
+        node = self._get_node(TopicPattern(pattern).prefix, create=False)
+        if node is None:
+            return EMPTY_SNAPSHOT
+        entry = node.listeners.get(pattern)
+        return EMPTY_SNAPSHOT if entry is None else entry[1]
+
+    def add(self, listener: EventBusBaseListener):
+        pattern = TopicPattern(listener.topic)
+        node = self._get_node(pattern.prefix, create=True)
+
+        entry = node.listeners.get(pattern.pattern)
+        if entry is None:
+            entry = (pattern, EMPTY_SNAPSHOT)
+
+        listeners = dict(node.listeners)
+        listeners[pattern.pattern] = (entry[0], entry[1].add(listener))
+        node.listeners = listeners
+
+        # Replace instead of clear, so a lookup that is currently running can not store an outdated result
+        self._cache = OrderedDict()
+
+    def remove(self, listener: EventBusBaseListener):
+        prefix = TopicPattern(listener.topic).prefix
+
+        # Walk the trie and remember the path, so we can prune the nodes which are no longer required
+        path = [(self._root, '')]
+        node = self._root
+        for char in prefix:
+            node = node.children[char]
+            path.append((node, char))
+
+        pattern, pattern_listeners = node.listeners[listener.topic]
+        pattern_listeners = pattern_listeners.remove(listener)
+
+        listeners = dict(node.listeners)
+        if pattern_listeners:
+            listeners[listener.topic] = (pattern, pattern_listeners)
+        else:
+            listeners.pop(listener.topic)
+        node.listeners = listeners
+
+        for i in range(len(path) - 1, 0, -1):
+            node, char = path[i]
+            if node.children or node.listeners:
+                break
+            path[i - 1][0].children.pop(char)
+
+        self._cache = OrderedDict()
+
+    def clear(self):
+        self._root = _TrieNode()
+        self._cache = OrderedDict()
+
+    def get_patterns(self) -> Tuple[str, ...]:
+        ret = []
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            ret.extend(node.listeners)
+            nodes.extend(node.children.values())
+        return tuple(ret)
+
+    def match(self, topic: str) -> ListenerSnapshot:
+        cache = self._cache
+        snapshot = cache.get(topic)
+        if snapshot is not None:
+            # lookups can run concurrently, so the topic might have been evicted in the meantime
+            try:
+                cache.move_to_end(topic)
+            except KeyError:
+                pass
+            return snapshot
+
+        ret = []
+        node = self._root
+        pos = 0
+        while True:
+            for pattern, listeners in node.listeners.values():
+                if pattern.matcher is None or pattern.matcher(topic) is not None:
+                    ret.extend(listeners.listeners)
+
+            if pos >= len(topic):
+                break
+            node = node.children.get(topic[pos])
+            if node is None:
+                break
+            pos += 1
+
+        cache[topic] = snapshot = ListenerSnapshot(tuple(ret)) if ret else EMPTY_SNAPSHOT
+        if len(cache) > self._cache_size:
+            try:
+                cache.popitem(last=False)
+            except KeyError:
+                pass
+        return snapshot
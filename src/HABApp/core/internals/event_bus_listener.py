@@ -1,5 +1,10 @@
-from typing import Optional, TypeVar
+from threading import Lock
+from time import monotonic
+from typing import Any, Optional, Tuple, TypeVar
 
+from HABApp.core.asyncio import async_context
+from HABApp.core.const import MISSING, loop
+from HABApp.core.events import CoalescedEvent
 from HABApp.core.internals.event_bus import EventBusBaseListener
 from HABApp.core.internals.wrapped_function import TYPE_WRAPPED_FUNC_OBJ, WrappedFunctionBase
 from HABApp.core.internals import uses_event_bus, HINT_CONTEXT_OBJ
@@ -16,14 +21,18 @@ class EventBusListener(EventBusBaseListener):
         assert isinstance(callback, WrappedFunctionBase)
         self.func: TYPE_WRAPPED_FUNC_OBJ = callback
         self.filter: HINT_EVENT_FILTER_OBJ = event_filter
+        self._trigger = event_filter.compile_trigger()
 
     def notify_listeners(self, event):
-        if self.filter.trigger(event):
+        if self._trigger(event):
             self.func.run(event)
 
     def describe(self) -> str:
         return f'"{self.topic}" (filter={self.filter.describe()})'
 
+    def get_event_classes(self) -> Optional[Tuple[type, ...]]:
+        return self.filter.get_event_classes()
+
     def cancel(self):
         """Stop listening on the event bus"""
         event_bus.remove_listener(self)
@@ -42,7 +51,7 @@ class ContextBoundEventBusListener(EventBusListener, AutoContextBoundObj):
         self.filter: HINT_EVENT_FILTER_OBJ = event_filter
 
     def notify_listeners(self, event):
-        if self.filter.trigger(event):
+        if self._trigger(event):
             self.func.run(event)
 
     def describe(self) -> str:
@@ -55,3 +64,75 @@ class ContextBoundEventBusListener(EventBusListener, AutoContextBoundObj):
     def cancel(self):
         """Stop listening on the event bus"""
         self._ctx_unlink()
+
+
+class CoalescingEventBusListener(ContextBoundEventBusListener):
+    """Delivers at most one event per interval. Events that arrive in between replace each other, so only the
+    latest event gets delivered at the end of the interval. Replaced events never reach the worker pool.
+    The callback gets a :class:`~HABApp.core.events.CoalescedEvent` with the event and the amount of
+    replaced events."""
+
+    def __init__(self, topic: str, callback: TYPE_WRAPPED_FUNC_OBJ, event_filter: HINT_EVENT_FILTER_OBJ,
+                 interval: float, parent_ctx: Optional[HINT_CONTEXT_OBJ] = None):
+        super().__init__(topic=topic, callback=callback, event_filter=event_filter, parent_ctx=parent_ctx)
+        assert isinstance(interval, (int, float)) and interval > 0, interval
+
+        self.interval: float = interval
+
+        #: Amount of events which were replaced in total
+        self.skipped_total: int = 0
+
+        self._lock = Lock()
+        self._last_run: float = 0.0
+        self._pending: Any = MISSING
+        self._pending_skipped: int = 0
+        self._scheduled: bool = False
+
+    def notify_listeners(self, event):
+        if not self._trigger(event):
+            return None
+
+        with self._lock:
+            now = monotonic()
+            if self._pending is MISSING and now - self._last_run >= self.interval:
+                self._last_run = now
+            else:
+                if self._pending is not MISSING:
+                    self._pending_skipped += 1
+                    self.skipped_total += 1
+                self._pending = event
+
+                if not self._scheduled:
+                    self._scheduled = True
+                    delay = max(self._last_run + self.interval - now, 0)
+                    # notify_listeners can be called from the worker threads, too
+                    if async_context.get(None) is None:
+                        loop.call_soon_threadsafe(loop.call_later, delay, self._deliver_pending)
+                    else:
+                        loop.call_later(delay, self._deliver_pending)
+                return None
+
+        self.func.run(CoalescedEvent(getattr(event, 'name', self.topic), event, 0))
+
+    def _deliver_pending(self):
+        with self._lock:
+            self._scheduled = False
+            event = self._pending
+            if event is MISSING:
+                return None
+
+            self._pending = MISSING
+            # the count is passed with the event, so it can't be changed by the next interval
+            skipped = self._pending_skipped
+            self._pending_skipped = 0
+            self._last_run = monotonic()
+
+        self.func.run(CoalescedEvent(getattr(event, 'name', self.topic), event, skipped))
+
+    def describe(self) -> str:
+        return f'"{self.topic}" (filter={self.filter.describe()}, coalesce={self.interval}s)'
+
+    def _ctx_unlink(self):
+        with self._lock:
+            self._pending = MISSING
+        return super()._ctx_unlink()
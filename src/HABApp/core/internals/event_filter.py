@@ -1,4 +1,23 @@
-from typing import TypeVar, Any
+from typing import TypeVar, Any, Callable, Dict, Optional, Tuple
+
+
+class EventFilterCompiler:
+    """Generates the source of one predicate for a whole filter tree.
+    Objects which are used by the expressions are passed to the generated function through its globals."""
+
+    def __init__(self):
+        self.namespace: Dict[str, Any] = {'isinstance': isinstance, 'getattr': getattr}
+
+    def add_obj(self, obj: Any) -> str:
+        name = f'_obj{len(self.namespace)}'
+        self.namespace[name] = obj
+        return name
+
+    def compile(self, event_filter: 'EventFilterBase') -> Callable[[Any], bool]:
+        expr = event_filter.get_trigger_expr(self)
+        src = f'def trigger(event):\n    return {expr}\n'
+        exec(compile(src, f'<{event_filter.__class__.__name__}>', 'exec'), self.namespace)
+        return self.namespace['trigger']
 
 
 class EventFilterBase:
@@ -8,6 +27,20 @@ class EventFilterBase:
     def describe(self) -> str:
         raise NotImplementedError()
 
+    def get_event_classes(self) -> Optional[Tuple[type, ...]]:
+        """Return the event classes this filter can trigger on or None if it can trigger on every event.
+        This is used by the event bus to skip listeners which can not match the posted event."""
+        return None
+
+    def get_trigger_expr(self, compiler: EventFilterCompiler) -> str:
+        """Return a python expression which evaluates the filter for ``event``.
+        Filters that can not be expressed inline fall back to a call of ``trigger``."""
+        return f'{compiler.add_obj(self.trigger)}(event)'
+
+    def compile_trigger(self) -> Callable[[Any], bool]:
+        """Return a function which behaves like ``trigger`` but evaluates the whole filter tree at once"""
+        return EventFilterCompiler().compile(self)
+
     def __repr__(self):
         return f'<{self.describe()} at 0x{id(self):X}>'
 
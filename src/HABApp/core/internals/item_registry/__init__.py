@@ -2,4 +2,4 @@ from .item_registry_item import ItemRegistryItem
 
 # isort: split
 
-from .item_registry import ItemRegistry, HINT_ITEM_REGISTRY
+from .item_registry import ItemRegistry, HINT_ITEM_REGISTRY, BulkUpdateResult
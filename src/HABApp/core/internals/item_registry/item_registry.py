@@ -1,6 +1,7 @@
 import logging
 import threading
-from typing import Dict
+from itertools import count
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set
 from typing import Tuple, Union, TypeVar
 
 from HABApp.core.errors import ItemNotFoundException, ItemAlreadyExistsError
@@ -12,11 +13,24 @@ _HINT_ITEM_OBJ = TypeVar('_HINT_ITEM_OBJ', bound=ItemRegistryItem)
 log = logging.getLogger('HABApp.Items')
 
 
+class BulkUpdateResult(NamedTuple):
+    added: Tuple[_HINT_ITEM_OBJ, ...]
+    updated: Tuple[_HINT_ITEM_OBJ, ...]
+    removed: Tuple[_HINT_ITEM_OBJ, ...]
+
+
 class ItemRegistry:
     def __init__(self):
         self._lock = threading.Lock()
         self._items: Dict[str, _HINT_ITEM_OBJ] = {}
 
+        # Indexes which are used to search items
+        self._counter = count()
+        self._order: Dict[str, int] = {}
+        self._by_class: Dict[type, Set[str]] = {}
+        self._index: Dict[str, Dict[str, Set[str]]] = {}
+        self._item_index: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+
     def item_exists(self, name: Union[str, _HINT_ITEM_OBJ]) -> bool:
         if not isinstance(name, str):
             name = name.name
@@ -48,7 +62,7 @@ class ItemRegistry:
                 # adding a new item with the same name raises an exception
                 raise ItemAlreadyExistsError(name)
 
-            self._items[name] = item
+            self._add(name, item)
 
         log.debug(f'Added {name} ({item.__class__.__name__})')
         item._on_item_added()
@@ -59,14 +73,173 @@ class ItemRegistry:
             name = name.name
 
         with self._lock:
-            try:
-                item = self._items.pop(name)
-            except KeyError:
-                raise ItemNotFoundException(name) from None
+            if name not in self._items:
+                raise ItemNotFoundException(name)
+            item = self._pop(name)
 
         log.debug(f'Removed {name} ({item.__class__.__name__})')
         item._on_item_removed()
         return item
 
+    def bulk_update(self, items: Iterable[_HINT_ITEM_OBJ],
+                    update: Optional[Callable[[_HINT_ITEM_OBJ, _HINT_ITEM_OBJ], None]] = None,
+                    remove: Optional[Callable[[_HINT_ITEM_OBJ], bool]] = None,
+                    replace: Optional[Callable[[_HINT_ITEM_OBJ, _HINT_ITEM_OBJ], None]] = None) -> BulkUpdateResult:
+        """Add, update and remove multiple items at once. The registry is modified with one lock acquisition
+        and the item callbacks are called afterwards.
+
+        :param items: items which should be in the registry
+        :param update: called with the existing and the new item if an item with the same name and a compatible type
+                       already exists. The existing item is kept and the indexes are updated afterwards.
+        :param remove: called for every item in the registry which is not in ``items``.
+                       If it returns True the item is removed.
+        :param replace: called with the existing and the new item if the existing item is replaced because
+                        the type has changed. It's called before the item callbacks.
+        :return: added, updated and removed items. Items whose type changed are in added and removed.
+        """
+        added: List[_HINT_ITEM_OBJ] = []
+        updated: List[Tuple[_HINT_ITEM_OBJ, _HINT_ITEM_OBJ]] = []
+        removed: List[_HINT_ITEM_OBJ] = []
+        replaced: List[Tuple[_HINT_ITEM_OBJ, _HINT_ITEM_OBJ]] = []
+
+        with self._lock:
+            names: Set[str] = set()
+            for item in items:
+                assert isinstance(item, ItemRegistryItem)
+                name = item.name
+                names.add(name)
+
+                existing = self._items.get(name)
+                if existing is item:
+                    continue
+                if existing is not None:
+                    if isinstance(existing, item.__class__):
+                        updated.append((existing, item))
+                        continue
+                    self._pop(name)
+                    removed.append(existing)
+                    replaced.append((existing, item))
+                self._add(name, item)
+                added.append(item)
+
+            if remove is not None:
+                for name, item in tuple(self._items.items()):
+                    if name not in names and remove(item):
+                        self._pop(name)
+                        removed.append(item)
+
+        if replace is not None:
+            for existing, item in replaced:
+                replace(existing, item)
+
+        for item in removed:
+            item._on_item_removed()
+        for item in added:
+            item._on_item_added()
+
+        if update is not None and updated:
+            for existing, item in updated:
+                update(existing, item)
+            with self._lock:
+                for existing, _ in updated:
+                    if self._items.get(existing.name) is existing:
+                        self._remove_index(existing.name)
+                        self._add_index(existing.name, existing)
+
+        log.debug(f'Bulk update: {len(added):d} added, {len(updated):d} updated, {len(removed):d} removed')
+        return BulkUpdateResult(tuple(added), tuple(existing for existing, _ in updated), tuple(removed))
+
+    def _add(self, name: str, item: _HINT_ITEM_OBJ):
+        self._items[name] = item
+        self._order[name] = next(self._counter)
+        self._by_class.setdefault(item.__class__, set()).add(name)
+        self._add_index(name, item)
+
+    def _pop(self, name: str) -> _HINT_ITEM_OBJ:
+        item = self._items.pop(name)
+        self._order.pop(name)
+        names = self._by_class[item.__class__]
+        names.discard(name)
+        if not names:
+            self._by_class.pop(item.__class__)
+        self._remove_index(name)
+        return item
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------------------------------------------------------
+    def _add_index(self, name: str, item: _HINT_ITEM_OBJ):
+        keys = tuple(item._get_registry_index())
+        if not keys:
+            return None
+
+        self._item_index[name] = keys
+        for index, value in keys:
+            self._index.setdefault(index, {}).setdefault(value, set()).add(name)
+
+    def _remove_index(self, name: str):
+        for index, value in self._item_index.pop(name, ()):
+            values = self._index[index]
+            names = values[value]
+            names.discard(name)
+            if not names:
+                values.pop(value)
+                if not values:
+                    self._index.pop(index)
+
+    def update_index(self, item: _HINT_ITEM_OBJ):
+        """Update the index of an item, must be called when the indexed values of an item have changed"""
+        name = item.name
+        with self._lock:
+            if self._items.get(name) is not item:
+                return None
+            self._remove_index(name)
+            self._add_index(name, item)
+
+    def get_index_values(self, index: str) -> Tuple[str, ...]:
+        """Return all values of an index, e.g. all tags"""
+        with self._lock:
+            return tuple(self._index.get(index, ()))
+
+    def find_items(self, type: Union[None, type, Tuple[type, ...]] = None,
+                   all_of: Iterable[Tuple[str, str]] = (),
+                   any_of: Optional[Iterable[Tuple[str, str]]] = None) -> Tuple[_HINT_ITEM_OBJ, ...]:
+        """Find items through the indexes. The items are returned in the order they were added.
+
+        :param type: item has to be an instance of this class
+        :param all_of: index name and value pairs, the item has to be indexed with all of them
+        :param any_of: index name and value pairs, the item has to be indexed with at least one of them
+        :return: found items
+        """
+        with self._lock:
+            names: Optional[Set[str]] = None
+
+            for index, value in all_of:
+                indexed = self._index.get(index, {}).get(value)
+                if not indexed:
+                    return ()
+                names = set(indexed) if names is None else names.intersection(indexed)
+
+            if any_of is not None:
+                found = set()
+                for index, value in any_of:
+                    found.update(self._index.get(index, {}).get(value, ()))
+                names = found if names is None else names.intersection(found)
+
+            if names is None and type is not None:
+                names = set()
+                for cls, cls_names in self._by_class.items():
+                    if issubclass(cls, type):
+                        names.update(cls_names)
+
+            if names is None:
+                items = tuple(self._items.values())
+            else:
+                items = tuple(self._items[name] for name in sorted(names, key=self._order.__getitem__))
+
+        if type is not None:
+            items = tuple(item for item in items if isinstance(item, type))
+        return items
+
 
 HINT_ITEM_REGISTRY = TypeVar('HINT_ITEM_REGISTRY', bound=ItemRegistry)
@@ -1,3 +1,6 @@
+from typing import Iterable, Tuple
+
+
 class ItemRegistryItem:
     """ItemRegistryItem, all items that will be stored in the Item Registry must inherit from this
     """
@@ -14,6 +17,11 @@ class ItemRegistryItem:
         """
         return self._name
 
+    def _get_registry_index(self) -> Iterable[Tuple[str, str]]:
+        """Index name and value under which the item can be searched in the item registry, e.g. ``('tag', 'Light')``
+        """
+        return ()
+
     def _on_item_added(self):
         """This function gets automatically called when the item was added to the item registry
         """
@@ -1,4 +1,5 @@
 from HABApp.core.internals.wrapped_function.base import TYPE_WRAPPED_FUNC_OBJ, WrappedFunctionBase
+from HABApp.core.internals.wrapped_function.dispatch_queue import HINT_QUEUE_POLICY, HINT_SERIAL_MODE
 
 # isort: split
 
@@ -0,0 +1,314 @@
+import logging
+from collections import deque
+from threading import Condition, Lock, local
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, Final, Literal, Optional, Tuple
+
+from HABApp.core.asyncio import async_context
+
+HINT_QUEUE_POLICY = Literal['block', 'drop_oldest', 'drop_newest', 'coalesce']
+QUEUE_POLICIES: Final = ('block', 'drop_oldest', 'drop_newest', 'coalesce')
+
+HINT_SERIAL_MODE = Literal['topic', 'rule']
+SERIAL_MODES: Final = ('topic', 'rule')
+
+log = logging.getLogger('HABApp.Worker')
+
+
+class DispatchJob:
+    __slots__ = ('func', 'args', 'kwargs', 'key', 'serial', 'submitted')
+
+    def __init__(self, func: Callable, args: tuple, kwargs: dict, key: Any, serial: Any):
+        self.func: Callable = func
+        self.args: tuple = args
+        self.kwargs: dict = kwargs
+        self.key: Any = key
+        self.serial: Any = serial
+        self.submitted: float = monotonic()
+
+
+class DispatchQueue:
+    """Bounded queue between the event bus and the worker threads.
+
+    Jobs are only passed to the executor when a worker is free, the rest waits in this queue.
+    Free workers process the queued jobs without going through the executor again.
+    When the queue is full the policy which was passed with the job decides what happens:
+
+    - ``block``: Wait until there is space in the queue. Calls from the event loop or from a worker thread
+      can not wait (they are required to free up space), for these the job is handled like ``drop_oldest``
+      and a warning is logged.
+    - ``drop_newest``: The new job is dropped
+    - ``drop_oldest``: The oldest queued job of the same function is dropped. If there is none the new job is dropped.
+    - ``coalesce``: A queued job of the same function with the same key gets the arguments of the new job.
+      If there is none the new job is dropped.
+
+    Jobs with the same serial key are executed strictly in order and never in parallel.
+    Only one job per serial key is scheduled at a time, the others wait in a separate queue per key.
+
+    The amount of workers is adjusted between min and max workers: When a job waited longer than the target latency
+    another worker is started, when no job had to wait for some time a worker is stopped.
+    Stopping a worker only lowers the amount of jobs which run in parallel,
+    the thread of the executor stays alive (idle) because a ThreadPoolExecutor can't be shrunk.
+    """
+
+    def __init__(self, submit: Callable[..., Any]):
+        self._submit: Final = submit
+
+        self._lock = Lock()
+        self._space = Condition(self._lock)
+        self._local = local()
+
+        self._queue: Deque[DispatchJob] = deque()
+        self._coalesce: Dict[Tuple[Callable, Any], DispatchJob] = {}
+
+        # serial key -> jobs which wait until the scheduled job with the same key is done
+        self._serial: Dict[Any, Deque[DispatchJob]] = {}
+
+        self.workers: int = 1
+        self.min_workers: int = 1
+        self.max_workers: int = 1
+        self.max_size: int = 0
+        self._running: int = 0
+        self._queued: int = 0
+
+        # Adaptive amount of workers
+        self.target_latency: float = 0.05
+        self.grow_interval: float = 1
+        self.shrink_after: float = 60
+        self._last_resize: float = 0
+        self._last_busy: float = 0
+
+        # A warning is logged once until the queue is empty again
+        self._full_warned: bool = False
+
+        # Counters
+        self.dropped: int = 0
+        self.coalesced: int = 0
+        self.blocked: int = 0
+        self.resized: int = 0
+
+    def configure(self, workers: int, max_size: int, min_workers: Optional[int] = None,
+                  target_latency: float = 0.05):
+        assert isinstance(workers, int) and workers > 0, workers
+        assert isinstance(max_size, int) and max_size >= 0, max_size
+        assert min_workers is None or isinstance(min_workers, int) and min_workers > 0, min_workers
+        assert target_latency > 0, target_latency
+        with self._lock:
+            self.max_workers = workers
+            self.min_workers = workers if min_workers is None else min(min_workers, workers)
+            self.workers = self.min_workers
+            self.target_latency = target_latency
+            self.max_size = max_size
+            self._last_resize = self._last_busy = monotonic()
+
+            # The old executor is already shut down, so nothing of the old state can be processed any more
+            self._queue.clear()
+            self._coalesce.clear()
+            self._serial.clear()
+            self._queued = 0
+            self._running = 0
+            self._full_warned = False
+            self._space.notify_all()
+
+    @property
+    def size(self) -> int:
+        return self._queued
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {
+            'QueueSize': self._queued, 'Running': self._running, 'Threads': self.workers, 'Resized': self.resized,
+            'QueueDropped': self.dropped, 'QueueCoalesced': self.coalesced, 'QueueBlocked': self.blocked,
+        }
+
+    def _resize(self, latency: float) -> bool:
+        """Adjust the amount of workers, returns True if the amount was increased"""
+        now = monotonic()
+        if latency > self.target_latency:
+            self._last_busy = now
+            if self.workers < self.max_workers and now - self._last_resize >= self.grow_interval:
+                self.workers += 1
+                self.resized += 1
+                self._last_resize = now
+                return True
+            return False
+
+        if self.workers > self.min_workers and \
+                now - self._last_busy >= self.shrink_after and now - self._last_resize >= self.shrink_after:
+            self.workers -= 1
+            self.resized += 1
+            self._last_resize = now
+        return False
+
+    def _can_block(self) -> bool:
+        # The loop and the workers are required to free up space so they must never wait
+        return async_context.get(None) is None and not getattr(self._local, 'is_worker', False)
+
+    def submit(self, func: Callable, args: tuple = (), kwargs: Optional[dict] = None,
+               policy: HINT_QUEUE_POLICY = 'block', key: Any = None, serial: Any = None):
+        job = DispatchJob(func, args, {} if kwargs is None else kwargs, key, serial)
+
+        with self._lock:
+            if self.max_size and self._queued >= self.max_size and \
+                    (self._running >= self.workers or serial in self._serial):
+                if not self._queue_full(job, policy):
+                    return None
+
+            # A job with the same serial key is already scheduled
+            if serial is not None:
+                if (waiting := self._serial.get(serial)) is not None:
+                    self._add_job(job, policy, waiting)
+                    return None
+                self._serial[serial] = deque()
+
+            # Blocking releases the lock, so the workers might have finished in the meantime
+            if self._running >= self.workers:
+                self._add_job(job, policy, self._queue)
+                if (extra := self._grow()) is not None:
+                    job = extra
+                else:
+                    return None
+            else:
+                self._running += 1
+                extra = None
+
+        self._start(job, requeue=extra is not None)
+
+    def _grow(self) -> Optional[DispatchJob]:
+        # The workers only resize when they finish a job. If all of them are blocked the waiting time
+        # of the oldest job is checked here. Returns the job for the additional worker.
+        if not self._queue or self._running < self.workers:
+            return None
+
+        latency = monotonic() - self._queue[0].submitted
+        if latency <= self.target_latency or not self._resize(latency):
+            return None
+
+        job = self._queue.popleft()
+        self._remove_job(job)
+        self._running += 1
+        return job
+
+    def _start(self, job: DispatchJob, requeue: bool):
+        # Pass a job which is already counted as running to the executor.
+        # If that fails (e.g. the executor is shut down) the job must not be counted as running any more,
+        # otherwise all following jobs stay in the queue forever.
+        try:
+            self._submit(self._run, job)
+        except Exception:
+            with self._lock:
+                self._running -= 1
+                if requeue:
+                    self._queue.appendleft(job)
+                    self._queued += 1
+                elif job.serial is not None:
+                    self._serial_done(job.serial)
+            if not requeue:
+                raise
+
+    def _add_job(self, job: DispatchJob, policy: HINT_QUEUE_POLICY, queue: Deque[DispatchJob]):
+        queue.append(job)
+        self._queued += 1
+        if policy == 'coalesce':
+            self._coalesce[(job.func, job.key)] = job
+
+    def _remove_job(self, job: DispatchJob):
+        self._queued -= 1
+        if self._coalesce.get((job.func, job.key)) is job:
+            self._coalesce.pop((job.func, job.key))
+        self._space.notify()
+
+    def _serial_done(self, serial: Any):
+        # Schedule the next job with the same serial key
+        waiting = self._serial[serial]
+        if waiting:
+            self._queue.append(waiting.popleft())
+        else:
+            self._serial.pop(serial)
+
+    def _queue_full(self, job: DispatchJob, policy: HINT_QUEUE_POLICY) -> bool:
+        """Handle the full queue, return True if the job should be queued"""
+        if policy == 'coalesce':
+            queued = self._coalesce.get((job.func, job.key))
+            if queued is not None:
+                queued.args = job.args
+                queued.kwargs = job.kwargs
+                self.coalesced += 1
+                return False
+            self.dropped += 1
+            return False
+
+        if policy == 'drop_oldest':
+            queue = self._queue if job.serial is None else self._serial.get(job.serial, self._queue)
+            for queued in queue:
+                if queued.func == job.func:
+                    queue.remove(queued)
+                    self._remove_job(queued)
+                    if queued.serial is not None and queue is self._queue:
+                        self._serial_done(queued.serial)
+                    self.dropped += 1
+                    return True
+            self.dropped += 1
+            return False
+
+        if policy == 'drop_newest':
+            self.dropped += 1
+            return False
+
+        # block
+        if not self._can_block():
+            if not self._full_warned:
+                self._full_warned = True
+                log.warning(f'Queue of the thread pool is full ({self.max_size:d} entries), dropping events! '
+                            f'Increase the thread pool or the queue size or use less blocking callbacks.')
+            return self._queue_full(job, 'drop_oldest')
+
+        self.blocked += 1
+        while self.max_size and self._queued >= self.max_size:
+            self._space.wait()
+        return True
+
+    def _run(self, job: DispatchJob):
+        is_worker = getattr(self._local, 'is_worker', False)
+        self._local.is_worker = True
+        try:
+            self._process(job)
+        finally:
+            self._local.is_worker = is_worker
+
+    def _next_job(self, done: DispatchJob) -> Optional[DispatchJob]:
+        extra: Optional[DispatchJob] = None
+
+        with self._lock:
+            if done.serial is not None:
+                self._serial_done(done.serial)
+
+            if not self._queue:
+                self._resize(0)
+                self._full_warned = False
+            if not self._queue or self._running > self.workers:
+                self._running -= 1
+                return None
+
+            job = self._queue.popleft()
+            self._remove_job(job)
+
+            # Start an additional worker if the jobs have to wait too long
+            if self._resize(monotonic() - job.submitted) and self._queue:
+                extra = self._queue.popleft()
+                self._remove_job(extra)
+                self._running += 1
+
+        if extra is not None:
+            self._start(extra, requeue=True)
+        return job
+
+    def _process(self, job: Optional[DispatchJob]):
+        while job is not None:
+            try:
+                job.func(*job.args, **job.kwargs)
+            except BaseException:
+                # Hand the queued jobs to a new worker so they don't get stuck
+                if (job := self._next_job(job)) is not None:
+                    self._start(job, requeue=True)
+                raise
+            job = self._next_job(job)
@@ -0,0 +1,128 @@
+import io
+import logging
+import sys
+from collections import Counter
+from cProfile import Profile
+from pstats import SortKey, Stats
+from threading import Event, Thread, get_ident
+from time import time
+from types import CodeType, FrameType
+from typing import Dict, Final, List, Literal, Optional, Tuple
+
+HINT_PROFILER_MODE = Literal['off', 'always', 'sampled', 'watchdog']
+
+# Execution time after which a warning will be logged
+WARN_DURATION: float = 0.8
+
+HINT_STACK = Tuple[Tuple[str, int, str], ...]
+
+
+def log_profile(log: logging.Logger, pr: Profile):
+    s = io.StringIO()
+    ps = Stats(pr, stream=s).sort_stats(SortKey.CUMULATIVE)
+    ps.print_stats(0.1)  # limit to output to 10% of the lines
+
+    for line in s.getvalue().splitlines()[4:]:    # skip the amount of calls and "Ordered by:"
+        if line:
+            log.warning(line)
+
+
+class SampledJob:
+    __slots__ = ('start', 'stop_code', 'samples')
+
+    def __init__(self, stop_code: CodeType):
+        self.start: float = time()
+        self.stop_code: Final = stop_code
+        self.samples: List[HINT_STACK] = []
+
+    def log_samples(self, log: logging.Logger, max_stacks: int = 3):
+        if not self.samples:
+            return None
+
+        counts = Counter(self.samples)
+        for stack, count in counts.most_common(max_stacks):
+            log.warning(f'Stack sampled {count:d}/{len(self.samples):d} times:')
+            for file, line, name in stack:
+                log.warning(f'  File "{file}", line {line:d}, in {name}')
+
+
+class StackSamplingWatchdog:
+    """Thread which periodically samples the stacks of the callbacks which are still running after the threshold.
+    Callbacks which finish in time are never inspected so this has almost no overhead."""
+
+    def __init__(self, threshold: float = WARN_DURATION, interval: float = 0.1):
+        self.threshold: Final = threshold
+        self.interval: Final = interval
+
+        self._jobs: Dict[int, SampledJob] = {}
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def start(self):
+        if self._thread is not None:
+            return None
+        self._stop.clear()
+        self._thread = Thread(target=self._run, name='HABAppStackSampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return None
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def add_job(self, stop_code: CodeType) -> SampledJob:
+        self._jobs[get_ident()] = job = SampledJob(stop_code)
+        return job
+
+    def remove_job(self):
+        self._jobs.pop(get_ident(), None)
+
+    def sample(self):
+        if not self._jobs:
+            return None
+
+        now = time()
+        frames = sys._current_frames()
+        for ident, job in tuple(self._jobs.items()):
+            if now - job.start < self.threshold:
+                continue
+            if (frame := frames.get(ident)) is not None:
+                job.samples.append(get_stack(frame, job.stop_code))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+def get_stack(frame: Optional[FrameType], stop_code: CodeType) -> HINT_STACK:
+    stack = []
+    while frame is not None and frame.f_code is not stop_code:
+        code = frame.f_code
+        stack.append((code.co_filename, frame.f_lineno, code.co_name))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+MODE: HINT_PROFILER_MODE = 'watchdog'
+SAMPLE_RATE: int = 10
+WATCHDOG = StackSamplingWatchdog()
+
+
+def setup_profiler(mode: HINT_PROFILER_MODE, sample_rate: int):
+    global MODE, SAMPLE_RATE
+    assert isinstance(sample_rate, int) and sample_rate > 0, sample_rate
+
+    MODE = mode
+    SAMPLE_RATE = sample_rate
+
+    if mode == 'watchdog':
+        WATCHDOG.start()
+    else:
+        WATCHDOG.stop()
+
+
+def stop_profiler():
+    WATCHDOG.stop()
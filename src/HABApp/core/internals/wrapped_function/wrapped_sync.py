@@ -12,8 +12,11 @@ class WrappedSyncFunction(WrappedFunctionBase):
                  warn_too_long=True,
                  name: Optional[str] = None,
                  logger: Optional[logging.Logger] = None,
-                 context: Optional[HINT_CONTEXT_OBJ] = None):
+                 context: Optional[HINT_CONTEXT_OBJ] = None,
+                 queue_policy: str = 'block',
+                 serial: Optional[str] = None):
 
+        # queue_policy and serial are only used by the thread pool, without it everything runs serially anyway
         super().__init__(name=name, func=func, logger=logger, context=context)
         assert callable(func)
 
@@ -1,32 +1,46 @@
-import io
 import logging
 from cProfile import Profile
 from concurrent.futures import ThreadPoolExecutor
-from pstats import SortKey
-from pstats import Stats
 from time import time
-from typing import Callable, Any
+from typing import Callable, Any, Final
 from typing import Optional
 
 from HABApp.core.internals import HINT_CONTEXT_OBJ
 from HABApp.core.const import loop
 from .base import WrappedFunctionBase, default_logger
+from . import profiler
+from .dispatch_queue import DispatchQueue, HINT_QUEUE_POLICY, QUEUE_POLICIES, HINT_SERIAL_MODE, SERIAL_MODES
+from .profiler import SampledJob, log_profile
 
 WORKERS: Optional[ThreadPoolExecutor] = None
 
 
-def create_thread_pool(count: int):
+def _submit(func: Callable, *args):
+    # Late binding, so the executor can be replaced
+    WORKERS.submit(func, *args)
+
+
+DISPATCH_QUEUE = DispatchQueue(_submit)
+
+
+def create_thread_pool(count: int, queue_size: int = 0, min_count: Optional[int] = None,
+                       target_latency: float = 0.05):
     global WORKERS
     assert isinstance(count, int) and count > 0
 
-    default_logger.debug(f'Starting thread pool with {count:d} threads!')
+    if min_count is None or min_count >= count:
+        default_logger.debug(f'Starting thread pool with {count:d} threads!')
+    else:
+        default_logger.debug(f'Starting thread pool with {min_count:d} - {count:d} threads!')
 
     stop_thread_pool()
+    DISPATCH_QUEUE.configure(count, queue_size, min_count, target_latency)
     WORKERS = ThreadPoolExecutor(count, 'HabAppWorker')
 
 
 def stop_thread_pool():
     global WORKERS
+    profiler.stop_profiler()
     if WORKERS is not None:
         WORKERS.shutdown()
         WORKERS = None
@@ -48,19 +62,40 @@ class WrappedThreadFunction(WrappedFunctionBase):
                  warn_too_long=True,
                  name: Optional[str] = None,
                  logger: Optional[logging.Logger] = None,
-                 context: Optional[HINT_CONTEXT_OBJ] = None):
+                 context: Optional[HINT_CONTEXT_OBJ] = None,
+                 queue_policy: HINT_QUEUE_POLICY = 'block',
+                 serial: Optional[HINT_SERIAL_MODE] = None):
 
         super(WrappedThreadFunction, self).__init__(name=name, func=func, logger=logger, context=context)
         assert callable(func)
+        assert queue_policy in QUEUE_POLICIES, queue_policy
+        assert serial is None or serial in SERIAL_MODES, serial
 
         self.func = func
+        self.queue_policy: HINT_QUEUE_POLICY = queue_policy
+        self.serial: Optional[HINT_SERIAL_MODE] = serial
 
         self.warn_too_long: bool = warn_too_long
         self.time_submitted: float = 0.0
+        self._profile_calls: int = 0
 
     def run(self, *args, **kwargs):
         self.time_submitted = time()
-        WORKERS.submit(self.run_sync, *args, **kwargs)
+
+        # Events are coalesced and serialized by the name of the item
+        name = getattr(args[0], 'name', None) if args else None
+        key = name if self.queue_policy == 'coalesce' else None
+
+        # The serial key is bound to the rule, otherwise unrelated rules would wait for each other
+        serial = None
+        if self.serial is not None:
+            ctx = self._habapp_ctx if self._habapp_ctx is not None else self
+            if self.serial == 'topic':
+                serial = ('topic', ctx, name) if name is not None else self
+            else:
+                serial = ctx
+
+        DISPATCH_QUEUE.submit(self.run_sync, args, kwargs, policy=self.queue_policy, key=key, serial=serial)
 
     def run_sync(self, *args, **kwargs):
         start = time()
@@ -71,8 +106,15 @@ class WrappedThreadFunction(WrappedFunctionBase):
                              f'Maybe there are not enough threads?')
 
         # start profiler
-        pr = Profile()
-        pr.enable()
+        pr: Optional[Profile] = None
+        job: Optional[SampledJob] = None
+        if self.warn_too_long:
+            mode = profiler.MODE
+            if mode == 'watchdog':
+                job = profiler.WATCHDOG.add_job(RUN_SYNC_CODE)
+            elif mode == 'always' or mode == 'sampled' and self._profile_sample():
+                pr = Profile()
+                pr.enable()
 
         # Execute the function
         try:
@@ -80,19 +122,29 @@ class WrappedThreadFunction(WrappedFunctionBase):
         except Exception as e:
             self.process_exception(e, *args, **kwargs)
             return None
-
-        # disable profiler
-        pr.disable()
+        finally:
+            if pr is not None:
+                pr.disable()
+            if job is not None:
+                profiler.WATCHDOG.remove_job()
 
         # log warning if execution takes too long
         duration = time() - start
-        if self.warn_too_long and duration > 0.8:
+        if self.warn_too_long and duration > profiler.WARN_DURATION:
             self.log.warning(f'Execution of {self.name} took too long: {duration:.2f}s')
 
-            s = io.StringIO()
-            ps = Stats(pr, stream=s).sort_stats(SortKey.CUMULATIVE)
-            ps.print_stats(0.1)  # limit to output to 10% of the lines
+            if pr is not None:
+                log_profile(self.log, pr)
+            if job is not None:
+                job.log_samples(self.log)
+
+    def _profile_sample(self) -> bool:
+        # Profile only every n-th call
+        self._profile_calls += 1
+        if self._profile_calls < profiler.SAMPLE_RATE:
+            return False
+        self._profile_calls = 0
+        return True
+
 
-            for line in s.getvalue().splitlines()[4:]:    # skip the amount of calls and "Ordered by:"
-                if line:
-                    self.log.warning(line)
+RUN_SYNC_CODE: Final = WrappedThreadFunction.run_sync.__code__
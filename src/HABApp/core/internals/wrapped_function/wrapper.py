@@ -4,23 +4,29 @@ from typing import Union, Optional, Callable, Type
 
 from HABApp.config import CONFIG
 from HABApp.core.internals import HINT_CONTEXT_OBJ
+from HABApp.core.metrics import register_metrics
 from HABApp.core.internals.wrapped_function.base import TYPE_WRAPPED_FUNC_OBJ
 from HABApp.core.internals.wrapped_function.wrapped_async import WrappedAsyncFunction, HINT_FUNC_ASYNC
 from HABApp.core.internals.wrapped_function.wrapped_sync import WrappedSyncFunction
 from HABApp.core.internals.wrapped_function.wrapped_thread import HINT_FUNC_SYNC, WrappedThreadFunction, \
-    create_thread_pool, stop_thread_pool, run_in_thread_pool
+    create_thread_pool, stop_thread_pool, run_in_thread_pool, DISPATCH_QUEUE
+from HABApp.core.internals.wrapped_function.dispatch_queue import HINT_QUEUE_POLICY, HINT_SERIAL_MODE
+from HABApp.core.internals.wrapped_function.profiler import setup_profiler
 
 
 def wrap_func(func: Union[HINT_FUNC_SYNC, HINT_FUNC_ASYNC],
               warn_too_long=True,
               name: Optional[str] = None,
               logger: Optional[logging.Logger] = None,
-              context: Optional[HINT_CONTEXT_OBJ] = None) -> TYPE_WRAPPED_FUNC_OBJ:
+              context: Optional[HINT_CONTEXT_OBJ] = None,
+              queue_policy: HINT_QUEUE_POLICY = 'block',
+              serial: Optional[HINT_SERIAL_MODE] = None) -> TYPE_WRAPPED_FUNC_OBJ:
 
     if iscoroutinefunction(func):
         return WrappedAsyncFunction(func, name=name, logger=logger, context=context)
     else:
-        return SYNC_CLS(func, warn_too_long=warn_too_long, name=name, logger=logger, context=context)
+        return SYNC_CLS(func, warn_too_long=warn_too_long, name=name, logger=logger, context=context,
+                        queue_policy=queue_policy, serial=serial)
 
 
 SYNC_CLS: Union[Type[WrappedThreadFunction], Type[WrappedSyncFunction]]
@@ -38,7 +44,9 @@ def setup():
         SYNC_CLS = WrappedThreadFunction
 
         # create thread pool
-        create_thread_pool(THREAD_POOL.threads)
+        create_thread_pool(THREAD_POOL.threads, THREAD_POOL.queue_size,
+                           THREAD_POOL.min_threads, THREAD_POOL.target_latency)
+        setup_profiler(THREAD_POOL.profiler, THREAD_POOL.profiler_sample_rate)
 
         # this function can be called multiple times, so it's no problem if we register it more than once!
         from HABApp.runtime import shutdown
@@ -48,6 +56,8 @@ def setup():
 THREAD_POOL = CONFIG.habapp.thread_pool
 THREAD_POOL.subscribe_for_changes(setup)
 
+register_metrics('ThreadPool', DISPATCH_QUEUE.get_metrics)
+
 
 async def run_function(func: Callable):
     if not THREAD_POOL.enabled:
@@ -1,5 +1,6 @@
 from .base_item import BaseItem, HINT_TYPE_ITEM_OBJ, HINT_ITEM_OBJ
 from .base_valueitem import BaseValueItem
+from .item_history import ItemHistory
 
 # isort split
 
@@ -0,0 +1,212 @@
+from collections import deque
+from typing import Any, Deque, Dict, Final, Optional, Tuple, Type, Union
+
+
+class Aggregator:
+    """Aggregates the values of a sliding window incrementally.
+    Values are always removed in the order they were added. ``None`` values are ignored."""
+
+    def add(self, ts: float, value: Any):
+        raise NotImplementedError()
+
+    def remove(self, ts: float, value: Any):
+        """Remove the oldest value"""
+        raise NotImplementedError()
+
+    def get(self, start: float, now: float) -> Any:
+        """Return the aggregated value of the window which starts at ``start``"""
+        raise NotImplementedError()
+
+
+class CountAggregator(Aggregator):
+    def __init__(self):
+        self.count: int = 0
+
+    def add(self, ts: float, value: Any):
+        if value is not None:
+            self.count += 1
+
+    def remove(self, ts: float, value: Any):
+        if value is not None:
+            self.count -= 1
+
+    def get(self, start: float, now: float) -> int:
+        return self.count
+
+
+class SumAggregator(Aggregator):
+    def __init__(self):
+        self.count: int = 0
+        self.sum: Union[int, float] = 0
+
+    def add(self, ts: float, value: Any):
+        if value is not None:
+            self.sum += value
+            self.count += 1
+
+    def remove(self, ts: float, value: Any):
+        if value is None:
+            return None
+        self.count -= 1
+        # reset so the rounding errors of the floats don't accumulate
+        self.sum = self.sum - value if self.count else 0
+
+    def get(self, start: float, now: float) -> Union[int, float]:
+        return self.sum
+
+
+class MeanAggregator(SumAggregator):
+    def get(self, start: float, now: float) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+
+class VarianceAggregator(Aggregator):
+    """Sample variance, uses Welford's algorithm"""
+
+    # Delta degrees of freedom: 1 for the sample variance, 0 for the population variance
+    DDOF: int = 1
+
+    def __init__(self):
+        self.count: int = 0
+        self.mean: float = 0
+        self.m2: float = 0
+
+    def add(self, ts: float, value: Any):
+        if value is None:
+            return None
+        delta = value - self.mean
+        self.count += 1
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, ts: float, value: Any):
+        if value is None:
+            return None
+        self.count -= 1
+        if not self.count:
+            self.mean = 0
+            self.m2 = 0
+            return None
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (value - self.mean)
+
+    def get(self, start: float, now: float) -> Optional[float]:
+        if self.count <= self.DDOF:
+            return None
+        return max(self.m2, 0) / (self.count - self.DDOF)
+
+
+class PopulationVarianceAggregator(VarianceAggregator):
+    """Population variance, uses Welford's algorithm"""
+    DDOF = 0
+
+
+class _MonotonicAggregator(Aggregator):
+    # Keeps only the values that can still become the min/max in a deque with (id, value)
+    def __init__(self):
+        self.values: Deque[Tuple[int, Any]] = deque()
+        self.added: int = 0
+        self.removed: int = 0
+
+    @staticmethod
+    def _discard(new: Any, old: Any) -> bool:
+        raise NotImplementedError()
+
+    def add(self, ts: float, value: Any):
+        if value is None:
+            return None
+        values = self.values
+        while values and self._discard(value, values[-1][1]):
+            values.pop()
+        values.append((self.added, value))
+        self.added += 1
+
+    def remove(self, ts: float, value: Any):
+        if value is None:
+            return None
+        if self.values and self.values[0][0] == self.removed:
+            self.values.popleft()
+        self.removed += 1
+
+    def get(self, start: float, now: float) -> Any:
+        return self.values[0][1] if self.values else None
+
+
+class MinAggregator(_MonotonicAggregator):
+    @staticmethod
+    def _discard(new: Any, old: Any) -> bool:
+        return new <= old
+
+
+class MaxAggregator(_MonotonicAggregator):
+    @staticmethod
+    def _discard(new: Any, old: Any) -> bool:
+        return new >= old
+
+
+class TimeWeightedMeanAggregator(Aggregator):
+    """Mean where every value is weighted with the time it was valid in the window.
+    The oldest value is valid from the start of the window, the newest value until now."""
+
+    def __init__(self):
+        self.values: Deque[Tuple[float, Any]] = deque()
+        # sum of value * duration for all values except the newest one
+        self.sum: float = 0
+
+    def add(self, ts: float, value: Any):
+        if value is None:
+            return None
+        # the value is only used with the next value, so it has to be checked here
+        if not isinstance(value, (int, float)):
+            raise ValueError(f'Value must be int or float! Is: {value} ({type(value)})')
+        if self.values:
+            last_ts, last_value = self.values[-1]
+            self.sum += last_value * (ts - last_ts)
+        self.values.append((ts, value))
+
+    def remove(self, ts: float, value: Any):
+        if value is None:
+            return None
+        first_ts, first_value = self.values.popleft()
+        if self.values:
+            self.sum -= first_value * (self.values[0][0] - first_ts)
+        else:
+            self.sum = 0
+
+    def get(self, start: float, now: float) -> Optional[float]:
+        values = self.values
+        if not values:
+            return None
+
+        last_ts, last_value = values[-1]
+        if len(values) == 1:
+            return last_value
+
+        first_ts, first_value = values[0]
+        begin = max(first_ts, start)
+        duration = now - begin
+        if duration <= 0:
+            return last_value
+
+        total = self.sum + last_value * (now - last_ts) - first_value * (begin - first_ts)
+        return total / duration
+
+
+AGGREGATORS: Final[Dict[str, Type[Aggregator]]] = {
+    'count': CountAggregator,
+    'sum': SumAggregator,
+    'mean': MeanAggregator,
+    'min': MinAggregator,
+    'max': MaxAggregator,
+    'variance': VarianceAggregator,
+    'pvariance': PopulationVarianceAggregator,
+    'time_weighted_mean': TimeWeightedMeanAggregator,
+}
+
+
+def get_aggregator(name: str) -> Aggregator:
+    """Return a new aggregator for the name"""
+    if (cls := AGGREGATORS.get(name)) is None:
+        raise ValueError(f'Unknown aggregation "{name}"! Available: {", ".join(AGGREGATORS)}')
+    return cls()
@@ -1,13 +1,13 @@
+from time import time
 from typing import Type, TypeVar, Optional
 
-from pendulum import UTC, DateTime
-from pendulum import now as pd_now
+from pendulum import DateTime
 
-from HABApp.core.internals import HINT_EVENT_FILTER_OBJ, HINT_EVENT_BUS_LISTENER
+from HABApp.core.internals import HINT_EVENT_FILTER_OBJ, HINT_EVENT_BUS_LISTENER, HINT_QUEUE_POLICY, \
+    HINT_SERIAL_MODE
 from HABApp.core.internals import uses_get_item, uses_item_registry, get_current_context
 from HABApp.core.internals.item_registry import ItemRegistryItem
 from HABApp.core.lib.parameters import TH_POSITIVE_TIME_DIFF, get_positive_time_diff
-from eascheduler.const import local_tz
 from .base_item_times import ChangedTime, ItemNoChangeWatch, ItemNoUpdateWatch, UpdatedTime
 from .tmp_data import add_tmp_data as _add_tmp_data
 from .tmp_data import restore_tmp_data as _restore_tmp_data
@@ -35,7 +35,7 @@ class BaseItem(ItemRegistryItem):
     def __init__(self, name: str):
         super().__init__(name)
 
-        _now = pd_now(UTC)
+        _now = time()
         self._last_change: ChangedTime = ChangedTime(self._name, _now)
         self._last_update: UpdatedTime = UpdatedTime(self._name, _now)
 
@@ -44,14 +44,30 @@ class BaseItem(ItemRegistryItem):
         """
         :return: Timestamp of the last time when the item has been changed (read only)
         """
-        return self._last_change.dt.in_timezone(local_tz).naive()
+        return self._last_change.local_dt
 
     @property
     def last_update(self) -> DateTime:
         """
         :return: Timestamp of the last time when the item has been updated (read only)
         """
-        return self._last_update.dt.in_timezone(local_tz).naive()
+        return self._last_update.local_dt
+
+    @property
+    def secs_since_change(self) -> float:
+        """
+        :return: Seconds since the last time when the item has been changed (read only).
+            This is faster than using ``last_change`` when only the age is required.
+        """
+        return self._last_change.age
+
+    @property
+    def secs_since_update(self) -> float:
+        """
+        :return: Seconds since the last time when the item has been updated (read only).
+            This is faster than using ``last_update`` when only the age is required.
+        """
+        return self._last_update.age
 
     def __repr__(self):
         ret = ''
@@ -80,7 +96,10 @@ class BaseItem(ItemRegistryItem):
         return self._last_update.add_watch(secs)
 
     def listen_event(self, callback: HINT_EVENT_CALLBACK,
-                     event_filter: Optional[HINT_EVENT_FILTER_OBJ] = None) -> HINT_EVENT_BUS_LISTENER:
+                     event_filter: Optional[HINT_EVENT_FILTER_OBJ] = None,
+                     coalesce: Optional[TH_POSITIVE_TIME_DIFF] = None,
+                     queue_policy: HINT_QUEUE_POLICY = 'block',
+                     serial: Optional[HINT_SERIAL_MODE] = None) -> HINT_EVENT_BUS_LISTENER:
         """
         Register an event listener which listens to all event that the item receives
 
@@ -90,8 +109,16 @@ class BaseItem(ItemRegistryItem):
             or mqtt. Additionally it can be an instance of :class:`~HABApp.core.events.EventFilter` which additionally
             filters on the values of the event. It is also possible to group filters logically with, e.g.
             :class:`~HABApp.core.events.AndFilterGroup` and :class:`~HABApp.core.events.OrFilterGroup`
+        :param coalesce: Optional time in seconds. If set the callback will be called at most once in this
+            period and only with the latest event, wrapped in a :class:`~HABApp.core.events.CoalescedEvent`
+            (see :meth:`~HABApp.Rule.listen_event`)
+        :param queue_policy: What happens when the queue of the thread pool is full
+            (see :meth:`~HABApp.Rule.listen_event`)
+        :param serial: Run the callbacks strictly in the order of the events (see :meth:`~HABApp.Rule.listen_event`)
         """
-        return get_current_context().rule.listen_event(self._name, callback=callback, event_filter=event_filter)
+        return get_current_context().rule.listen_event(
+            self._name, callback=callback, event_filter=event_filter, coalesce=coalesce, queue_policy=queue_policy,
+            serial=serial)
 
     def _on_item_added(self):
         """This function gets automatically called when the item is added to the item registry
@@ -1,10 +1,11 @@
 import logging
-from typing import Generic, TypeVar, List, Union, Type
+from time import time
+from typing import Generic, TypeVar, List, Union, Type, Tuple, Optional
 
-from pendulum import DateTime
+from pendulum import DateTime, UTC, from_timestamp
+
+from eascheduler.const import local_tz
 
-from HABApp.core.asyncio import create_task
-from HABApp.core.wrapper import log_exception
 from .base_item_watch import BaseWatch, ItemNoChangeWatch, ItemNoUpdateWatch
 
 log = logging.getLogger('HABApp')
@@ -15,18 +16,41 @@ WATCH_OBJ = TypeVar("WATCH_OBJ", bound=BaseWatch)
 class ItemTimes(Generic[WATCH_OBJ]):
     WATCH: Union[Type[ItemNoUpdateWatch], Type[ItemNoChangeWatch]]
 
-    def __init__(self, name: str, dt: DateTime):
+    def __init__(self, name: str, ts: float):
         self.name: str = name
-        self.dt: DateTime = dt
+        # timestamp as returned by time.time(), the DateTime objects are only created on demand
+        self.ts: float = ts
         self.tasks: List[WATCH_OBJ] = []
 
-    def set(self, dt: DateTime, events=True):
-        self.dt = dt
+        # cached conversions (timestamp, DateTime), the timestamp is part of the cache so it can't get stale
+        self._dt: Optional[Tuple[float, DateTime]] = None
+        self._local: Optional[Tuple[float, DateTime]] = None
+
+    @property
+    def dt(self) -> DateTime:
+        ts = self.ts
+        if (cache := self._dt) is None or cache[0] != ts:
+            self._dt = cache = (ts, from_timestamp(ts, UTC))
+        return cache[1]
+
+    @property
+    def local_dt(self) -> DateTime:
+        ts = self.ts
+        if (cache := self._local) is None or cache[0] != ts:
+            self._local = cache = (ts, from_timestamp(ts, local_tz).naive())
+        return cache[1]
+
+    @property
+    def age(self) -> float:
+        return time() - self.ts
+
+    def set(self, ts: float, events=True):
+        self.ts = ts
         if not self.tasks:
             return
 
         if events:
-            create_task(self.schedule_events())
+            self.schedule_events()
         return None
 
     def add_watch(self, secs: Union[int, float]) -> WATCH_OBJ:
@@ -41,20 +65,23 @@ class ItemTimes(Generic[WATCH_OBJ]):
         log.debug(f'Added {self.WATCH.__name__} ({w.fut.secs}s) for {self.name}')
         return w
 
-    @log_exception
-    async def schedule_events(self):
-        canceled = []
-        for t in self.tasks:
+    def schedule_events(self):
+        # resetting only moves the deadline, so this can be called directly from the worker threads.
+        # add_watch might append to the list at the same time, so iterate over a copy
+        canceled = False
+        for t in tuple(self.tasks):
             if t.fut.is_canceled:
-                canceled.append(t)
+                canceled = True
             else:
                 t.fut.reset()
 
         # remove canceled tasks
         if canceled:
-            for c in canceled:
-                self.tasks.remove(c)
-                log.debug(f'Removed {self.WATCH.__name__} ({c.fut.secs}s) for {self.name}')
+            tasks = self.tasks
+            self.tasks = [t for t in tasks if not t.fut.is_canceled]
+            for c in tasks:
+                if c.fut.is_canceled:
+                    log.debug(f'Removed {self.WATCH.__name__} ({c.fut.secs}s) for {self.name}')
         return None
 
 
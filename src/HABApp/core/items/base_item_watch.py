@@ -2,9 +2,8 @@ import logging
 import typing
 
 import HABApp
-from HABApp.core.asyncio import create_task
 from HABApp.core.events import ItemNoChangeEvent, ItemNoUpdateEvent, EventFilter
-from HABApp.core.lib import PendingFuture
+from HABApp.core.lib import Deadline
 from HABApp.core.const.hints import HINT_EVENT_CALLBACK
 from HABApp.core.internals import uses_post_event, get_current_context, AutoContextBoundObj, wrap_func
 from HABApp.core.internals import ContextBoundEventBusListener
@@ -19,20 +18,17 @@ class BaseWatch(AutoContextBoundObj):
 
     def __init__(self, name: str, secs: typing.Union[int, float]):
         super(BaseWatch, self).__init__()
-        self.fut = PendingFuture(self._post_event, secs)
+        self.fut = Deadline(self._post_event, secs)
         self.name: str = name
 
-    async def _post_event(self):
+    def _post_event(self):
         post_event(self.name, self.EVENT(self.name, self.fut.secs))
 
-    async def __cancel_watch(self):
-        self.fut.cancel()
-        log.debug(f'Canceled {self.__class__.__name__} ({self.fut.secs}s) for {self.name}')
-
     def cancel(self):
         """Cancel the item watch"""
         self._ctx_unlink()
-        create_task(self.__cancel_watch())
+        self.fut.cancel()
+        log.debug(f'Canceled {self.__class__.__name__} ({self.fut.secs}s) for {self.name}')
 
     def listen_event(self, callback: HINT_EVENT_CALLBACK) -> 'HABApp.core.base.HINT_EVENT_BUS_LISTENER':
         """Listen to (only) the event that is emitted by this watcher"""
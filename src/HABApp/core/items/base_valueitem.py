@@ -1,13 +1,12 @@
 import logging
 import typing
 from math import ceil, floor
-
-from pendulum import UTC
-from pendulum import now as pd_now
+from time import time
 
 from HABApp.core.events import ValueChangeEvent, ValueUpdateEvent
 from HABApp.core.internals import uses_post_event
 from HABApp.core.items.base_item import BaseItem
+from HABApp.core.items.item_history import HISTORY_BUDGET, HISTORY_SIZES, ItemHistory
 
 log = logging.getLogger('HABApp')
 
@@ -27,6 +26,49 @@ class BaseValueItem(BaseItem):
         super().__init__(name)
 
         self.value: typing.Any = initial_value
+        self._history: typing.Optional[ItemHistory] = None
+
+    @property
+    def history(self) -> typing.Optional[ItemHistory]:
+        """
+        :return: The history of the item values or None if the history is not enabled (read only)
+        """
+        return self._history
+
+    def enable_history(self, size: int) -> ItemHistory:
+        """Keep the last values of the item in a history. An already existing history will be replaced,
+        the newest values of it are kept.
+
+        :param size: max amount of values in the history
+        :return: the history
+        """
+        history = ItemHistory(size)
+        old = self._history
+        old_size = old.size if old is not None else 0
+        if not HISTORY_BUDGET.reserve(size - old_size):
+            raise ValueError(f'History of {self._name} with {size} entries would exceed the max entries '
+                             f'of all histories ({HISTORY_BUDGET.max_entries})!')
+
+        if old is not None:
+            for ts, value in old.last(size):
+                history.append(ts, value)
+
+        self._history = history
+        return history
+
+    def _take_history(self, item: 'BaseValueItem'):
+        # Keep the history when an item is replaced, e.g. because the type has changed.
+        # The history is moved so the budget doesn't change.
+        if self._history is None and (history := item._history) is not None:
+            item._history = None
+            self._history = history
+
+    def disable_history(self):
+        """Remove the history of the item values"""
+        if (history := self._history) is None:
+            return None
+        self._history = None
+        HISTORY_BUDGET.release(history.size)
 
     def set_value(self, new_value) -> bool:
         """Set a new value without creating events on the event bus
@@ -36,11 +78,14 @@ class BaseValueItem(BaseItem):
         """
         state_changed = self.value != new_value
 
-        _now = pd_now(UTC)
+        _now = time()
         if state_changed:
             self._last_change.set(_now)
         self._last_update.set(_now)
 
+        if self._history is not None:
+            self._history.append(_now, new_value)
+
         self.value = new_value
         return state_changed
 
@@ -73,6 +118,18 @@ class BaseValueItem(BaseItem):
             return default_value
         return self.value
 
+    def _on_item_added(self):
+        super()._on_item_added()
+        if self._history is None and (size := HISTORY_SIZES.get_size(self._name)) is not None:
+            try:
+                self.enable_history(size)
+            except ValueError as e:
+                log.warning(str(e))
+
+    def _on_item_removed(self):
+        super()._on_item_removed()
+        self.disable_history()
+
     def __repr__(self):
         ret = ''
         for k in ['name', 'value', 'last_change', 'last_update']:
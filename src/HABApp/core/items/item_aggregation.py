@@ -11,6 +11,7 @@ from HABApp.core.wrapper import process_exception
 from HABApp.core.internals import uses_item_registry, uses_get_item, uses_event_bus, EventBusListener
 from HABApp.core.items import BaseValueItem
 from HABApp.core.events import EventFilter, ValueChangeEvent, ValueUpdateEvent
+from .aggregators import AGGREGATORS, Aggregator, get_aggregator
 
 
 get_item = uses_get_item()
@@ -43,6 +44,7 @@ class AggregationItem(BaseValueItem):
         super().__init__(name)
         self.__period: float = 0
         self.__aggregation_func: typing.Callable[[typing.Iterable], typing.Any] = lambda x: x
+        self.__aggregator: typing.Optional[Aggregator] = None
 
         self._ts: typing.Deque[float] = collections.deque()
         self._vals: typing.Deque[typing.Any] = collections.deque()
@@ -51,13 +53,26 @@ class AggregationItem(BaseValueItem):
 
         self.__task: typing.Optional[asyncio.Future] = None
 
-    def aggregation_func(self, func: typing.Callable[[typing.Iterable], typing.Any]) -> 'AggregationItem':
+    def aggregation_func(self, func: typing.Union[str, typing.Callable[[typing.Iterable], typing.Any]]) \
+            -> 'AggregationItem':
         """Set the function which will be used to aggregate all values. E.g. ``min`` or ``max``
 
         :param func: The function which takes an iterator an returns an aggregated value.
                      Important: the function must be **non blocking**!
+                     It can also be the name of a built-in aggregation
+                     (``count``, ``sum``, ``mean``, ``min``, ``max``, ``variance``, ``pvariance``,
+                     ``time_weighted_mean``) which is updated incrementally and is much faster for long periods.
+                     The built-in aggregations ignore ``None`` values.
         """
-        self.__aggregation_func = func
+        aggregator: typing.Optional[Aggregator] = None
+        if isinstance(func, str):
+            aggregator = get_aggregator(func)
+            for ts, val in zip(self._ts, self._vals):
+                aggregator.add(ts, val)
+            self.__aggregation_func = AGGREGATORS[func]
+        else:
+            self.__aggregation_func = func
+        self.__aggregator = aggregator
         return self
 
     def aggregation_period(self, period: typing.Union[float, int, timedelta]) -> 'AggregationItem':
@@ -73,11 +88,21 @@ class AggregationItem(BaseValueItem):
 
         # Clean old items (e.g. if we made the period shorter)
         while len(self._ts) > 1 and self._ts[1] + self.__period < time.time():
-            self._ts.popleft()
-            self._vals.popleft()
+            self.__remove_oldest()
 
         return self
 
+    def __remove_oldest(self):
+        ts = self._ts.popleft()
+        val = self._vals.popleft()
+        if self.__aggregator is not None:
+            self.__aggregator.remove(ts, val)
+
+    def __aggregate(self, now: float):
+        if self.__aggregator is not None:
+            return self.__aggregator.get(now - self.__period, now)
+        return self.__aggregation_func(self._vals)
+
     def aggregation_source(self, source: typing.Union[BaseValueItem, str],
                            only_changes: bool = False) -> 'AggregationItem':
         """Set the source item which changes will be aggregated
@@ -123,12 +148,11 @@ class AggregationItem(BaseValueItem):
                     now = time.time()
                     left = (ts + self.__period) - now
 
-                self._ts.popleft()
-                self._vals.popleft()
+                self.__remove_oldest()
 
                 # old entries are removed -> now do the aggregation
                 try:
-                    val = self.__aggregation_func(self._vals)
+                    val = self.__aggregate(now)
                 except Exception as e:
                     process_exception(self.__aggregation_func, e)
                     continue
@@ -141,14 +165,24 @@ class AggregationItem(BaseValueItem):
         return None
 
     async def _add_value(self, event: ValueChangeEvent):
-        self._ts.append(time.time())
-        self._vals.append(event.value)
+        now = time.time()
+        value = event.value
+        if self.__aggregator is not None:
+            try:
+                self.__aggregator.add(now, value)
+            except Exception as e:
+                process_exception(self.__aggregation_func, e)
+                # the value is not part of the aggregation so it must not be removed from it later
+                value = None
+
+        self._ts.append(now)
+        self._vals.append(value)
 
         if self.__task is None:
             self.__task = asyncio.create_task(self.__update_task())
 
         try:
-            val = self.__aggregation_func(self._vals)
+            val = self.__aggregate(now)
         except Exception as e:
             process_exception(self.__aggregation_func, e)
             return None
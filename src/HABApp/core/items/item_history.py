@@ -0,0 +1,215 @@
+from array import array
+from datetime import datetime, timedelta
+from math import ceil, fsum
+from threading import Lock
+from time import time
+from typing import Any, Dict, Final, List, Optional, Tuple, Union
+
+from HABApp.config import CONFIG
+from HABApp.core.internals.event_bus.topic_index import TopicPattern, is_topic_pattern
+
+HINT_WINDOW = Union[None, int, float, timedelta, datetime]
+
+
+class HistoryBudget:
+    """Limits the amount of history entries of all items together"""
+
+    def __init__(self, max_entries: int = 0):
+        self._lock: Final = Lock()
+        self.max_entries: int = max_entries
+        self.used: int = 0
+
+    def reserve(self, size: int) -> bool:
+        with self._lock:
+            if self.max_entries and self.used + size > self.max_entries:
+                return False
+            self.used += size
+            return True
+
+    def release(self, size: int):
+        with self._lock:
+            self.used -= size
+
+
+class HistorySizes:
+    """History size for the items from the configuration, the name can be a pattern"""
+
+    def __init__(self):
+        self._names: Dict[str, int] = {}
+        self._patterns: Tuple[Tuple[TopicPattern, int], ...] = ()
+
+    def set_sizes(self, sizes: Dict[str, int]):
+        self._names = {k: v for k, v in sizes.items() if not is_topic_pattern(k)}
+        self._patterns = tuple((TopicPattern(k), v) for k, v in sizes.items() if is_topic_pattern(k))
+
+    def get_size(self, name: str) -> Optional[int]:
+        if (size := self._names.get(name)) is not None:
+            return size
+        for pattern, size in self._patterns:
+            if pattern.matches(name):
+                return size
+        return None
+
+
+HISTORY_BUDGET: Final = HistoryBudget()
+HISTORY_SIZES: Final = HistorySizes()
+
+
+def _get_start(window: HINT_WINDOW) -> float:
+    if isinstance(window, datetime):
+        # naive datetime objects are local time (like last_update and last_change of the item)
+        return datetime.timestamp(window)
+    if isinstance(window, timedelta):
+        window = window.total_seconds()
+    if not isinstance(window, (int, float)) or window < 0:
+        raise ValueError(f'Window must be a positive time or a datetime! Is: {window} ({type(window)})')
+    return time() - window
+
+
+class ItemHistory:
+    """Fixed size ring buffer with the timestamps (as returned by ``time.time()``) and the values of an item.
+
+    The window of the queries can be a time in seconds, a ``timedelta`` or a ``datetime`` from where on the
+    values are returned. If no window is passed all values of the history are used.
+
+    The values are added from the event loop and the queries can run in the worker threads, so the queries
+    work on a copy of the entries which is made under a lock.
+    The values can be of any type, so the queries use plain python instead of vectorized array operations and
+    only ``int`` and ``float`` values are used for the calculations.
+    """
+
+    def __init__(self, size: int):
+        if not isinstance(size, int) or size < 1:
+            raise ValueError(f'Size must be an int > 0! Is: {size} ({type(size)})')
+
+        self.size: Final = size
+        self._ts: Final = array('d', bytes(8 * size))
+        self._values: Final[List[Any]] = [None] * size
+
+        self._pos: int = 0      # position of the next entry
+        self._count: int = 0
+        self._lock: Final = Lock()
+
+    def __len__(self):
+        return self._count
+
+    def append(self, ts: float, value: Any):
+        with self._lock:
+            pos = self._pos
+            self._ts[pos] = ts
+            self._values[pos] = value
+
+            pos += 1
+            self._pos = pos if pos < self.size else 0
+            if self._count < self.size:
+                self._count += 1
+
+    def clear(self):
+        with self._lock:
+            self._values[:] = [None] * self.size
+            self._pos = 0
+            self._count = 0
+
+    def _slice(self, buf, start: int) -> list:
+        # return the entries from the (logical) position start to the newest entry in chronological order
+        count = self._count - start
+        if count <= 0:
+            return []
+
+        size = self.size
+        first = (self._pos - count) % size
+        end = first + count
+        if end <= size:
+            return list(buf[first:end])
+        return list(buf[first:]) + list(buf[:end - size])
+
+    def _get_start_index(self, window: HINT_WINDOW) -> int:
+        if window is None:
+            return 0
+
+        start_ts = _get_start(window)
+        ts = self._ts
+        size = self.size
+        offset = self._pos - self._count
+
+        # binary search for the first entry which is not older than the start
+        lo = 0
+        hi = self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ts[(offset + mid) % size] < start_ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def last(self, count: int) -> List[Tuple[float, Any]]:
+        """Return the last entries
+
+        :param count: max amount of entries
+        :return: list with (timestamp, value) - the oldest entry is first
+        """
+        with self._lock:
+            start = max(self._count - count, 0)
+            return list(zip(self._slice(self._ts, start), self._slice(self._values, start)))
+
+    def since(self, window: HINT_WINDOW) -> List[Tuple[float, Any]]:
+        """Return the entries of a time window
+
+        :param window: time window
+        :return: list with (timestamp, value) - the oldest entry is first
+        """
+        with self._lock:
+            start = self._get_start_index(window)
+            return list(zip(self._slice(self._ts, start), self._slice(self._values, start)))
+
+    def values(self, window: HINT_WINDOW = None) -> List[Any]:
+        """Return the values of a time window
+
+        :param window: time window
+        :return: list with values - the oldest value is first
+        """
+        with self._lock:
+            return self._slice(self._values, self._get_start_index(window))
+
+    def _numbers(self, window: HINT_WINDOW) -> List[Union[int, float]]:
+        return [v for v in self.values(window) if isinstance(v, (int, float))]
+
+    def min(self, window: HINT_WINDOW = None) -> Optional[Any]:
+        """Return the min of the values in the time window or None if there are no values"""
+        values = self._numbers(window)
+        return min(values) if values else None
+
+    def max(self, window: HINT_WINDOW = None) -> Optional[Any]:
+        """Return the max of the values in the time window or None if there are no values"""
+        values = self._numbers(window)
+        return max(values) if values else None
+
+    def mean(self, window: HINT_WINDOW = None) -> Optional[float]:
+        """Return the mean of the values in the time window or None if there are no values"""
+        values = self._numbers(window)
+        return fsum(values) / len(values) if values else None
+
+    def percentile(self, percent: Union[int, float], window: HINT_WINDOW = None) -> Optional[Any]:
+        """Return the percentile (nearest rank) of the values in the time window or None if there are no values
+
+        :param percent: percentile, e.g. ``50`` for the median
+        :param window: time window
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError(f'Percent must be between 0 and 100! Is: {percent}')
+
+        values = self._numbers(window)
+        if not values:
+            return None
+        values.sort()
+        return values[max(0, ceil(len(values) * percent / 100) - 1)]
+
+
+def setup_history():
+    HISTORY_BUDGET.max_entries = HISTORY_CFG.max_entries
+    HISTORY_SIZES.set_sizes(HISTORY_CFG.items)
+
+
+HISTORY_CFG = CONFIG.habapp.item_history
+HISTORY_CFG.subscribe_for_changes(setup_history)
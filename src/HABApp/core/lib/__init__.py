@@ -1,6 +1,7 @@
 from . import parameters
 from .funcs import list_files, sort_files
 from .pending_future import PendingFuture
+from .deadline_scheduler import Deadline
 from .single_task import SingleTask
 from .rgb_hsv import hsb_to_rgb, rgb_to_hsb
 from .exceptions import format_exception
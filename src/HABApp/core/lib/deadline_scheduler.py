@@ -0,0 +1,125 @@
+from asyncio import TimerHandle
+from heapq import heappop, heappush
+from itertools import count
+from threading import Lock
+from typing import Any, Callable, Final, List, Optional, Tuple, Union
+
+from HABApp.core.const import loop
+
+
+class Deadline:
+    """Calls the function once when the deadline has been reached without a reset.
+    A reset only moves the deadline so it is cheap and can be done from any thread."""
+
+    def __init__(self, func: Callable[[], Any], secs: Union[int, float],
+                 scheduler: Optional['DeadlineScheduler'] = None):
+        if not isinstance(secs, (int, float)) or secs < 0:
+            raise ValueError(f'Pending time must be int/float and >= 0! Is: {secs} ({type(secs)})')
+
+        self.func: Final = func
+        self.secs: Final = secs
+        self.scheduler: Final = scheduler if scheduler is not None else DEADLINE_SCHEDULER
+
+        self.deadline: Optional[float] = None
+        self.is_canceled: bool = False
+
+        # True as long as there is an entry in the heap of the scheduler
+        self._in_heap: bool = False
+
+    @property
+    def is_pending(self) -> bool:
+        return self.deadline is not None
+
+    def cancel(self):
+        # the entry in the heap is dropped lazily
+        self.is_canceled = True
+        self.deadline = None
+
+    def reset(self):
+        if self.is_canceled:
+            return None
+        self.scheduler.set_deadline(self, loop.time() + self.secs)
+
+
+class DeadlineScheduler:
+    """Runs all deadlines from a heap with a single timer on the event loop.
+
+    The heap entries are updated lazily: a deadline which has been moved is pushed again with the new time
+    when its old entry is due. So there is at most one entry per deadline
+    and the reset of a pending deadline requires no heap operation.
+    """
+
+    def __init__(self):
+        self._lock: Final = Lock()
+        self._heap: List[Tuple[float, int, Deadline]] = []
+        self._counter: Final = count()
+
+        self._timer: Optional[TimerHandle] = None
+        self._timer_at: Optional[float] = None
+
+    def __len__(self):
+        return len(self._heap)
+
+    def set_deadline(self, obj: Deadline, deadline: float):
+        with self._lock:
+            obj.deadline = deadline
+            if obj._in_heap:
+                return None
+
+            obj._in_heap = True
+            heappush(self._heap, (deadline, next(self._counter), obj))
+
+            # only the loop thread may schedule the timer
+            if self._heap[0][2] is obj and (self._timer_at is None or deadline < self._timer_at):
+                loop.call_soon_threadsafe(self._schedule)
+
+    def _schedule(self):
+        with self._lock:
+            if not self._heap:
+                return None
+
+            at = self._heap[0][0]
+            if self._timer_at is not None and self._timer_at <= at:
+                return None
+
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = loop.call_at(at, self._run)
+            self._timer_at = at
+
+    def _run(self):
+        self._timer = None
+        self._timer_at = None
+
+        due: List[Deadline] = []
+        now = loop.time()
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                obj = heappop(heap)[2]
+                deadline = obj.deadline
+                if deadline is None or obj.is_canceled:
+                    obj._in_heap = False
+                elif deadline > now:
+                    heappush(heap, (deadline, next(self._counter), obj))
+                else:
+                    obj._in_heap = False
+                    obj.deadline = None
+                    due.append(obj)
+
+        self._schedule()
+
+        if not due:
+            return None
+
+        # import here, otherwise we get cyclic imports
+        from HABApp.core.wrapper import process_exception
+
+        for obj in due:
+            try:
+                obj.func()
+            except Exception as e:
+                process_exception(obj.func, e)
+
+
+DEADLINE_SCHEDULER: Final = DeadlineScheduler()
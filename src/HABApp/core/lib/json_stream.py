@@ -0,0 +1,92 @@
+import re
+from codecs import getincrementaldecoder
+from typing import Any, Callable, List
+
+from HABApp.core.const.json import load_json
+
+# Characters which change the nesting level or start/end a string
+RE_STRUCTURE: re.Pattern = re.compile(r'[\[\]{}"]')
+RE_STRING_END: re.Pattern = re.compile(r'["\\]')
+
+
+class JsonArrayStream:
+    """Parses a json array of objects incrementally, e.g. from a http response.
+    The data is only scanned for the object boundaries and every complete object is passed to the json loader,
+    so only the currently incomplete object has to be kept in memory."""
+
+    def __init__(self, loads: Callable[[str], Any] = load_json):
+        self._loads = loads
+        self._decoder = getincrementaldecoder('utf-8')()
+
+        self._buf: str = ''
+        self._pos: int = 0
+        self._obj_start: int = -1
+        self._depth: int = 0
+        self._in_str: bool = False
+        self._done: bool = False
+
+    def feed_bytes(self, data: bytes) -> List[Any]:
+        return self.feed(self._decoder.decode(data))
+
+    def feed(self, text: str) -> List[Any]:
+        """Add data and return the objects which are complete"""
+        buf = self._buf = self._buf + text
+        pos = self._pos
+        depth = self._depth
+        in_str = self._in_str
+        obj_start = self._obj_start
+        ret = []
+
+        # pos can be behind the end of the buffer if the char after an escape has not yet been received
+        while pos < len(buf):
+            if in_str:
+                m = RE_STRING_END.search(buf, pos)
+                if m is None:
+                    pos = len(buf)
+                    break
+                pos = m.end()
+                if m.group() == '\\':
+                    # skip escaped char, it might not yet be in the buffer
+                    pos += 1
+                else:
+                    in_str = False
+                continue
+
+            m = RE_STRUCTURE.search(buf, pos)
+            if m is None:
+                pos = len(buf)
+                break
+            pos = m.end()
+
+            char = m.group()
+            if char == '"':
+                in_str = True
+            elif char == '{' or char == '[':
+                if depth == 0 and char != '[':
+                    raise ValueError('Expected a json array')
+                if char == '{' and depth == 1:
+                    obj_start = pos - 1
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 1 and char == '}':
+                    ret.append(self._loads(buf[obj_start:pos]))
+                    obj_start = -1
+                elif depth == 0:
+                    self._done = True
+                elif depth < 0:
+                    raise ValueError('Unexpected closing bracket')
+
+        # Keep only the unprocessed part
+        cut = obj_start if obj_start >= 0 else min(pos, len(buf))
+        self._buf = buf[cut:]
+        self._pos = pos - cut
+        self._obj_start = obj_start - cut if obj_start >= 0 else -1
+        self._depth = depth
+        self._in_str = in_str
+        return ret
+
+    def close(self):
+        self.feed(self._decoder.decode(b'', final=True))
+        if not self._done or self._buf.strip():
+            raise ValueError('Incomplete json array')
@@ -0,0 +1,85 @@
+import logging
+from asyncio import sleep
+from typing import Any, Callable, Dict, Optional, Union
+
+import HABApp
+from HABApp.config import CONFIG
+from HABApp.core.lib import SingleTask
+
+log = logging.getLogger('HABApp.Metrics')
+
+HINT_METRIC_VALUE = Union[int, float]
+HINT_METRIC_SOURCE = Callable[[], Dict[str, HINT_METRIC_VALUE]]
+
+_SOURCES: Dict[str, HINT_METRIC_SOURCE] = {}
+_RESETS: Dict[str, Callable[[], Any]] = {}
+
+
+def register_metrics(name: str, source: HINT_METRIC_SOURCE, reset: Optional[Callable[[], Any]] = None):
+    """Register a function which returns the current values of the metrics of a HABApp component
+
+    :param name: name of the component, e.g. ``ThreadPool``
+    :param source: function which returns a dict with metric name and value
+    :param reset: function which is called after the metrics have been published, e.g. to reset metrics
+                  which are calculated for the publish interval
+    """
+    assert isinstance(name, str) and name, name
+    assert callable(source)
+    assert reset is None or callable(reset)
+    _SOURCES[name] = source
+    if reset is None:
+        _RESETS.pop(name, None)
+    else:
+        _RESETS[name] = reset
+
+
+def remove_metrics(name: str):
+    _SOURCES.pop(name, None)
+    _RESETS.pop(name, None)
+
+
+def get_metrics() -> Dict[str, Dict[str, HINT_METRIC_VALUE]]:
+    """Return the current values of all HABApp metrics
+
+    :return: dict with component name and the metrics of the component
+    """
+    return {name: source() for name, source in _SOURCES.items()}
+
+
+def get_metric_item_name(component: str, metric: str) -> str:
+    return f'{METRICS_CFG.prefix}{component}_{metric}'
+
+
+async def _publish_metrics():
+    from HABApp.core.items import Item
+
+    while True:
+        await sleep(METRICS_CFG.interval)
+
+        try:
+            for component, values in get_metrics().items():
+                for metric, value in values.items():
+                    Item.get_create_item(get_metric_item_name(component, metric)).post_value(value)
+            for reset in _RESETS.values():
+                reset()
+        except Exception as e:
+            HABApp.core.wrapper.process_exception(_publish_metrics, e, logger=log)
+
+
+PUBLISH_TASK = SingleTask(_publish_metrics, 'PublishMetrics')
+
+
+def setup():
+    PUBLISH_TASK.cancel()
+    if not METRICS_CFG.enabled:
+        return None
+
+    PUBLISH_TASK.start()
+
+    # this function can be called multiple times, so it's no problem if we register it more than once!
+    from HABApp.runtime import shutdown
+    shutdown.register_func(PUBLISH_TASK.cancel, msg='Stopping metrics')
+
+
+METRICS_CFG = CONFIG.habapp.metrics
+METRICS_CFG.subscribe_for_changes(setup)
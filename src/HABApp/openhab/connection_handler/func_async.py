@@ -1,16 +1,17 @@
 import datetime
 import typing
 import warnings
-from typing import Any, Optional, Dict, List
+from typing import Any, AsyncIterator, Optional, Dict, List
 from urllib.parse import quote as quote_url
 
 from pydantic import parse_obj_as
 
 from HABApp.core.const.json import load_json
+from HABApp.core.lib.json_stream import JsonArrayStream
 from HABApp.core.items import BaseValueItem
 from HABApp.openhab.definitions.rest import ItemChannelLinkDefinition, LinkNotFoundError, OpenhabThingDefinition
 from HABApp.openhab.definitions.rest.habapp_data import get_api_vals, load_habapp_meta
-from HABApp.openhab.errors import ThingNotEditableError, \
+from HABApp.openhab.errors import ExpectedSuccessFromOpenhab, ThingNotEditableError, \
     ThingNotFoundError, ItemNotEditableError, ItemNotFoundError, MetadataNotEditableError
 from .http_connection import delete, get, put, post, async_get_root, async_get_uuid, async_send_command, \
     async_post_update
@@ -60,6 +61,24 @@ async def async_get_items(include_habapp_meta=False, metadata: Optional[str] = N
     return await resp.json(loads=load_json, encoding='utf-8')
 
 
+async def async_get_items_stream(all_metadata=False) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Load the item definitions and yield them while they are downloaded, so they can be processed before the
+    whole response was received."""
+    params = {'metadata': '.+'} if all_metadata else None
+
+    resp = await get('/rest/items', params=params)
+    # release the connection also if the processing of the items fails
+    async with resp:
+        if resp.status >= 300:
+            raise ExpectedSuccessFromOpenhab(f'Could not load items (status {resp.status})')
+
+        stream = JsonArrayStream()
+        async for chunk in resp.content.iter_chunked(64 * 1024):
+            if items := stream.feed_bytes(chunk):
+                yield items
+        stream.close()
+
+
 async def async_get_item(item: str, metadata: Optional[str] = None, all_metadata=False) -> dict:
     params = None if metadata is None else {'metadata': metadata}
     if all_metadata:
@@ -75,11 +94,13 @@ async def async_get_item(item: str, metadata: Optional[str] = None, all_metadata
         return data
 
 
-async def async_get_things() -> List[OpenhabThingDefinition]:
+async def async_get_things_raw() -> List[Dict[str, Any]]:
     resp = await get('/rest/things')
-    data = await resp.json(loads=load_json, encoding='utf-8')
+    return await resp.json(loads=load_json, encoding='utf-8')
 
-    return parse_obj_as(List[OpenhabThingDefinition], data)
+
+async def async_get_things() -> List[OpenhabThingDefinition]:
+    return parse_obj_as(List[OpenhabThingDefinition], await async_get_things_raw())
 
 
 async def async_get_thing(uid: str) -> OpenhabThingDefinition:
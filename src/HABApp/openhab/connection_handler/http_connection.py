@@ -3,11 +3,12 @@ import logging
 import traceback
 import typing
 from typing import Any, Optional, Final
-from asyncio import Queue, sleep, QueueEmpty
+from asyncio import sleep
+from time import monotonic
 
 import aiohttp
 from aiohttp.client import ClientResponse, _RequestContextManager
-from aiohttp.hdrs import METH_GET, METH_POST, METH_PUT, METH_DELETE
+from aiohttp.hdrs import CONTENT_LENGTH, METH_GET, METH_POST, METH_PUT, METH_DELETE
 from aiohttp_sse_client import client as sse_client
 
 import HABApp
@@ -15,16 +16,23 @@ import HABApp.core
 import HABApp.openhab.events
 from HABApp.core.asyncio import async_context
 from HABApp.core.const.json import dump_json, load_json
+from HABApp.core.internals import uses_event_bus
 from HABApp.core.logger import log_info, log_warning
+from HABApp.core.metrics import register_metrics
 from HABApp.core.wrapper import process_exception, ignore_exception
 from HABApp.openhab.errors import OpenhabDisconnectedError, ExpectedSuccessFromOpenhab
 from .http_connection_waiter import WaitBetweenConnects
+from .output_queue import OutputQueue
+from .request_stats import REQUEST_STATS, EndpointStats
+from .topic_filter import build_topic_filter
 from ...core.const.topics import TOPIC_EVENTS
 from ...core.lib import SingleTask
 
 log = logging.getLogger('HABApp.openhab.connection')
 log_events = logging.getLogger(f'{TOPIC_EVENTS}.openhab')
 
+event_bus = uses_event_bus()
+
 
 IS_ONLINE: bool = False
 IS_READ_ONLY: bool = False
@@ -46,7 +54,7 @@ async def get(url: str, log_404=True, **kwargs: Any) -> ClientResponse:
     mgr = _RequestContextManager(
         HTTP_SESSION._request(METH_GET, url, allow_redirects=HTTP_ALLOW_REDIRECTS, ssl=HTTP_VERIFY_SSL, **kwargs)
     )
-    return await check_response(mgr, log_404=log_404)
+    return await check_response(mgr, log_404=log_404, stats=REQUEST_STATS.get_endpoint(METH_GET, url))
 
 
 async def post(url: str, log_404=True, json=None, data=None, **kwargs: Any) -> Optional[ClientResponse]:
@@ -63,7 +71,8 @@ async def post(url: str, log_404=True, json=None, data=None, **kwargs: Any) -> O
 
     if data is None:
         data = json
-    return await check_response(mgr, log_404=log_404, sent_data=data)
+    return await check_response(mgr, log_404=log_404, sent_data=data,
+                                stats=REQUEST_STATS.get_endpoint(METH_POST, url))
 
 
 async def put(url: str, log_404=True, json=None, data=None, **kwargs: Any) -> Optional[ClientResponse]:
@@ -80,7 +89,8 @@ async def put(url: str, log_404=True, json=None, data=None, **kwargs: Any) -> Op
 
     if data is None:
         data = json
-    return await check_response(mgr, log_404=log_404, sent_data=data)
+    return await check_response(mgr, log_404=log_404, sent_data=data,
+                                stats=REQUEST_STATS.get_endpoint(METH_PUT, url))
 
 
 async def delete(url: str, log_404=True, json=None, data=None, **kwargs: Any) -> Optional[ClientResponse]:
@@ -95,11 +105,12 @@ async def delete(url: str, log_404=True, json=None, data=None, **kwargs: Any) ->
 
     if data is None:
         data = json
-    return await check_response(mgr, log_404=log_404, sent_data=data)
+    return await check_response(mgr, log_404=log_404, sent_data=data,
+                                stats=REQUEST_STATS.get_endpoint(METH_DELETE, url))
 
 
 def set_offline(log_msg=''):
-    global IS_ONLINE
+    global IS_ONLINE, REFRESH_ITEM_STATES
 
     if not IS_ONLINE:
         return None
@@ -109,8 +120,13 @@ def set_offline(log_msg=''):
 
     # cancel SSE listener
     TASK_SSE_LISTENER.cancel()
+    TASK_TOPIC_FILTER.cancel()
+    TASK_REFRESH_STATES.cancel()
     TASK_TRY_CONNECT.cancel()
 
+    # all items are loaded again when the connection is established
+    REFRESH_ITEM_STATES = False
+
     ON_DISCONNECTED()
 
     TASK_TRY_CONNECT.start()
@@ -130,17 +146,32 @@ def is_disconnect_exception(e) -> bool:
 
 
 async def check_response(future: aiohttp.client._RequestContextManager, sent_data=None,
-                         log_404=True, disconnect_on_error=False) -> ClientResponse:
+                         log_404=True, disconnect_on_error=False,
+                         stats: Optional[EndpointStats] = None) -> ClientResponse:
+    if stats is not None:
+        stats.in_flight += 1
+        REQUEST_STATS.in_flight += 1
+    start = monotonic()
+
     try:
         resp = await future
     except Exception as e:
+        if stats is not None:
+            stats.add(monotonic() - start, None, None, None)
         is_disconnect = is_disconnect_exception(e)
         log.log(logging.WARNING if is_disconnect else logging.ERROR, f'"{e}" ({type(e)})')
         if is_disconnect:
             raise OpenhabDisconnectedError()
         raise
+    finally:
+        if stats is not None:
+            stats.in_flight -= 1
+            REQUEST_STATS.in_flight -= 1
 
     status = resp.status
+    if stats is not None:
+        stats.add(monotonic() - start, status, int(resp.request_info.headers.get(CONTENT_LENGTH, 0)),
+                  resp.content_length)
 
     # Sometimes openHAB issues 404 instead of 500 during startup
     if disconnect_on_error and status >= 400:
@@ -172,6 +203,7 @@ async def shutdown_connection():
 
     TASK_TRY_CONNECT.cancel()
     TASK_SSE_LISTENER.cancel()
+    TASK_TOPIC_FILTER.cancel()
 
     TASK_QUEUE_WORKER.cancel()
     TASK_QUEUE_WATCHER.cancel()
@@ -222,9 +254,16 @@ async def start_sse_event_listener():
         # cache so we don't have to look up every event
         _load_json = load_json
         _see_handler = on_sse_event
+        _event_handler = on_openhab_event
+        _get_event_fast = get_event_fast
 
-        async with sse_client.EventSource(url=f'/rest/events?topics={HABApp.CONFIG.openhab.connection.topic_filter}',
+        async with sse_client.EventSource(url=f'/rest/events?topics={get_topic_filter()}',
                                           session=HTTP_SESSION, ssl=HTTP_VERIFY_SSL) as event_source:
+
+            # The new topic filter is active, now we can load the states which we might have missed
+            if REFRESH_ITEM_STATES:
+                TASK_REFRESH_STATES.start()
+
             async for event in event_source:
 
                 e_str = event.data
@@ -234,6 +273,19 @@ async def start_sse_event_listener():
                 if e_str == '{"type":"ALIVE"}':
                     continue
 
+                # Fast path for the item state events which don't require to decode the json
+                try:
+                    event_obj = _get_event_fast(e_str)
+                except Exception as e:
+                    # same error handling as in on_sse_event, one invalid event must not stop the listener
+                    process_exception(func=on_sse_event, e=e)
+                    continue
+                if event_obj is not None:
+                    if log_events.isEnabledFor(logging.DEBUG):
+                        log_events._log(logging.DEBUG, e_str, [])
+                    _event_handler(event_obj)
+                    continue
+
                 try:
                     e_json = _load_json(e_str)
                 except ValueError:
@@ -261,31 +313,89 @@ async def start_sse_event_listener():
             set_offline(f'Uncaught error in process_sse_events: {e}')
 
 
-QUEUE = Queue()
+SSE_TOPIC_FILTER: Optional[str] = None
+REFRESH_ITEM_STATES: bool = False
 
 
-async def output_queue_listener():
-    # clear Queue
-    try:
-        while True:
-            await QUEUE.get_nowait()
-    except QueueEmpty:
-        pass
+def get_topic_filter() -> str:
+    global SSE_TOPIC_FILTER
+
+    config = HABApp.CONFIG.openhab.connection
+    if not config.auto_topic_filter:
+        return config.topic_filter
+
+    SSE_TOPIC_FILTER = build_topic_filter(event_bus.get_listener_topics())
+    if SSE_TOPIC_FILTER is None:
+        return config.topic_filter
+    return SSE_TOPIC_FILTER
+
+
+async def watch_topic_filter():
+    global REFRESH_ITEM_STATES
+
+    # Rebuild the filter once the listeners did not change for the debounce time, e.g. after the rules were loaded
+    config = HABApp.CONFIG.openhab.connection
+    applied = last = event_bus.version
 
     while True:
-        try:
-            while True:
-                item, state, is_cmd = await QUEUE.get()
+        await sleep(config.auto_topic_filter_debounce)
 
-                if not isinstance(state, str):
-                    state = convert_to_oh_type(state)
+        version = event_bus.version
+        if version != last:
+            last = version
+            continue
+        if version == applied:
+            continue
+        applied = version
 
-                if is_cmd:
-                    await post(f'/rest/items/{item:s}', data=state)
-                else:
-                    await put(f'/rest/items/{item:s}/state', data=state)
-        except Exception as e:
-            process_exception(output_queue_listener, e, logger=log)
+        old = SSE_TOPIC_FILTER
+        if build_topic_filter(event_bus.get_listener_topics()) != old:
+            log.debug('Listeners changed, updating topic filter')
+            REFRESH_ITEM_STATES = True
+            TASK_SSE_LISTENER.start()
+
+
+@ignore_exception
+async def refresh_item_states():
+    # Items which were not part of the old topic filter have not been updated and the events which were sent
+    # while the SSE listener reconnected are lost. So the states are loaded again after the filter was changed.
+    global REFRESH_ITEM_STATES
+    REFRESH_ITEM_STATES = False
+
+    resp = await get('/rest/items', params={'fields': 'name,type,state'})
+    if resp.status >= 300:
+        raise ExpectedSuccessFromOpenhab(f'Could not load items (status {resp.status})')
+    data = await resp.json(loads=load_json, encoding='utf-8')
+
+    refreshed = 0
+    for _dict in data:
+        item = map_item(_dict['name'], _dict['type'], _dict['state'], None, frozenset(), frozenset(), None)
+        if item is not None and refresh_item_state(item):
+            refreshed += 1
+    log.debug(f'Refreshed the state of {refreshed:d} items after the topic filter was changed')
+
+
+OUT_QUEUE: Final = OutputQueue()
+
+
+async def _send_queued(item: str, state: Any, is_cmd: bool):
+    if not isinstance(state, str):
+        state = convert_to_oh_type(state)
+
+    if is_cmd:
+        await post(f'/rest/items/{item:s}', data=state)
+    else:
+        await put(f'/rest/items/{item:s}/state', data=state)
+
+
+def _queue_error(e: Exception):
+    process_exception(output_queue_listener, e, logger=log)
+
+
+async def output_queue_listener():
+    # clear Queue
+    OUT_QUEUE.clear()
+    await OUT_QUEUE.run(HABApp.CONFIG.openhab.connection.request_workers, _send_queued, _queue_error)
 
 
 @ignore_exception
@@ -299,7 +409,7 @@ async def output_queue_check_size():
 
     while True:
         await sleep(5)
-        size = QUEUE.qsize()
+        size = OUT_QUEUE.size
 
         # small log msg
         if size > upper:
@@ -317,11 +427,11 @@ async def output_queue_check_size():
 
 
 async def async_post_update(item, state: Any):
-    QUEUE.put_nowait((item, state, False))
+    OUT_QUEUE.put(item, state, False)
 
 
 async def async_send_command(item, state: Any):
-    QUEUE.put_nowait((item, state, True))
+    OUT_QUEUE.put(item, state, True)
 
 
 async def async_get_uuid() -> str:
@@ -417,6 +527,8 @@ async def try_connect():
 
     # start sse processing
     TASK_SSE_LISTENER.start()
+    if HABApp.CONFIG.openhab.connection.auto_topic_filter:
+        TASK_TOPIC_FILTER.start()
 
     # output messages
     TASK_QUEUE_WORKER.start()
@@ -427,11 +539,16 @@ async def try_connect():
 
 
 TASK_SSE_LISTENER: Final = SingleTask(start_sse_event_listener, 'SSE event listener')
+TASK_TOPIC_FILTER: Final = SingleTask(watch_topic_filter, 'SSE topic filter')
+TASK_REFRESH_STATES: Final = SingleTask(refresh_item_states, 'Refresh item states')
 TASK_TRY_CONNECT: Final = SingleTask(try_connect, 'Try OH connect')
 
 TASK_QUEUE_WORKER: Final = SingleTask(output_queue_listener, 'OhQueue')
 TASK_QUEUE_WATCHER: Final = SingleTask(output_queue_check_size, 'OhQueueSize')
 
+register_metrics('openHAB', OUT_QUEUE.get_metrics, OUT_QUEUE.reset_metrics)
+register_metrics('openHAB_REST', REQUEST_STATS.get_metrics)
+
 
 def __load_cfg():
     global IS_READ_ONLY
@@ -444,5 +561,8 @@ HABApp.config.CONFIG.subscribe_for_changes(__load_cfg)
 
 
 # import it here otherwise we get cyclic imports
-from HABApp.openhab.connection_handler.sse_handler import on_sse_event  # noqa: E402
+from HABApp.openhab.connection_handler.sse_handler import on_sse_event, on_openhab_event  # noqa: E402
+from HABApp.openhab.map_events import get_event_fast  # noqa: E402
 from HABApp.openhab.connection_handler.func_async import convert_to_oh_type  # noqa: E402
+from HABApp.openhab.map_items import map_item  # noqa: E402
+from HABApp.openhab.item_to_reg import refresh_item_state  # noqa: E402
@@ -0,0 +1,118 @@
+from asyncio import Queue, QueueEmpty, gather
+from collections import deque
+from time import monotonic
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Union
+
+HINT_SEND_FUNC = Callable[[str, Any, bool], Awaitable[Any]]
+
+
+class OutputQueue:
+    """Queue for the updates and commands which are sent to openHAB.
+
+    The messages are sent by multiple workers concurrently, but there is always at most one request per item,
+    so the messages for an item are sent in the order they were queued.
+    An update for an item replaces the state of a not yet sent update for the same item (last write wins),
+    commands are never merged.
+    """
+
+    def __init__(self):
+        # item name -> pending messages ([state, is_cmd]), the entry exists as long as a message for the item
+        # is queued or is currently being sent
+        self._pending: Dict[str, Deque[List[Union[Any, bool]]]] = {}
+        # items which have pending messages and no request in progress
+        self._ready: Queue = Queue()
+        self._queued: int = 0
+        self._in_progress: int = 0
+
+        # metrics
+        self.sent: int = 0
+        self.coalesced: int = 0
+        self.errors: int = 0
+        self._latency_sum: float = 0
+        self._latency_count: int = 0
+        self._latency_max: float = 0
+
+    @property
+    def size(self) -> int:
+        return self._queued
+
+    def put(self, item: str, state: Any, is_cmd: bool):
+        pending = self._pending.get(item)
+        if pending is None:
+            self._pending[item] = deque([[state, is_cmd]])
+            self._ready.put_nowait(item)
+        elif not is_cmd and pending and not pending[-1][1]:
+            # newer update replaces the queued one
+            pending[-1][0] = state
+            self.coalesced += 1
+            return None
+        else:
+            pending.append([state, is_cmd])
+        self._queued += 1
+
+    def clear(self):
+        self._pending.clear()
+        self._queued = 0
+        try:
+            while True:
+                self._ready.get_nowait()
+        except QueueEmpty:
+            pass
+
+    async def worker(self, send: HINT_SEND_FUNC, on_error: Callable[[Exception], Any]):
+        pending_items = self._pending
+        ready = self._ready
+
+        while True:
+            item = await ready.get()
+            pending = pending_items.get(item)
+            if not pending:
+                continue
+
+            state, is_cmd = pending.popleft()
+            self._queued -= 1
+            self._in_progress += 1
+
+            start = monotonic()
+            try:
+                await send(item, state, is_cmd)
+                self.sent += 1
+            except Exception as e:
+                self.errors += 1
+                on_error(e)
+            finally:
+                self._in_progress -= 1
+                self._add_latency(monotonic() - start)
+
+                # the queue could have been cleared or reset in the meantime
+                if pending_items.get(item) is pending:
+                    if pending:
+                        ready.put_nowait(item)
+                    else:
+                        pending_items.pop(item)
+
+    async def run(self, workers: int, send: HINT_SEND_FUNC, on_error: Callable[[Exception], Any]):
+        await gather(*(self.worker(send, on_error) for _ in range(workers)))
+
+    def _add_latency(self, duration: float):
+        self._latency_sum += duration
+        self._latency_count += 1
+        if duration > self._latency_max:
+            self._latency_max = duration
+
+    def get_metrics(self) -> Dict[str, Union[int, float]]:
+        """Return the metrics of the queue. The request latency (in ms) is for the requests since the last
+        call of :meth:`reset_metrics`."""
+        count = self._latency_count
+        return {
+            'QueueSize': self._queued, 'InProgress': self._in_progress, 'Sent': self.sent,
+            'Coalesced': self.coalesced, 'Errors': self.errors,
+            'LatencyMean': round(self._latency_sum / count * 1000, 1) if count else 0,
+            'LatencyMax': round(self._latency_max * 1000, 1),
+        }
+
+    def reset_metrics(self):
+        """Start a new interval for the request latency"""
+        self._latency_sum = 0
+        self._latency_count = 0
+        self._latency_max = 0
@@ -0,0 +1,160 @@
+from bisect import bisect_left
+from typing import Dict, Final, List, NamedTuple, Optional, Tuple, Union
+
+# Upper bounds of the histogram buckets in seconds, the last bucket is unbounded
+BUCKETS: Final = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10)
+
+# Path segments which are part of the endpoint, all other segments are replaced with a placeholder
+KEYWORDS: Final = frozenset((
+    'state', 'metadata', 'members', 'tags', 'config', 'enable', 'status', 'firmware', 'channels', 'items',
+))
+PLACEHOLDERS: Final = {'items': '{name}', 'things': '{uid}', 'links': '{item}'}
+
+
+def get_endpoint_template(url: str) -> str:
+    """Replace the variable parts of the url, e.g. ``/rest/items/MyItem/state`` -> ``/rest/items/{name}/state``"""
+    url = url.split('?', 1)[0]
+    parts = url.split('/')
+    # ['', 'rest', 'items', 'MyItem', 'state']
+    if len(parts) <= 3:
+        return url
+
+    resource = parts[2]
+    for i in range(3, len(parts)):
+        # the name of an item or thing can be the same as a keyword
+        if i == 3 and resource in PLACEHOLDERS:
+            parts[i] = PLACEHOLDERS[resource]
+        elif parts[i] not in KEYWORDS:
+            parts[i] = '{id}'
+    return '/'.join(parts)
+
+
+class Histogram:
+    """Histogram with fixed buckets. It is only used from the event loop so it requires no lock."""
+
+    def __init__(self):
+        self.counts: List[int] = [0] * (len(BUCKETS) + 1)
+        self.count: int = 0
+        self.sum: float = 0
+        self.max: float = 0
+
+    def add(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0
+
+    def percentile(self, percent: float) -> float:
+        """Return the upper bound of the bucket which contains the percentile"""
+        if not self.count:
+            return 0
+
+        needed = self.count * percent / 100
+        total = 0
+        for i, count in enumerate(self.counts):
+            total += count
+            if total >= needed:
+                return min(BUCKETS[i], self.max) if i < len(BUCKETS) else self.max
+        return self.max
+
+
+class EndpointSummary(NamedTuple):
+    count: int
+    errors: int
+    status: Dict[int, int]
+    in_flight: int
+    bytes_sent: int
+    bytes_received: int
+    mean: float
+    p50: float
+    p95: float
+    max: float
+
+
+class EndpointStats:
+    def __init__(self):
+        self.duration = Histogram()
+        self.status: Dict[int, int] = {}
+        self.errors: int = 0
+        self.in_flight: int = 0
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
+
+    def add(self, duration: float, status: Optional[int], sent: Optional[int], received: Optional[int]):
+        self.duration.add(duration)
+        if status is None:
+            self.errors += 1
+        else:
+            self.status[status] = self.status.get(status, 0) + 1
+        if sent:
+            self.bytes_sent += sent
+        if received:
+            self.bytes_received += received
+
+    def get_summary(self) -> EndpointSummary:
+        d = self.duration
+        return EndpointSummary(
+            d.count, self.errors, self.status.copy(), self.in_flight, self.bytes_sent, self.bytes_received,
+            d.mean, d.percentile(50), d.percentile(95), d.max
+        )
+
+
+class RequestStats:
+    """Statistics of the requests to the openHAB REST api, grouped by method and endpoint"""
+
+    def __init__(self):
+        self._endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+        self.in_flight: int = 0
+
+    def get_endpoint(self, method: str, url: str) -> EndpointStats:
+        key = (method, get_endpoint_template(url))
+        if (stats := self._endpoints.get(key)) is None:
+            self._endpoints[key] = stats = EndpointStats()
+        return stats
+
+    def add_ping(self, duration: float):
+        """Round trip of the ping: update of the ping item until the event was received"""
+        self.get_endpoint('PING', '/rest/items/{name}/state').add(duration, 200, None, None)
+
+    def clear(self):
+        self._endpoints.clear()
+
+    def get_stats(self) -> Dict[str, EndpointSummary]:
+        return {f'{method} {template}': stats.get_summary()
+                for (method, template), stats in sorted(self._endpoints.items())}
+
+    def get_metrics(self) -> Dict[str, Union[int, float]]:
+        ret: Dict[str, Union[int, float]] = {'InFlight': self.in_flight}
+        sent = 0
+        received = 0
+        for (method, template), stats in sorted(self._endpoints.items()):
+            sent += stats.bytes_sent
+            received += stats.bytes_received
+
+            # /rest/items/{name}/state -> PUT_items_name_state
+            name = method + template.replace('/rest', '', 1).replace('{', '').replace('}', '').replace('/', '_')
+            d = stats.duration
+            ret[f'{name}_Count'] = d.count
+            ret[f'{name}_Errors'] = stats.errors
+            ret[f'{name}_LatencyMean'] = round(d.mean * 1000, 1)
+            ret[f'{name}_LatencyP95'] = round(d.percentile(95) * 1000, 1)
+        ret['BytesSent'] = sent
+        ret['BytesReceived'] = received
+        return ret
+
+
+REQUEST_STATS: Final = RequestStats()
+
+
+def get_request_stats() -> Dict[str, EndpointSummary]:
+    """Return the statistics of the requests to openHAB, e.g. ``PUT /rest/items/{name}/state``.
+    The durations are in seconds and measured until the response headers were received.
+
+    :return: endpoint and the statistics of the endpoint
+    """
+    return REQUEST_STATS.get_stats()
@@ -10,8 +10,8 @@ from HABApp.core.internals import uses_post_event, uses_get_item
 from HABApp.core.logger import log_warning
 from HABApp.core.wrapper import process_exception
 from HABApp.openhab.connection_handler import http_connection
-from HABApp.openhab.events import GroupItemStateChangedEvent, ItemAddedEvent, ItemRemovedEvent, ItemUpdatedEvent, \
-    ThingStatusInfoEvent, ThingAddedEvent, ThingRemovedEvent, ThingUpdatedEvent
+from HABApp.openhab.events import OpenhabEvent, GroupItemStateChangedEvent, ItemAddedEvent, ItemRemovedEvent, \
+    ItemUpdatedEvent, ThingStatusInfoEvent, ThingAddedEvent, ThingRemovedEvent, ThingUpdatedEvent
 from HABApp.openhab.item_to_reg import add_to_registry, remove_from_registry, remove_thing_from_registry, \
     add_thing_to_registry
 from HABApp.openhab.map_events import get_event
@@ -29,7 +29,15 @@ def on_sse_event(event_dict: dict):
     try:
         # Lookup corresponding OpenHAB event
         event = get_event(event_dict)
+    except Exception as e:
+        process_exception(func=on_sse_event, e=e)
+        return None
+
+    on_openhab_event(event)
 
+
+def on_openhab_event(event: OpenhabEvent):
+    try:
         # Update item in registry BEFORE posting to the event bus
         # so the items have the correct state when we process the event in a rule
         try:
@@ -88,7 +96,7 @@ def on_sse_event(event_dict: dict):
         # Unknown Event -> just forward it to the event bus
         post_event(event.name, event)
     except Exception as e:
-        process_exception(func=on_sse_event, e=e)
+        process_exception(func=on_openhab_event, e=e)
         return None
 
 
@@ -0,0 +1,59 @@
+import re
+from typing import Final, Iterable, List, Optional, Set
+
+from HABApp.core.internals.event_bus.topic_index import is_topic_pattern
+
+# Topics which can be the name of an openHAB item
+RE_ITEM_NAME: Final = re.compile(r'[A-Za-z0-9_]+$')
+RE_ITEM_PATTERN: Final = re.compile(r'[A-Za-z0-9_*]+$')
+
+# Events which are always required to keep the item registry in sync
+BASE_FILTER: Final = (
+    'openhab/items/*/added', 'openhab/items/*/removed', 'openhab/items/*/updated',
+    'openhab/channels/*',
+    'openhab/things/*/added', 'openhab/things/*/removed', 'openhab/things/*/status', 'openhab/things/*/statuschanged',
+)
+
+
+def _shorten(names: Iterable[str]) -> List[str]:
+    # Replace the last part of the name with a wildcard, e.g. Living_Room_Temp -> Living_Room_*
+    ret: Set[str] = set()
+    for name in names:
+        pos = name.rstrip('*_').rfind('_')
+        ret.add(name if pos <= 0 else name[:pos + 1] + '*')
+    return sorted(ret)
+
+
+def build_topic_filter(topics: Iterable[str], max_length: int = 4000) -> Optional[str]:
+    """Create the openHAB topic filter for the topics which have listeners.
+    Returns None if the events of all items are required.
+
+    :param topics: topics and topic patterns of the event bus listeners
+    :param max_length: max length of the filter, if the filter is longer item names will be merged to patterns
+    """
+    names: Set[str] = set()
+    for topic in topics:
+        if is_topic_pattern(topic):
+            if RE_ITEM_PATTERN.match(topic):
+                if not topic.strip('*'):
+                    return None
+                names.add(topic)
+            elif '?' in topic or '[' in topic:
+                # openHAB supports only '*' so the pattern can't be passed to openHAB
+                return None
+            continue
+
+        if RE_ITEM_NAME.match(topic):
+            names.add(topic)
+
+    base = ','.join(BASE_FILTER)
+    item_names = sorted(names)
+    while True:
+        item_filter = ''.join(f',openhab/items/{name}/*' for name in item_names)
+        if len(base) + len(item_filter) <= max_length:
+            return base + item_filter
+
+        shortened = _shorten(item_names)
+        if shortened == item_names:
+            return None
+        item_names = shortened
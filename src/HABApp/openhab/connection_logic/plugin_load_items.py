@@ -1,12 +1,14 @@
 import logging
+from typing import Dict, Hashable
 
 import HABApp
 from HABApp.core.wrapper import ignore_exception
-from HABApp.openhab.item_to_reg import add_to_registry, fresh_item_sync, remove_from_registry, \
-    remove_thing_from_registry, add_thing_to_registry
+from HABApp.openhab.definitions.rest import OpenhabThingDefinition
+from HABApp.openhab.item_to_reg import ItemSync, remove_thing_from_registry, add_thing_to_registry
 from HABApp.openhab.map_items import map_item
 from ._plugin import OnConnectPlugin
-from ..interface_async import async_get_items, async_get_things
+from .sync_cache import SyncCache, item_fingerprint, item_snapshot, thing_fingerprint, thing_snapshot
+from ..connection_handler.func_async import async_get_items_stream, async_get_things_raw
 from ...core.internals import uses_item_registry
 
 log = logging.getLogger('HABApp.openhab.items')
@@ -16,48 +18,96 @@ Items = uses_item_registry()
 
 class LoadAllOpenhabItems(OnConnectPlugin):
 
+    def __init__(self):
+        super().__init__()
+        self.item_cache: SyncCache['HABApp.openhab.items.OpenhabItem'] = SyncCache(item_snapshot)
+        self.thing_cache: SyncCache['HABApp.openhab.items.Thing'] = SyncCache(thing_snapshot)
+
     @ignore_exception
     async def on_connect_function(self):
-        data = await async_get_items(all_metadata=True)
-        if data is None:
-            return None
-
-        fresh_item_sync()
-
-        found_items = len(data)
-        for _dict in data:
-            item_name = _dict['name']
-            new_item = map_item(item_name, _dict['type'], _dict['state'], _dict.get('label'),
-                                frozenset(_dict['tags']), frozenset(_dict['groupNames']),
-                                _dict.get('metadata', {}))   # type: HABApp.openhab.items.OpenhabItem
-            if new_item is None:
-                continue
-            add_to_registry(new_item, True)
-
-        # remove items which are no longer available
-        ist = set(Items.get_item_names())
-        soll = {k['name'] for k in data}
-        for k in ist - soll:
-            if isinstance(Items.get_item(k), HABApp.openhab.items.OpenhabItem):
-                remove_from_registry(k)
-
-        log.info(f'Updated {found_items:d} Items')
+        incremental = HABApp.CONFIG.openhab.general.incremental_sync
+        if not incremental:
+            self.item_cache.clear()
+            self.thing_cache.clear()
+
+        # The items are processed while they are downloaded
+        sync = ItemSync()
+        found_items = 0
+        unchanged = 0
+        async for data in async_get_items_stream(all_metadata=True):
+            found_items += len(data)
+
+            items = []
+            fingerprints: Dict[str, Hashable] = {}
+            for _dict in data:
+                item_name = _dict['name']
+
+                # Skip items whose definition did not change since the last sync
+                if incremental:
+                    fingerprints[item_name] = fingerprint = item_fingerprint(_dict)
+                    if (existing := self.item_cache.get_unchanged(item_name, fingerprint)) is not None:
+                        items.append(existing)
+                        unchanged += 1
+                        continue
+
+                new_item = map_item(item_name, _dict['type'], _dict['state'], _dict.get('label'),
+                                    frozenset(_dict['tags']), frozenset(_dict['groupNames']),
+                                    _dict.get('metadata', {}))   # type: HABApp.openhab.items.OpenhabItem
+                if new_item is None:
+                    continue
+                items.append(new_item)
+
+            result = sync.add(items)
+            if incremental:
+                for item in result.updated + result.added:
+                    self.item_cache.set(item.name, fingerprints[item.name], item)
+
+        # remove the items which are no longer available
+        sync.finish()
+
+        log.info(f'Updated {found_items:d} Items ({unchanged:d} unchanged, {len(sync.updated):d} updated, '
+                 f'{len(sync.added):d} added, {len(sync.removed):d} removed)')
 
         # try to update things, too
-        data = await async_get_things()
+        data = await async_get_things_raw()
 
         Thing = HABApp.openhab.items.Thing
-        for thing_cfg in data:
-            add_thing_to_registry(thing_cfg)
+        unchanged = 0
+        updated = 0
+        added = 0
+        removed = 0
+        for _dict in data:
+            uid = _dict['UID']
+
+            if incremental:
+                fingerprint = thing_fingerprint(_dict)
+                if self.thing_cache.get_unchanged(uid, fingerprint) is not None:
+                    unchanged += 1
+                    continue
+
+            # Same counting as the item sync: a replaced item is removed and the thing is added
+            if not Items.item_exists(uid):
+                added += 1
+            elif isinstance(Items.get_item(uid), Thing):
+                updated += 1
+            else:
+                added += 1
+                removed += 1
+
+            add_thing_to_registry(OpenhabThingDefinition.parse_obj(_dict))
+            if incremental:
+                self.thing_cache.set(uid, fingerprint, Items.get_item(uid))
 
         # remove things which were deleted
         ist = set(Items.get_item_names())
-        soll = {k.uid for k in data}
+        soll = {k['UID'] for k in data}
         for k in ist - soll:
             if isinstance(Items.get_item(k), Thing):
                 remove_thing_from_registry(k)
+                removed += 1
 
-        log.info(f'Updated {len(data):d} Things')
+        log.info(f'Updated {len(data):d} Things ({unchanged:d} unchanged, {updated:d} updated, '
+                 f'{added:d} added, {removed:d} removed)')
         return None
 
 
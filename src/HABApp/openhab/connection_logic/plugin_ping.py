@@ -6,6 +6,7 @@ from typing import Optional
 import HABApp
 from HABApp.core.internals import uses_event_bus
 from HABApp.core.wrapper import log_exception
+from HABApp.openhab.connection_handler.request_stats import REQUEST_STATS
 from HABApp.openhab.errors import OpenhabDisconnectedError
 from ._plugin import PluginBase
 
@@ -78,7 +79,9 @@ class PingOpenhab(PluginBase):
         if self.ping_new is not None:
             return None
 
-        self.ping_new = round((time.time() - self.ping_sent) * 1000, 1)
+        duration = time.time() - self.ping_sent
+        self.ping_new = round(duration * 1000, 1)
+        REQUEST_STATS.add_ping(duration)
 
 
     @log_exception
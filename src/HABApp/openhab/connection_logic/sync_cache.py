@@ -0,0 +1,77 @@
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+import HABApp
+from HABApp.core.errors import ItemNotFoundException
+from HABApp.core.internals import uses_item_registry
+
+Items = uses_item_registry()
+
+T = TypeVar('T')
+
+
+def freeze(obj: Any) -> Hashable:
+    """Create a hashable and comparable representation of a json object"""
+    if isinstance(obj, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, list):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+def item_fingerprint(data: Dict[str, Any]) -> Hashable:
+    """Fingerprint of everything that is used to create an item from the openHAB item definition"""
+    return (
+        data['type'], data['state'], data.get('label'), frozenset(data['tags']), frozenset(data['groupNames']),
+        freeze(data.get('metadata'))
+    )
+
+
+def thing_fingerprint(data: Dict[str, Any]) -> Hashable:
+    return freeze(data)
+
+
+class SyncCache(Generic[T]):
+    """Stores a fingerprint of the definition from which an object in the item registry was created.
+    On a resync only objects with a changed fingerprint have to be created and updated again.
+
+    Since the objects can also be changed through events a snapshot of their state is stored, too.
+    If the object was replaced in the item registry or the state differs from the snapshot the object is
+    treated as changed."""
+
+    def __init__(self, snapshot: Callable[[T], Any]):
+        self._snapshot = snapshot
+        self._entries: Dict[str, Tuple[Hashable, T, Any]] = {}
+
+    def get_unchanged(self, name: str, fingerprint: Hashable) -> Optional[T]:
+        """Return the object from the item registry if it is unchanged, otherwise None"""
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+
+        stored, obj, snapshot = entry
+        if stored != fingerprint:
+            return None
+
+        try:
+            if Items.get_item(name) is not obj:
+                return None
+        except ItemNotFoundException:
+            return None
+
+        if self._snapshot(obj) != snapshot:
+            return None
+        return obj
+
+    def set(self, name: str, fingerprint: Hashable, obj: T):
+        self._entries[name] = (fingerprint, obj, self._snapshot(obj))
+
+    def clear(self):
+        self._entries.clear()
+
+
+def item_snapshot(item: 'HABApp.openhab.items.OpenhabItem'):
+    return item.value, item.label, item.tags, item.groups, item.metadata
+
+
+def thing_snapshot(thing: 'HABApp.openhab.items.Thing'):
+    return thing.status, thing.status_detail, thing.label, thing.configuration, thing.properties
@@ -5,3 +5,4 @@ from HABApp.openhab.connection_handler.func_sync import \
     get_persistence_data, \
     remove_metadata, set_metadata, \
     get_channel_link, remove_channel_link, channel_link_exists, create_channel_link
+from HABApp.openhab.connection_handler.request_stats import get_request_stats
@@ -5,3 +5,4 @@ from HABApp.openhab.connection_handler.func_async import \
     async_remove_metadata, async_set_metadata, \
     async_get_persistence_data, \
     async_get_channel_link, async_remove_channel_link, async_channel_link_exists, async_create_channel_link
+from HABApp.openhab.connection_handler.request_stats import get_request_stats
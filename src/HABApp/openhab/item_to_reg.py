@@ -1,11 +1,15 @@
 import logging
-from typing import Dict, Set, Tuple, TYPE_CHECKING
+from typing import Dict, Iterable, List, Set, Tuple, TYPE_CHECKING
 
 from immutables import Map
 
 import HABApp
 
-from HABApp.core.internals import uses_item_registry
+from HABApp.core.const.topics import TOPIC_ITEM_REGISTRY
+from HABApp.core.events.habapp_events import ItemRegistrySyncEvent
+from HABApp.core.internals import uses_item_registry, uses_post_event
+from HABApp.core.internals.item_registry import BulkUpdateResult
+from HABApp.core.items import BaseValueItem
 from HABApp.core.logger import log_warning
 
 if TYPE_CHECKING:
@@ -14,6 +18,7 @@ if TYPE_CHECKING:
 log = logging.getLogger('HABApp.openhab.items')
 
 Items = uses_item_registry()
+post_event = uses_post_event()
 
 
 def add_to_registry(item: 'HABApp.openhab.items.OpenhabItem', set_value=False):
@@ -39,15 +44,96 @@ def add_to_registry(item: 'HABApp.openhab.items.OpenhabItem', set_value=False):
         existing.tags     = item.tags
         existing.groups   = item.groups
         existing.metadata = item.metadata
+        Items.update_index(existing)
         return None
 
     log_warning(log, f'Item type changed from {existing.__class__} to {item.__class__}')
 
     # Replace existing item with the updated definition
+    _replace_existing(existing, item)
     Items.pop_item(name)
     Items.add_item(item)
 
 
+def _replace_existing(existing, item: 'HABApp.openhab.items.OpenhabItem'):
+    # keep the history of the values
+    if isinstance(existing, BaseValueItem):
+        item._take_history(existing)
+
+
+def _update_existing(existing: 'HABApp.openhab.items.OpenhabItem', item: 'HABApp.openhab.items.OpenhabItem'):
+    # We load directly through the API so we have to set the value
+    existing.set_value(item.value)
+    existing.label    = item.label
+    existing.tags     = item.tags
+    existing.groups   = item.groups
+    existing.metadata = item.metadata
+
+
+def refresh_item_state(item: 'HABApp.openhab.items.OpenhabItem') -> bool:
+    """Set the value of the existing item to the value of the item which was loaded through the API.
+    Returns True if the value was changed."""
+    name = item.name
+    if not Items.item_exists(name):
+        return False
+
+    existing = Items.get_item(name)
+    if not isinstance(existing, item.__class__) or existing.value == item.value:
+        return False
+
+    existing.set_value(item.value)
+    return True
+
+
+def _is_openhab_item(item) -> bool:
+    return isinstance(item, HABApp.openhab.items.OpenhabItem)
+
+
+class ItemSync:
+    """Synchronizes the item registry with the openHAB items. The items can be added in batches while they are
+    loaded, openHAB items which were not part of the sync are removed when the sync is finished."""
+
+    def __init__(self):
+        self.names: Set[str] = set()
+        # The group members are replaced when the sync is finished, so the old members are available while loading
+        self.members: Dict[str, Set[str]] = {}
+        self.added: List[str] = []
+        self.updated: List[str] = []
+        self.removed: List[str] = []
+
+    def add(self, items: Iterable['HABApp.openhab.items.OpenhabItem']) -> BulkUpdateResult:
+        items = tuple(items)
+        for item in items:
+            self.names.add(item.name)
+            for grp in item.groups:
+                self.members.setdefault(grp, set()).add(item.name)
+
+        result = Items.bulk_update(items, update=_update_existing, replace=_replace_existing)
+
+        removed = {item.name: item for item in result.removed}
+        for item in result.added:
+            if (old := removed.get(item.name)) is not None:
+                log_warning(log, f'Item type changed from {old.__class__} to {item.__class__}')
+
+        self.added.extend(item.name for item in result.added)
+        self.updated.extend(item.name for item in result.updated)
+        self.removed.extend(removed)
+        return result
+
+    def finish(self):
+        names = self.names
+        result = Items.bulk_update((), remove=lambda item: _is_openhab_item(item) and item.name not in names)
+        self.removed.extend(item.name for item in result.removed)
+
+        MEMBERS.clear()
+        MEMBERS.update(self.members)
+
+        post_event(
+            TOPIC_ITEM_REGISTRY,
+            ItemRegistrySyncEvent('openhab', tuple(self.added), tuple(self.updated), tuple(self.removed))
+        )
+
+
 def remove_from_registry(name: str):
     if not Items.item_exists(name):
         return None
@@ -66,10 +152,6 @@ def remove_from_registry(name: str):
 MEMBERS: Dict[str, Set[str]] = {}
 
 
-def fresh_item_sync():
-    MEMBERS.clear()
-
-
 def get_members(group_name: str) -> Tuple['HABApp.openhab.items.OpenhabItem', ...]:
     ret = []
     for name in MEMBERS.get(group_name, []):
@@ -1,5 +1,5 @@
 import datetime
-from typing import Any, FrozenSet, Mapping, NamedTuple, Optional, TypeVar, Type
+from typing import Any, FrozenSet, Iterable, Mapping, NamedTuple, Optional, Tuple, TypeVar, Type
 
 from immutables import Map
 
@@ -40,6 +40,14 @@ class OpenhabItem(BaseValueItem):
                 metadata: Mapping[str, MetaData] = Map()):
         return cls(name, value, label=label, tags=tags, groups=groups, metadata=metadata)
 
+    def _get_registry_index(self) -> Iterable[Tuple[str, str]]:
+        for tag in self.tags:
+            yield 'tag', tag
+        for group in self.groups:
+            yield 'group', group
+        for namespace in self.metadata:
+            yield 'metadata', namespace
+
     def oh_send_command(self, value: Any = MISSING):
         """Send a command to the openHAB item
 
@@ -1,9 +1,8 @@
+from time import time
 from typing import Any
 from typing import Mapping
 
 from immutables import Map
-from pendulum import UTC
-from pendulum import now as pd_now
 
 from HABApp.core.items import BaseItem
 from HABApp.openhab.events import ThingStatusInfoEvent, ThingUpdatedEvent
@@ -31,7 +30,7 @@ class Thing(BaseItem):
         self.properties: Mapping[str, Any] = Map()
 
     def __update_timestamps(self, changed: bool):
-        _now = pd_now(UTC)
+        _now = time()
         self._last_update.set(_now)
         if changed:
             self._last_change.set(_now)
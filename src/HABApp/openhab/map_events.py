@@ -1,4 +1,6 @@
-from typing import Dict, Type
+import re
+from typing import Dict, Optional, Type
+
 from HABApp.core.const.json import load_json
 
 from .events import OpenhabEvent, \
@@ -7,6 +9,7 @@ from .events import OpenhabEvent, \
     ChannelTriggeredEvent, ChannelDescriptionChangedEvent, \
     ThingAddedEvent, ThingRemovedEvent, ThingUpdatedEvent, \
     ThingStatusInfoChangedEvent, ThingStatusInfoEvent, ThingFirmwareStatusInfoEvent
+from .map_values import map_openhab_values
 
 
 EVENT_LIST = [
@@ -41,3 +44,54 @@ def get_event(_in_dict: dict) -> OpenhabEvent:
         return _events[event_type].from_dict(topic, payload)
     except KeyError:
         raise ValueError(f'Unknown Event: {event_type:s} for {_in_dict}')
+
+
+# The state events make up the majority of the events. They are matched in the raw sse string
+# so the nested payload does not have to be decoded separately. The payload is only matched if
+# it does not contain any escaped chars, everything else is processed through get_event.
+# {"topic":"openhab/items/NAME/state","payload":"{\"type\":\"String\",\"value\":\"1\"}",
+#  "type":"ItemStateEvent"}
+RE_STATE_EVENT: re.Pattern = re.compile(
+    r'\{"topic":"openhab/items/([^"/\\]+)/(?:([^"/\\]+)/)?(state|statechanged)",'
+    r'"payload":"\{\\"type\\":\\"(\w+)\\",\\"value\\":\\"([^"\\]*)\\"'
+    r'(?:,\\"oldType\\":\\"(\w+)\\",\\"oldValue\\":\\"([^"\\]*)\\")?\}",'
+    r'"type":"(ItemStateEvent|ItemStateChangedEvent|GroupItemStateChangedEvent)"[,}]'
+)
+
+
+def get_event_fast(event_str: str) -> Optional[OpenhabEvent]:
+    """Create the event directly from the sse string. Returns None if the event has to be processed through
+    the generic path."""
+    m = RE_STATE_EVENT.match(event_str)
+    if m is None:
+        return None
+
+    name, item, topic_type, value_type, value, old_type, old_value, event_type = m.groups()
+
+    # Workaround for None values, see get_event
+    if value_type == 'NONE' or old_type == 'NONE':
+        return None
+    if value == 'NONE':
+        value = None
+    if old_value == 'NONE':
+        old_value = None
+
+    if event_type == 'ItemStateEvent':
+        if item is not None or old_type is not None or topic_type != 'state':
+            return None
+        return ItemStateEvent(name, map_openhab_values(value_type, value))
+
+    # Both changed events require the old value
+    if old_type is None or topic_type != 'statechanged':
+        return None
+
+    if event_type == 'ItemStateChangedEvent':
+        if item is not None:
+            return None
+        return ItemStateChangedEvent(
+            name, map_openhab_values(value_type, value), map_openhab_values(old_type, old_value))
+
+    if item is None:
+        return None
+    return GroupItemStateChangedEvent(
+        name, item, map_openhab_values(value_type, value), map_openhab_values(old_type, old_value))
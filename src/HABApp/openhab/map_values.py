@@ -1,8 +1,60 @@
 import datetime
+from typing import Any, Callable, Dict
 
 from HABApp.openhab.definitions import HSBValue, OnOffValue, OpenClosedValue, PercentValue, QuantityValue, RawValue, \
     UpDownValue
 
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def parse_datetime(value: str) -> datetime.datetime:
+    """Parse a datetime from openHAB and return it as a naive datetime in the system timezone"""
+
+    # Fast path for the format which is used by openHAB: 2022-05-04T18:22:13.034+0200
+    if len(value) == 28 and value[10] == 'T' and value[19] == '.' and value[23] in '+-':
+        try:
+            offset = int(value[24:26]) * 3600 + int(value[26:28]) * 60
+            if value[23] == '-':
+                offset = -offset
+            delta = datetime.datetime(
+                int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                int(value[11:13]), int(value[14:16]), int(value[17:19])
+            ) - _EPOCH
+            # fromtimestamp returns the datetime in the system timezone
+            return datetime.datetime.fromtimestamp(delta.days * 86400 + delta.seconds - offset).replace(
+                microsecond=int(value[20:23]) * 1000)
+        except (ValueError, OverflowError, OSError):
+            pass
+
+    dt = datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z')
+    # all datetimes from openHAB have a timezone set, so we can't easily compare them
+    # --> TypeError: can't compare offset-naive and offset-aware datetimes
+    dt = dt.astimezone(tz=None)   # Changes datetime object so it uses system timezone
+    dt = dt.replace(tzinfo=None)  # Removes timezone awareness
+    return dt
+
+
+def _decimal(value: str):
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+MAP_FUNCS: Dict[str, Callable[[str], Any]] = {
+    'Number': int,
+    'Decimal': _decimal,
+    'DateTime': parse_datetime,
+    # The values can be modified in the rules, so every event gets its own instance
+    'OnOff': OnOffValue,
+    'OpenClosed': OpenClosedValue,
+    'UpDown': UpDownValue,
+    'Percent': PercentValue,
+    'Quantity': QuantityValue,
+    'HSB': HSBValue,
+    'Raw': RawValue,
+}
+
 
 def map_openhab_values(openhab_type: str, openhab_value: str):
     # because we preprocess the string value can be None.
@@ -10,48 +62,10 @@ def map_openhab_values(openhab_type: str, openhab_value: str):
     if openhab_value is None:
         return None
 
-    assert isinstance(openhab_type, str), type(openhab_type)
-    assert isinstance(openhab_value, str), type(openhab_value)
-
     if openhab_type == 'UnDef' or openhab_value == 'NULL':
         return None
 
-    if openhab_type == "Number":
-        return int(openhab_value)
-
-    if openhab_type == "Decimal":
-        try:
-            return int(openhab_value)
-        except ValueError:
-            return float(openhab_value)
-
-    if openhab_type == "DateTime":
-        dt = datetime.datetime.strptime(openhab_value, '%Y-%m-%dT%H:%M:%S.%f%z')
-        # all datetimes from openHAB have a timezone set, so we can't easily compare them
-        # --> TypeError: can't compare offset-naive and offset-aware datetimes
-        dt = dt.astimezone(tz=None)   # Changes datetime object so it uses system timezone
-        dt = dt.replace(tzinfo=None)  # Removes timezone awareness
-        return dt
-
-    if openhab_type == "HSB":
-        return HSBValue(openhab_value)
-
-    if openhab_type == 'OnOff':
-        return OnOffValue(openhab_value)
-
-    if openhab_type == 'OpenClosed':
-        return OpenClosedValue(openhab_value)
-
-    if openhab_type == 'UpDown':
-        return UpDownValue(openhab_value)
-
-    if openhab_type == 'Percent':
-        return PercentValue(openhab_value)
-
-    if openhab_type == 'Quantity':
-        return QuantityValue(openhab_value)
-
-    if openhab_type == 'Raw':
-        return RawValue(openhab_value)
-
-    return openhab_value
+    func = MAP_FUNCS.get(openhab_type)
+    if func is None:
+        return openhab_value
+    return func(openhab_value)
@@ -11,9 +11,10 @@ import HABApp.util
 from HABApp.core.asyncio import create_task
 from HABApp.core.const.hints import HINT_EVENT_CALLBACK
 from HABApp.core.internals import HINT_EVENT_FILTER_OBJ, HINT_EVENT_BUS_LISTENER, ContextProvidingObj, \
-    uses_post_event, EventFilterBase, uses_item_registry, ContextBoundEventBusListener
-from HABApp.core.internals import wrap_func
+    uses_post_event, EventFilterBase, uses_item_registry, ContextBoundEventBusListener, CoalescingEventBusListener
+from HABApp.core.internals import wrap_func, HINT_QUEUE_POLICY, HINT_SERIAL_MODE
 from HABApp.core.items import BaseItem, HINT_ITEM_OBJ, HINT_TYPE_ITEM_OBJ, BaseValueItem
+from HABApp.core.lib.parameters import TH_POSITIVE_TIME_DIFF, get_positive_time_diff
 from HABApp.rule import interfaces
 from HABApp.rule.scheduler import HABAppSchedulerView as _HABAppSchedulerView
 from .interfaces import async_subprocess_exec
@@ -99,20 +100,38 @@ class Rule(ContextProvidingObj):
 
     def listen_event(self, name: Union[HINT_ITEM_OBJ, str],
                      callback: HINT_EVENT_CALLBACK,
-                     event_filter: Optional[HINT_EVENT_FILTER_OBJ] = None
+                     event_filter: Optional[HINT_EVENT_FILTER_OBJ] = None,
+                     coalesce: Optional[TH_POSITIVE_TIME_DIFF] = None,
+                     queue_policy: HINT_QUEUE_POLICY = 'block',
+                     serial: Optional[HINT_SERIAL_MODE] = None
                      ) -> HINT_EVENT_BUS_LISTENER:
         """
         Register an event listener
 
-        :param name: item or name to listen to
+        :param name: item or name to listen to. The name can contain ``*`` as a wildcard (e.g. ``'Temp_*'``)
+            to listen to the events of all matching items with one listener.
         :param callback: callback that accepts one parameter which will contain the event
         :param event_filter: Event filter. This is typically :class:`~HABApp.core.events.ValueUpdateEventFilter` or
             :class:`~HABApp.core.events.ValueChangeEventFilter` which will also trigger on changes/update from openhab
             or mqtt. Additionally it can be an instance of :class:`~HABApp.core.events.EventFilter` which additionally
             filters on the values of the event. It is also possible to group filters logically with, e.g.
             :class:`~HABApp.core.events.AndFilterGroup` and :class:`~HABApp.core.events.OrFilterGroup`
+        :param coalesce: Optional time in seconds. If set the callback will be called at most once in this
+            period. Events that arrive in between replace each other and only the latest event will be passed
+            to the callback at the end of the period. The callback gets a
+            :class:`~HABApp.core.events.CoalescedEvent` with the event and the amount of replaced events.
+        :param queue_policy: What happens when the queue of the thread pool is full: ``'block'`` waits until
+            there is space. Events from openHAB or MQTT and calls from another callback can not wait,
+            for these ``'block'`` drops the oldest queued call of this callback and logs a warning.
+            ``'drop_oldest'`` drops the oldest queued call of this callback,
+            ``'drop_newest'`` drops the new event and ``'coalesce'`` replaces the queued event of the same item
+            with the new event.
+        :param serial: Run the callbacks strictly in the order of the events. With ``'topic'`` the callbacks of
+            this rule for the same item never run in parallel, with ``'rule'`` the callbacks of this rule never
+            run in parallel.
+            Callbacks for other items or rules still run in parallel in the thread pool.
         """
-        cb = wrap_func(callback, context=self._habapp_ctx)
+        cb = wrap_func(callback, context=self._habapp_ctx, queue_policy=queue_policy, serial=serial)
         name = name.name if isinstance(name, BaseItem) else name
 
         if event_filter is None:
@@ -120,7 +139,11 @@ class Rule(ContextProvidingObj):
         if not isinstance(event_filter, EventFilterBase):
             raise ValueError(f'Argument event_filter must be an instance of event filter (is {event_filter})')
 
-        listener = ContextBoundEventBusListener(name, cb, event_filter, parent_ctx=self._habapp_ctx)
+        if coalesce is None:
+            listener = ContextBoundEventBusListener(name, cb, event_filter, parent_ctx=self._habapp_ctx)
+        else:
+            listener = CoalescingEventBusListener(
+                name, cb, event_filter, get_positive_time_diff(coalesce), parent_ctx=self._habapp_ctx)
         return self._habapp_ctx.add_event_listener(listener)
 
     def execute_subprocess(self, callback: HINT_EVENT_CALLBACK, program, *args, capture_output=True):
@@ -185,23 +208,21 @@ class Rule(ContextProvidingObj):
             if not issubclass(type, OpenhabItem):
                 raise ValueError('Searching for tags, groups and metadata only works for OpenhabItem or its Subclasses')
 
-        ret = []
-        for item in item_registry.get_items():  # type: HABApp.core.items.BaseItem
-            if type is not None and not isinstance(item, type):
-                continue
+        # Use the indexes of the item registry to get the candidates
+        all_of = []
+        if _tags is not None:
+            all_of.extend(('tag', tag) for tag in _tags)
+        if _groups is not None:
+            all_of.extend(('group', group) for group in _groups)
+        any_of = None
+        if metadata is not None:
+            any_of = [('metadata', ns) for ns in item_registry.get_index_values('metadata') if metadata.search(ns)]
 
+        ret = []
+        for item in item_registry.find_items(type, all_of, any_of):  # type: HABApp.core.items.BaseItem
             if name is not None and not name.search(item.name):
                 continue
 
-            if _tags is not None and not _tags.issubset(item.tags):
-                continue
-
-            if _groups is not None and not _groups.issubset(item.groups):
-                continue
-
-            if metadata is not None and not any(map(metadata.search, item.metadata)):
-                continue
-
             if metadata_value is not None and not any(
                     map(metadata_value.search, map(lambda x: x[0], item.metadata.values()))):
                 continue
@@ -5,7 +5,7 @@ import HABApp
 from HABApp.core.const.topics import ALL_TOPICS
 from HABApp.core.internals import Context, uses_item_registry, HINT_EVENT_BUS_LISTENER
 from HABApp.core.internals import uses_event_bus
-from HABApp.core.internals.event_bus import EventBusBaseListener
+from HABApp.core.internals.event_bus import EventBusBaseListener, TopicPattern, is_topic_pattern
 
 event_bus = uses_event_bus()
 item_registry = uses_item_registry()
@@ -65,6 +65,14 @@ class HABAppRuleContext(Context):
                     if listener.topic in ALL_TOPICS:
                         continue
 
+                    # check if at least one item matches the pattern
+                    if is_topic_pattern(listener.topic):
+                        pattern = TopicPattern(listener.topic)
+                        if not any(map(pattern.matches, item_registry.get_item_names())):
+                            log.warning(f'No item matches "{listener.topic}" (yet)! '
+                                        f'self.listen_event in "{self.rule.rule_name}" may not work as intended.')
+                        continue
+
                     # check if specific item exists
                     if not item_registry.item_exists(listener.topic):
                         log.warning(f'Item "{listener.topic}" does not exist (yet)! '
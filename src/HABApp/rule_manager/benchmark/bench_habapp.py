@@ -1,10 +1,11 @@
 import random
 import time
 from collections import deque
-from threading import Lock
+from threading import Lock, Event, Thread
 
 import HABApp
-from HABApp.core.events import ValueUpdateEvent
+from HABApp.core.events import ValueUpdateEvent, ValueChangeEventFilter
+from HABApp.core.internals import EventBusListener, wrap_func
 from .bench_base import BenchBaseRule
 from .bench_times import BenchContainer, BenchTime
 
@@ -42,6 +43,7 @@ class HABAppBenchRule(BenchBaseRule):
     def run_bench(self):
         # These are the benchmarks
         self.bench_rtt_time()
+        self.bench_listener_churn()
 
     def bench_rtt_time(self):
         print('Bench events ', end='')
@@ -85,6 +87,57 @@ class HABAppBenchRule(BenchBaseRule):
 
         print('.', end='')
 
+    def bench_listener_churn(self):
+        print('Bench post with concurrent subscribe/unsubscribe ', end='')
+        self.bench_times_container = BenchContainer()
+
+        self.run_churn('post idle', 0)
+        self.run_churn('post churn (1 thread)', 1)
+        self.run_churn('post churn (4 threads)', 4)
+
+        print(' done!\n')
+        time.sleep(0.1)
+        self.bench_times_container.show()
+
+    def run_churn(self, test_name: str, thread_count: int):
+        event_bus = HABApp.core.EventBus
+        name = self.name_list[0]
+        stop = Event()
+
+        def _cb(event):
+            pass
+
+        def churn(topic: str):
+            # The filter never matches, so we only measure the dispatch and not the thread pool
+            listeners = [EventBusListener(topic, wrap_func(_cb, name='BenchChurn'), ValueChangeEventFilter())
+                         for _ in range(50)]
+            while not stop.is_set():
+                for listener in listeners:
+                    event_bus.add_listener(listener)
+                for listener in listeners:
+                    event_bus.remove_listener(listener)
+
+        # one listener which is always there
+        listener = self.listen_event(name, _cb)
+        threads = [Thread(target=churn, args=(name if i % 2 else f'{name[:-1]}*', ), name=f'BenchChurn{i}')
+                   for i in range(thread_count)]
+        for t in threads:
+            t.start()
+
+        bench_times = self.bench_times_container.create(test_name)
+        try:
+            for i in range(10_000):
+                start = time.time()
+                event_bus.post_event(name, i)
+                bench_times.times.append(time.time() - start)
+        finally:
+            stop.set()
+            for t in threads:
+                t.join()
+            listener.cancel()
+
+        print('.', end='')
+
     def post_next_event_val(self, value):
         if value != self.values[0]:
             return None
@@ -165,7 +165,8 @@ class OpenhabBenchRule(BenchBaseRule):
         print('.', end='')
 
     def proceed_item_val(self, event: ValueUpdateEvent):
-        if event.value != self.item_values[0]:
+        # events can still arrive after the benchmark is finished
+        if not self.item_values or event.value != self.item_values[0]:
             return None
 
         self.bench_times.times.append(time.time() - self.time_sent)
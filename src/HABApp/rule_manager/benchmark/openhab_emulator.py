@@ -0,0 +1,430 @@
+"""Minimal stand-in for the openHAB REST api and the event stream, e.g. to run the benchmark without openHAB.
+
+Start it with::
+
+    python -m HABApp.rule_manager.benchmark.openhab_emulator --port 8080 --items 1000 --rate 200
+
+and set the openHAB url in the HABApp configuration to ``http://localhost:8080``.
+Then ``HABApp --benchmark`` will run against the emulator.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from aiohttp import web
+
+# openHAB item type -> type of the state in the event payload
+STATE_TYPES: Dict[str, str] = {
+    'Number': 'Decimal', 'Switch': 'OnOff', 'Contact': 'OpenClosed', 'Dimmer': 'Percent',
+    'Rollershutter': 'Percent', 'Color': 'HSB', 'DateTime': 'DateTime', 'Player': 'PlayPause',
+}
+
+
+def dump(obj: Any) -> str:
+    # same format as openHAB
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+def get_state_type(item: Dict[str, Any], state: str) -> str:
+    if state == 'NULL' or state == 'UNDEF':
+        return 'UnDef'
+    item_type: str = item['type']
+    if item_type == 'Group':
+        item_type = item.get('groupType', 'String')
+    if item_type.startswith('Number:'):
+        return 'Quantity'
+    return STATE_TYPES.get(item_type, 'String')
+
+
+def compile_topic_filter(topics: Optional[str]) -> Optional[re.Pattern]:
+    if not topics:
+        return None
+    parts = [re.escape(t.strip()).replace(r'\*', '.*') for t in topics.split(',') if t.strip()]
+    return re.compile('|'.join(f'(?:{p})' for p in parts) + '$')
+
+
+class OpenhabEmulator:
+    """Emulates the parts of the openHAB REST api which are used by HABApp.
+
+    :param items: amount of generated Number items
+    :param things: amount of generated things
+    :param event_rate: amount of random state updates per second which are sent through the event stream
+    """
+
+    ALIVE_INTERVAL = 10
+
+    def __init__(self, items: int = 100, things: int = 10, event_rate: float = 0,
+                 host: str = '127.0.0.1', port: int = 8080):
+        self.host = host
+        self.port = port
+        self.event_rate = event_rate
+
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.things: Dict[str, Dict[str, Any]] = {}
+        self.links: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.history: Dict[str, Deque[Dict[str, Any]]] = {}
+        self.events_sent: int = 0
+
+        self._subscribers: Set[Tuple[asyncio.Queue, Optional[re.Pattern]]] = set()
+        self._runner: Optional[web.AppRunner] = None
+        self._tasks: List[asyncio.Task] = []
+
+        for i in range(items):
+            self.items[f'EmulatorItem{i}'] = {
+                'type': 'Number', 'name': f'EmulatorItem{i}', 'label': f'Emulator item {i}', 'state': 'NULL',
+                'tags': [], 'groupNames': [], 'editable': True, 'category': '', 'link': '',
+            }
+        for i in range(things):
+            uid = f'emulator:device:{i}'
+            self.things[uid] = {
+                'UID': uid, 'thingTypeUID': 'emulator:device', 'label': f'Emulator thing {i}',
+                'configuration': {}, 'properties': {}, 'channels': [], 'editable': True,
+                'statusInfo': {'status': 'ONLINE', 'statusDetail': 'NONE'},
+            }
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Server
+    # ------------------------------------------------------------------------------------------------------------------
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.add_routes([
+            web.get('/rest/', self.get_root),
+            web.get('/rest/uuid', self.get_uuid),
+            web.get('/rest/systeminfo', self.get_system_info),
+            web.get('/rest/events', self.get_events),
+
+            web.get('/rest/items', self.get_items),
+            web.get('/rest/items/{name}', self.get_item),
+            web.put('/rest/items/{name}', self.put_item),
+            web.delete('/rest/items/{name}', self.delete_item),
+            web.post('/rest/items/{name}', self.post_command),
+            web.put('/rest/items/{name}/state', self.put_state),
+            web.put('/rest/items/{name}/metadata/{namespace}', self.put_metadata),
+            web.delete('/rest/items/{name}/metadata/{namespace}', self.delete_metadata),
+
+            web.get('/rest/things', self.get_things),
+            web.get('/rest/things/{uid}', self.get_thing),
+            web.put('/rest/things/{uid}/config', self.put_thing_config),
+            web.put('/rest/things/{uid}/enable', self.put_thing_enable),
+
+            web.get('/rest/links', self.get_links),
+            web.get('/rest/links/auto', self.get_links_auto),
+            web.get('/rest/links/{item}/{channel}', self.get_link),
+            web.put('/rest/links/{item}/{channel}', self.put_link),
+            web.delete('/rest/links/{item}/{channel}', self.delete_link),
+
+            web.get('/rest/persistence/items/{name}', self.get_persistence),
+        ])
+        return app
+
+    async def start(self):
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+
+        # port 0 -> use the port which was assigned
+        if not self.port:
+            self.port = self._runner.addresses[0][1]
+
+        self._tasks.append(asyncio.create_task(self._alive()))
+        if self.event_rate > 0:
+            self._tasks.append(asyncio.create_task(self._generate_events()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        for queue, _ in self._subscribers:
+            queue.put_nowait(None)
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------------------------------------------------------
+    def send_event(self, topic: str, payload: Any, event_type: str):
+        msg = dump({'topic': topic, 'payload': dump(payload), 'type': event_type})
+        for queue, topic_filter in self._subscribers:
+            if topic_filter is None or topic_filter.match(topic):
+                queue.put_nowait(msg)
+        self.events_sent += 1
+
+    def set_state(self, name: str, state: str):
+        item = self.items[name]
+        old_state = item['state']
+        item['state'] = state
+        self.history.setdefault(name, deque(maxlen=1000)).append({'time': int(time.time() * 1000), 'state': state})
+
+        payload = {'type': get_state_type(item, state), 'value': state}
+        self.send_event(f'openhab/items/{name}/state', payload, 'ItemStateEvent')
+        if old_state == state:
+            return None
+
+        payload['oldType'] = get_state_type(item, old_state)
+        payload['oldValue'] = old_state
+        self.send_event(f'openhab/items/{name}/statechanged', payload, 'ItemStateChangedEvent')
+        for group in item['groupNames']:
+            if group in self.items:
+                self.send_event(f'openhab/items/{group}/{name}/statechanged', payload, 'GroupItemStateChangedEvent')
+
+    async def _alive(self):
+        while True:
+            await asyncio.sleep(self.ALIVE_INTERVAL)
+            for queue, _ in self._subscribers:
+                queue.put_nowait('{"type":"ALIVE"}')
+
+    async def _generate_events(self):
+        names = [name for name, item in self.items.items() if item['type'] == 'Number']
+        if not names:
+            return None
+
+        interval = 0.01
+        pending = 0.0
+        while True:
+            await asyncio.sleep(interval)
+            pending += self.event_rate * interval
+            count = int(pending)
+            pending -= count
+            for _ in range(count):
+                self.set_state(random.choice(names), str(random.randint(0, 1000)))
+
+    async def get_events(self, request: web.Request) -> web.StreamResponse:
+        resp = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'})
+        await resp.prepare(request)
+
+        queue = asyncio.Queue()
+        entry = (queue, compile_topic_filter(request.query.get('topics')))
+        self._subscribers.add(entry)
+        try:
+            while True:
+                msg = await queue.get()
+                if msg is None:
+                    break
+                data = f'event: message\ndata: {msg}\n\n'
+                # send everything that is queued with one write
+                while not queue.empty():
+                    msg = queue.get_nowait()
+                    if msg is None:
+                        break
+                    data += f'event: message\ndata: {msg}\n\n'
+                await resp.write(data.encode('utf-8'))
+        finally:
+            self._subscribers.discard(entry)
+        return resp
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # System
+    # ------------------------------------------------------------------------------------------------------------------
+    async def get_root(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            'version': '5', 'locale': 'en_US',
+            'runtimeInfo': {'version': '3.4.0', 'buildString': 'HABApp openHAB emulator'}, 'links': [],
+        }, dumps=dump)
+
+    async def get_uuid(self, request: web.Request) -> web.Response:
+        return web.Response(text='00000000-0000-0000-0000-000000000000')
+
+    async def get_system_info(self, request: web.Request) -> web.Response:
+        return web.json_response({'systemInfo': {'startLevel': 100}}, dumps=dump)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Items
+    # ------------------------------------------------------------------------------------------------------------------
+    def _item_response(self, item: Dict[str, Any], metadata: Optional[str]) -> Dict[str, Any]:
+        ret = {k: v for k, v in item.items() if k != 'metadata'}
+        if metadata and 'metadata' in item:
+            pattern = re.compile(metadata)
+            ret['metadata'] = {k: v for k, v in item['metadata'].items() if pattern.fullmatch(k)}
+        return ret
+
+    async def get_items(self, request: web.Request) -> web.Response:
+        metadata = request.query.get('metadata')
+        return web.json_response([self._item_response(item, metadata) for item in self.items.values()], dumps=dump)
+
+    async def get_item(self, request: web.Request) -> web.Response:
+        item = self.items.get(request.match_info['name'])
+        if item is None:
+            return web.Response(status=404)
+        return web.json_response(self._item_response(item, request.query.get('metadata')), dumps=dump)
+
+    async def put_item(self, request: web.Request) -> web.Response:
+        name = request.match_info['name']
+        data = await request.json()
+
+        old = self.items.get(name)
+        item = {
+            'type': data['type'], 'name': name, 'label': data.get('label', ''), 'category': data.get('category', ''),
+            'tags': data.get('tags', []), 'groupNames': data.get('groupNames', []), 'editable': True, 'link': '',
+            'state': 'NULL' if old is None else old['state'],
+        }
+        if 'groupType' in data:
+            item['groupType'] = data['groupType']
+        if old is not None and 'metadata' in old:
+            item['metadata'] = old['metadata']
+        self.items[name] = item
+
+        event = {k: v for k, v in item.items() if k in ('type', 'name', 'label', 'category', 'tags', 'groupNames')}
+        if old is None:
+            self.send_event(f'openhab/items/{name}/added', event, 'ItemAddedEvent')
+            return web.json_response(item, status=201, dumps=dump)
+
+        old_event = {k: v for k, v in old.items() if k in ('type', 'name', 'label', 'category', 'tags', 'groupNames')}
+        self.send_event(f'openhab/items/{name}/updated', [event, old_event], 'ItemUpdatedEvent')
+        return web.json_response(item, dumps=dump)
+
+    async def delete_item(self, request: web.Request) -> web.Response:
+        name = request.match_info['name']
+        item = self.items.pop(name, None)
+        if item is None:
+            return web.Response(status=404)
+        self.history.pop(name, None)
+        self.send_event(f'openhab/items/{name}/removed', {'type': item['type'], 'name': name}, 'ItemRemovedEvent')
+        return web.Response()
+
+    async def put_state(self, request: web.Request) -> web.Response:
+        name = request.match_info['name']
+        if name not in self.items:
+            return web.Response(status=404)
+        self.set_state(name, await request.text())
+        return web.Response(status=202)
+
+    async def post_command(self, request: web.Request) -> web.Response:
+        name = request.match_info['name']
+        item = self.items.get(name)
+        if item is None:
+            return web.Response(status=404)
+
+        command = await request.text()
+        self.send_event(f'openhab/items/{name}/command',
+                        {'type': get_state_type(item, command), 'value': command}, 'ItemCommandEvent')
+        # autoupdate
+        self.set_state(name, command)
+        return web.Response()
+
+    async def put_metadata(self, request: web.Request) -> web.Response:
+        item = self.items.get(request.match_info['name'])
+        if item is None:
+            return web.Response(status=404)
+        data = await request.json()
+        item.setdefault('metadata', {})[request.match_info['namespace']] = {
+            'value': data.get('value', ''), 'config': data.get('config', {})}
+        return web.Response()
+
+    async def delete_metadata(self, request: web.Request) -> web.Response:
+        item = self.items.get(request.match_info['name'])
+        if item is None or item.get('metadata', {}).pop(request.match_info['namespace'], None) is None:
+            return web.Response(status=404)
+        return web.Response()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Things
+    # ------------------------------------------------------------------------------------------------------------------
+    async def get_things(self, request: web.Request) -> web.Response:
+        return web.json_response(list(self.things.values()), dumps=dump)
+
+    async def get_thing(self, request: web.Request) -> web.Response:
+        thing = self.things.get(request.match_info['uid'])
+        if thing is None:
+            return web.Response(status=404)
+        return web.json_response(thing, dumps=dump)
+
+    async def put_thing_config(self, request: web.Request) -> web.Response:
+        thing = self.things.get(request.match_info['uid'])
+        if thing is None:
+            return web.Response(status=404)
+        thing['configuration'].update(await request.json())
+        return web.json_response(thing, dumps=dump)
+
+    async def put_thing_enable(self, request: web.Request) -> web.Response:
+        thing = self.things.get(request.match_info['uid'])
+        if thing is None:
+            return web.Response(status=404)
+        enabled = (await request.text()) == 'true'
+        thing['statusInfo'] = {'status': 'ONLINE', 'statusDetail': 'NONE'} if enabled else \
+            {'status': 'UNINITIALIZED', 'statusDetail': 'DISABLED'}
+        return web.json_response(thing, dumps=dump)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Links
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _link_key(request: web.Request) -> Tuple[str, str]:
+        return unquote(request.match_info['item']), unquote(request.match_info['channel'])
+
+    async def get_links(self, request: web.Request) -> web.Response:
+        return web.json_response(list(self.links.values()), dumps=dump)
+
+    async def get_links_auto(self, request: web.Request) -> web.Response:
+        return web.json_response(False, dumps=dump)
+
+    async def get_link(self, request: web.Request) -> web.Response:
+        link = self.links.get(self._link_key(request))
+        if link is None:
+            return web.Response(status=404)
+        return web.json_response(link, dumps=dump)
+
+    async def put_link(self, request: web.Request) -> web.Response:
+        item, channel = self._link_key(request)
+        data = await request.json()
+        self.links[(item, channel)] = {
+            'itemName': item, 'channelUID': channel, 'configuration': data.get('configuration', {}), 'editable': True}
+        return web.Response()
+
+    async def delete_link(self, request: web.Request) -> web.Response:
+        if self.links.pop(self._link_key(request), None) is None:
+            return web.Response(status=404)
+        return web.Response()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------------------------------------------------------
+    async def get_persistence(self, request: web.Request) -> web.Response:
+        name = request.match_info['name']
+        if name not in self.items:
+            return web.Response(status=404)
+        data = list(self.history.get(name, ()))
+        return web.json_response({'name': name, 'datapoints': str(len(data)), 'data': data}, dumps=dump)
+
+
+async def _run(args: argparse.Namespace):
+    emulator = OpenhabEmulator(items=args.items, things=args.things, event_rate=args.rate,
+                               host=args.host, port=args.port)
+    await emulator.start()
+    print(f'openHAB emulator running on {emulator.url} ({len(emulator.items)} items, '
+          f'{len(emulator.things)} things, {args.rate} events/s)')
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await emulator.stop()
+
+
+def main(passed_args=None):
+    parser = argparse.ArgumentParser(description='Start a minimal openHAB emulator')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--items', type=int, default=100, help='Amount of generated items')
+    parser.add_argument('--things', type=int, default=10, help='Amount of generated things')
+    parser.add_argument('--rate', type=float, default=0, help='Random item state updates per second')
+    args = parser.parse_args(passed_args)
+
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
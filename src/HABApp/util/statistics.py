@@ -1,23 +1,32 @@
 import collections
-import statistics
+import math
 import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Union
 
 
 class Statistics:
     """Calculate mathematical statistics of numerical values.
+    The values are updated incrementally so adding a value is cheap even with many samples.
+    The values are kept in a sorted list so median and percentiles can be read directly. Inserting into and
+    removing from this list is O(n) because of the memmove, but that is a single memory move and in practice much
+    faster than a tree or two heaps implemented in Python for the typical amount of samples.
 
     :ivar sum: sum of all values
     :ivar min: minimum of all values
     :ivar max: maximum of all values
     :ivar mean: mean of all values
     :ivar median: median of all values
+    :ivar stdev: sample standard deviation of all values (``None`` if there are less than two values)
+    :ivar percentiles: the percentiles which were passed to the constructor (percentile -> value)
     :ivar last_value: last added value
     :ivar last_change: timestamp the last time a value was added
     """
-    def __init__(self, max_age=None, max_samples=None):
+    def __init__(self, max_age=None, max_samples=None, percentiles: Iterable[Union[int, float]] = ()):
         """
         :param max_age:     Maximum age of values in seconds
         :param max_samples: Maximum amount of samples which will be kept
+        :param percentiles: Percentiles which will be calculated, e.g. ``(90, 95)``
         """
 
         if max_age is None and max_samples is None:
@@ -28,16 +37,57 @@ class Statistics:
         self.timestamps = collections.deque(maxlen=max_samples)
         self.values = collections.deque(maxlen=max_samples)
 
+        # incremental state
+        self._sum: Union[int, float] = 0
+        self._sum_comp: float = 0       # compensation of the rounding errors of the sum
+        self._var_mean: float = 0       # mean and sum of the squared differences for the variance (Welford)
+        self._var_m2: float = 0
+        self._sorted: List[Union[int, float]] = []
+
+        self._percentiles = tuple(percentiles)
+        for p in self._percentiles:
+            if not 0 <= p <= 100:
+                raise ValueError(f'Percentile must be between 0 and 100! Is: {p}')
+
         self.sum: float = None
         self.min: float = None
         self.max: float = None
 
         self.mean: float = None
         self.median: float = None
+        self.stdev: Optional[float] = None
+        self.percentiles: Dict[Union[int, float], Optional[float]] = {p: None for p in self._percentiles}
 
         self.last_value: float = None
         self.last_change: float = None
 
+    def _add_sum(self, value: Union[int, float]):
+        # Neumaier summation, so removing values doesn't accumulate rounding errors
+        total = self._sum + value
+        if abs(self._sum) >= abs(value):
+            self._sum_comp += (self._sum - total) + value
+        else:
+            self._sum_comp += (value - total) + self._sum
+        self._sum = total
+
+    def _remove_oldest(self):
+        self.timestamps.popleft()
+        value = self.values.popleft()
+        del self._sorted[bisect_left(self._sorted, value)]
+
+        # reset so the rounding errors don't accumulate
+        if not (count := len(self.values)):
+            self._sum = 0
+            self._sum_comp = 0
+            self._var_mean = 0
+            self._var_m2 = 0
+            return None
+
+        self._add_sum(-value)
+        delta = value - self._var_mean
+        self._var_mean -= delta / count
+        self._var_m2 -= delta * (value - self._var_mean)
+
     def _remove_old(self):
         if self._max_age is None:
             return None
@@ -45,8 +95,27 @@ class Statistics:
         # remove too old entries
         now = time.time()
         while self.timestamps and (now - self.timestamps[0]) > self._max_age:
-            self.timestamps.popleft()
-            self.values.popleft()
+            self._remove_oldest()
+
+    def get_percentile(self, percent: Union[int, float]) -> Optional[float]:
+        """Return the percentile of the values (linear interpolation between the closest values)
+
+        :param percent: percentile, e.g. ``50`` for the median
+        :return: percentile or ``None`` if there are no values
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError(f'Percentile must be between 0 and 100! Is: {percent}')
+
+        values = self._sorted
+        if not values:
+            return None
+
+        pos = (len(values) - 1) * percent / 100
+        lower = math.floor(pos)
+        upper = math.ceil(pos)
+        if lower == upper:
+            return values[lower]
+        return values[lower] + (values[upper] - values[lower]) * (pos - lower)
 
     def update(self):
         """update values without adding a new value"""
@@ -61,13 +130,23 @@ class Statistics:
 
             self.mean = None
             self.median = None
+            self.stdev = None
+            for p in self._percentiles:
+                self.percentiles[p] = None
         else:
-            self.sum = sum(self.values)
-            self.min = min(self.values)
-            self.max = max(self.values)
+            values = self._sorted
+            self.sum = self._sum + self._sum_comp if self._sum_comp else self._sum
+            self.min = values[0]
+            self.max = values[-1]
 
-            self.mean = statistics.mean(self.values)
-            self.median = statistics.median(self.values)
+            self.mean = self.sum / __len
+
+            middle = __len // 2
+            self.median = values[middle] if __len % 2 else (values[middle - 1] + values[middle]) / 2
+
+            self.stdev = math.sqrt(max(self._var_m2, 0) / (__len - 1)) if __len >= 2 else None
+            for p in self._percentiles:
+                self.percentiles[p] = self.get_percentile(p)
 
         if __len >= 2:
             self.last_change = self.values[-1] - self.values[-2]
@@ -79,13 +158,27 @@ class Statistics:
 
         :param value: new value
         """
-        assert isinstance(value, (int, float)), type(value)
+        if not isinstance(value, (int, float)):
+            raise ValueError(f'Value must be int or float! Is: {value} ({type(value)})')
+        # nan can not be sorted and would break the ordering of the sorted values
+        if math.isnan(value):
+            raise ValueError(f'Value must not be nan! Is: {value}')
 
         self.last_value = value
 
+        # remove the oldest value here, so it's also removed from the incremental state
+        if len(self.values) == self.values.maxlen:
+            self._remove_oldest()
+
         self.timestamps.append(time.time())
         self.values.append(value)
 
+        self._add_sum(value)
+        delta = value - self._var_mean
+        self._var_mean += delta / len(self.values)
+        self._var_m2 += delta * (value - self._var_mean)
+        insort(self._sorted, value)
+
         self.update()
 
     def __repr__(self):
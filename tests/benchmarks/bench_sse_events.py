@@ -0,0 +1,58 @@
+"""Microbenchmark for the processing of the openHAB sse events.
+
+Run with ``python -m tests.benchmarks.bench_sse_events`` from the repository root.
+"""
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from HABApp.core.const.json import load_json
+from HABApp.openhab.map_events import get_event, get_event_fast
+from HABApp.rule_manager.benchmark.bench_times import BenchContainer
+
+CORPUS = Path(__file__).with_name('sse_events.txt')
+
+
+def load_corpus() -> List[str]:
+    with CORPUS.open(encoding='utf-8') as f:
+        return [line for line in f.read().splitlines() if line]
+
+
+def generic_path(event_str: str):
+    return get_event(load_json(event_str))
+
+
+def fast_path(event_str: str):
+    event = get_event_fast(event_str)
+    if event is None:
+        event = get_event(load_json(event_str))
+    return event
+
+
+def run(container: BenchContainer, name: str, func: Callable[[str], object], events: List[str], rounds: int):
+    b = container.create(name)
+    b.factor = len(events)
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for event in events:
+            func(event)
+        b.times.append(time.perf_counter() - start)
+
+
+def main(rounds: int = 2000):
+    events = load_corpus()
+    fast = sum(get_event_fast(e) is not None for e in events)
+    print(f'Corpus: {len(events)} events, {fast} handled by the fast path\n')
+
+    container = BenchContainer()
+    for title, selected in (
+            ('all', events),
+            ('state', [e for e in events if get_event_fast(e) is not None]),
+            ('other', [e for e in events if get_event_fast(e) is None])):
+        run(container, f'generic {title}', generic_path, selected, rounds)
+        run(container, f'fast {title}', fast_path, selected, rounds)
+    container.show()
+
+
+if __name__ == '__main__':
+    main()
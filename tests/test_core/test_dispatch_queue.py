@@ -0,0 +1,376 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event as ThreadingEvent
+from threading import Thread
+from time import sleep
+from typing import Callable, List, Tuple
+
+import pytest
+
+from HABApp.core.internals.wrapped_function.dispatch_queue import DispatchQueue
+
+
+class Event:
+    def __init__(self, name: str, value):
+        self.name = name
+        self.value = value
+
+
+class DelayedWorkers:
+    def __init__(self):
+        self.jobs: List[Tuple[Callable, tuple]] = []
+
+    def submit(self, func, *args):
+        self.jobs.append((func, args))
+
+    def run(self):
+        while self.jobs:
+            func, args = self.jobs.pop(0)
+            func(*args)
+
+
+@pytest.fixture
+def workers():
+    return DelayedWorkers()
+
+
+@pytest.fixture
+def queue(workers: DelayedWorkers):
+    q = DispatchQueue(workers.submit)
+    q.configure(1, 2)
+    return q
+
+
+def test_queue_fifo(queue: DispatchQueue, workers: DelayedWorkers):
+    calls = []
+    for i in range(3):
+        queue.submit(calls.append, (i, ))
+
+    # only one job is passed to the executor, the rest waits in the queue
+    assert len(workers.jobs) == 1
+    assert queue.size == 2
+
+    workers.run()
+    assert calls == [0, 1, 2]
+    assert queue.get_metrics() == {
+        'QueueSize': 0, 'Running': 0, 'Threads': 1, 'Resized': 0,
+        'QueueDropped': 0, 'QueueCoalesced': 0, 'QueueBlocked': 0}
+
+
+def test_drop_newest(queue: DispatchQueue, workers: DelayedWorkers):
+    calls = []
+    for i in range(5):
+        queue.submit(calls.append, (i, ), policy='drop_newest')
+    workers.run()
+
+    assert calls == [0, 1, 2]
+    assert queue.dropped == 2
+
+
+def test_drop_oldest(queue: DispatchQueue, workers: DelayedWorkers):
+    calls = []
+    other = []
+    queue.submit(calls.append, (0,))
+    queue.submit(other.append, (1,))
+    queue.submit(calls.append, (2,))
+
+    for i in range(3, 6):
+        queue.submit(calls.append, (i,), policy='drop_oldest')
+    workers.run()
+
+    # job of the other function is kept
+    assert calls == [0, 5]
+    assert other == [1]
+    assert queue.dropped == 3
+
+
+def test_drop_oldest_other_func(queue: DispatchQueue, workers: DelayedWorkers):
+    calls = []
+    other = []
+    for i in range(3):
+        queue.submit(other.append, (i,))
+    queue.submit(calls.append, ('a',), policy='drop_oldest')
+    workers.run()
+
+    assert calls == []
+    assert other == [0, 1, 2]
+    assert queue.dropped == 1
+
+
+def test_coalesce(queue: DispatchQueue, workers: DelayedWorkers):
+    calls = []
+
+    def cb(event: Event):
+        calls.append((event.name, event.value))
+
+    queue.submit(cb, (Event('a', 0),), policy='coalesce', key='a')
+    queue.submit(cb, (Event('a', 1),), policy='coalesce', key='a')
+    queue.submit(cb, (Event('b', 1),), policy='coalesce', key='b')
+    for i in range(2, 5):
+        queue.submit(cb, (Event('a', i),), policy='coalesce', key='a')
+    queue.submit(cb, (Event('c', 1),), policy='coalesce', key='c')
+    workers.run()
+
+    assert calls == [('a', 0), ('a', 4), ('b', 1)]
+    assert queue.coalesced == 3
+    assert queue.dropped == 1
+
+
+def test_unlimited(workers: DelayedWorkers):
+    queue = DispatchQueue(workers.submit)
+    queue.configure(2, 0)
+
+    calls = []
+    for i in range(100):
+        queue.submit(calls.append, (i,), policy='drop_newest')
+
+    assert len(workers.jobs) == 2
+    workers.run()
+    assert sorted(calls) == list(range(100))
+    assert queue.dropped == 0
+
+
+def test_error(queue: DispatchQueue, workers: DelayedWorkers):
+    calls = []
+
+    def err():
+        raise ValueError()
+
+    queue.submit(err)
+    queue.submit(calls.append, (1, ))
+    with pytest.raises(ValueError):
+        workers.run()
+
+    # queued job is passed to a new worker
+    workers.run()
+    assert calls == [1]
+    assert queue.get_metrics()['Running'] == 0
+
+
+def test_submit_error(workers: DelayedWorkers):
+    fail = True
+
+    def submit(func, *args):
+        if fail:
+            raise RuntimeError('cannot schedule new futures after shutdown')
+        workers.submit(func, *args)
+
+    queue = DispatchQueue(submit)
+    queue.configure(1, 0)
+
+    calls = []
+    with pytest.raises(RuntimeError):
+        queue.submit(calls.append, (0,), serial='a')
+    assert queue.get_metrics()['Running'] == 0
+    assert not queue._serial
+
+    # the next jobs are processed normally
+    fail = False
+    for i in range(1, 3):
+        queue.submit(calls.append, (i,), serial='a')
+    workers.run()
+    assert calls == [1, 2]
+    assert queue.get_metrics()['Running'] == 0
+
+
+def test_submit_error_extra_worker(workers: DelayedWorkers):
+    submits = 0
+
+    def submit(func, *args):
+        nonlocal submits
+        submits += 1
+        # the submit of the additional worker fails
+        if submits == 2:
+            raise RuntimeError()
+        workers.submit(func, *args)
+
+    queue = DispatchQueue(submit)
+    queue.configure(3, 0, min_workers=1, target_latency=0.01)
+    queue.grow_interval = 0
+
+    calls = []
+    for i in range(4):
+        queue.submit(calls.append, (i,))
+    sleep(0.02)
+    workers.run()
+
+    assert sorted(calls) == [0, 1, 2, 3]
+    assert queue.get_metrics()['Running'] == 0
+    assert queue.size == 0
+
+
+def test_configure_resets(queue: DispatchQueue, workers: DelayedWorkers):
+    for i in range(3):
+        queue.submit(print, (i,), serial='a')
+    queue.configure(1, 2)
+    assert queue.get_metrics()['Running'] == 0
+    assert queue.size == 0
+    assert not queue._serial
+
+
+def test_block(queue: DispatchQueue, workers: DelayedWorkers):
+    calls = []
+    for i in range(3):
+        queue.submit(calls.append, (i,))
+
+    thread = Thread(target=queue.submit, args=(calls.append, (3,)))
+    thread.start()
+    sleep(0.05)
+    assert thread.is_alive()
+    assert queue.blocked == 1
+
+    workers.run()
+    thread.join(1)
+    assert not thread.is_alive()
+
+    workers.run()
+    assert calls == [0, 1, 2, 3]
+
+
+def test_block_from_worker(queue: DispatchQueue, workers: DelayedWorkers, caplog):
+    calls = []
+
+    def cb():
+        # must not deadlock, the queue would grow without limit so the oldest jobs are dropped
+        for i in range(5):
+            queue.submit(calls.append, (i,))
+
+    queue.submit(cb)
+    workers.run()
+    assert calls == [3, 4]
+    assert queue.blocked == 0
+    assert queue.dropped == 3
+
+    # warning is logged only once
+    warnings = [r for r in caplog.records if r.name == 'HABApp.Worker']
+    assert len(warnings) == 1
+    assert warnings[0].levelname == 'WARNING'
+    assert not queue._full_warned
+
+
+def test_serial(workers: DelayedWorkers):
+    queue = DispatchQueue(workers.submit)
+    queue.configure(3, 0)
+
+    calls = []
+    for i in range(3):
+        queue.submit(calls.append, (('a', i),), serial='a')
+    queue.submit(calls.append, (('b', 0),), serial='b')
+    queue.submit(calls.append, (('c', 0),))
+
+    # only one job per serial key is scheduled
+    assert [args[0].args[0] for _, args in workers.jobs] == [('a', 0), ('b', 0), ('c', 0)]
+    assert queue.size == 2
+
+    # run the scheduled job of a, the next job of a is queued
+    func, args = workers.jobs.pop(0)
+    func(*args)
+    assert calls == [('a', 0), ('a', 1), ('a', 2)]
+
+    workers.run()
+    assert calls == [('a', 0), ('a', 1), ('a', 2), ('b', 0), ('c', 0)]
+    assert queue.size == 0
+    assert not queue._serial
+    assert queue.get_metrics()['Running'] == 0
+
+
+def test_serial_parallel(workers: DelayedWorkers):
+    queue = DispatchQueue(workers.submit)
+    queue.configure(2, 0)
+
+    calls = []
+    for i in range(2):
+        for key in 'abc':
+            queue.submit(calls.append, ((key, i),), serial=key)
+
+    assert len(workers.jobs) == 2
+    workers.run()
+
+    for key in 'abc':
+        assert [c for c in calls if c[0] == key] == [(key, 0), (key, 1)]
+    assert not queue._serial
+    assert queue.size == 0
+
+
+def test_serial_drop_oldest(queue: DispatchQueue, workers: DelayedWorkers):
+    calls = []
+    for i in range(5):
+        queue.submit(calls.append, (i,), policy='drop_oldest', serial='a')
+    workers.run()
+
+    assert calls == [0, 3, 4]
+    assert queue.dropped == 2
+    assert not queue._serial
+
+
+def test_adaptive_grow(workers: DelayedWorkers):
+    queue = DispatchQueue(workers.submit)
+    queue.configure(3, 0, min_workers=1, target_latency=0.01)
+    queue.grow_interval = 0
+    assert queue.workers == 1
+
+    calls = []
+    for i in range(6):
+        queue.submit(calls.append, (i,))
+    assert len(workers.jobs) == 1
+    sleep(0.02)
+
+    # the waiting jobs exceed the target latency so additional workers are started
+    workers.run()
+    assert sorted(calls) == list(range(6))
+    assert queue.workers == 3
+    assert queue.resized == 2
+    assert queue.get_metrics()['Running'] == 0
+
+
+def test_adaptive_grow_blocked():
+    executor = ThreadPoolExecutor(3)
+    queue = DispatchQueue(executor.submit)
+    queue.configure(3, 0, min_workers=1, target_latency=0.01)
+    queue.grow_interval = 0
+
+    release = ThreadingEvent()
+    calls = []
+    try:
+        # the only worker is blocked, so the workers can't resize when they finish a job
+        queue.submit(release.wait, (2,))
+        queue.submit(calls.append, (0,))
+        sleep(0.05)
+        for i in range(1, 5):
+            queue.submit(calls.append, (i,))
+
+        sleep(0.1)
+        assert sorted(calls) == list(range(5))
+        assert not release.is_set()
+        assert queue.workers == 2
+    finally:
+        release.set()
+        executor.shutdown()
+    assert queue.get_metrics()['Running'] == 0
+
+
+def test_adaptive_shrink(workers: DelayedWorkers):
+    queue = DispatchQueue(workers.submit)
+    queue.configure(3, 0, min_workers=1, target_latency=0.01)
+    queue.workers = 3
+    queue.shrink_after = 0
+
+    calls = []
+    for i in range(3):
+        queue.submit(calls.append, (i,))
+    assert len(workers.jobs) == 3
+    workers.run()
+
+    # no job had to wait
+    assert queue.workers == 1
+    assert queue.resized == 2
+
+
+def test_adaptive_bounds(workers: DelayedWorkers):
+    queue = DispatchQueue(workers.submit)
+    queue.configure(2, 0, min_workers=5)
+    assert queue.workers == 2
+    assert queue.min_workers == 2
+
+    queue.configure(4, 0)
+    assert queue.workers == 4
+    assert queue.min_workers == 4
@@ -1,8 +1,11 @@
+import asyncio
+from threading import Event, Thread
 from unittest.mock import MagicMock
 
-from HABApp.core.events import ComplexEventValue, ValueChangeEvent, ValueUpdateEvent
+from HABApp.core.events import CoalescedEvent, ComplexEventValue, ValueChangeEvent, ValueUpdateEvent
 from HABApp.core.events.filter import NoEventFilter, EventFilter, OrFilterGroup
-from HABApp.core.internals import EventBus, EventBusListener, wrap_func
+from HABApp.core.internals import EventBus, EventBusListener, wrap_func, CoalescingEventBusListener
+from HABApp.core.internals.event_bus.topic_index import TopicIndex, TopicPattern, is_topic_pattern
 
 
 class TestEvent:
@@ -76,3 +79,211 @@ def test_complex_event_unpack(sync_worker):
     # Events for first post_value
     assert vars(arg0) == vars(ValueUpdateEvent('test_complex', 'ValOld'))
     assert vars(arg1) == vars(ValueChangeEvent('test_complex', 'ValNew', 'ValOld'))
+
+
+def test_pattern_listener(sync_worker):
+    event_history = []
+    eb = EventBus()
+
+    def append_event(event):
+        event_history.append(event)
+    func = wrap_func(append_event)
+
+    prefix = EventBusListener('Temp_*', func, NoEventFilter())
+    pattern = EventBusListener('Temp_*_Sensor', func, NoEventFilter())
+    eb.add_listener(prefix)
+    eb.add_listener(pattern)
+
+    eb.post_event('Temp_Kitchen', 'prefix')
+    eb.post_event('Temp_Kitchen_Sensor', 'both')
+    eb.post_event('Humidity_Kitchen_Sensor', 'none')
+    eb.post_event('Temp', 'none')
+    assert event_history == ['prefix', 'both', 'both']
+
+    event_history.clear()
+    eb.remove_listener(prefix)
+    eb.post_event('Temp_Kitchen', 'prefix')
+    eb.post_event('Temp_Kitchen_Sensor', 'pattern')
+    assert event_history == ['pattern']
+
+    event_history.clear()
+    eb.remove_listener(pattern)
+    eb.post_event('Temp_Kitchen_Sensor', 'pattern')
+    assert event_history == []
+    assert not eb._pattern_listeners
+
+
+def test_pattern_listener_and_exact(sync_worker):
+    event_history = []
+    eb = EventBus()
+
+    def append_event(event):
+        event_history.append(event)
+    func = wrap_func(append_event)
+
+    eb.add_listener(EventBusListener('*', func, NoEventFilter()))
+    eb.add_listener(EventBusListener('Item', func, NoEventFilter()))
+
+    eb.post_event('Item', 'a')
+    eb.post_event('Other', 'b')
+    assert event_history == ['a', 'a', 'b']
+
+
+def test_pattern_wildcard():
+    # only '*' is a wildcard
+    assert not is_topic_pattern('Item?')
+    assert not is_topic_pattern('Item[1]')
+
+    pattern = TopicPattern('Temp_*[1]?')
+    assert pattern.matches('Temp_Kitchen[1]?')
+    assert not pattern.matches('Temp_Kitchen1a')
+    assert not pattern.matches('Temp_Kitchen[1]?a')
+
+
+def test_topic_cache_size(sync_worker):
+    index = TopicIndex(cache_size=2)
+    index.add(EventBusListener('Temp_*', wrap_func(lambda x: x), NoEventFilter()))
+
+    assert index.match('Temp_1')
+    assert not index.match('Other')
+    assert index.match('Temp_1')
+    assert index.match('Temp_2')
+    # the least recently used topic was evicted
+    assert list(index._cache) == ['Temp_1', 'Temp_2']
+
+
+def test_remove_during_notify(sync_worker):
+    event_history = []
+    eb = EventBus()
+
+    def cancel_listener(event):
+        event_history.append('first')
+        eb.remove_listener(first)
+
+    def append_event(event):
+        event_history.append(event)
+
+    first = EventBusListener('test', wrap_func(cancel_listener), NoEventFilter())
+    eb.add_listener(first)
+    eb.add_listener(EventBusListener('test', wrap_func(append_event), NoEventFilter()))
+
+    eb.post_event('test', 'event1')
+    eb.post_event('test', 'event2')
+    assert event_history == ['first', 'event1', 'event2']
+
+
+def test_add_remove_concurrent(sync_worker):
+    eb = EventBus()
+    stop = Event()
+    counter = {'count': 0}
+
+    def cb(event):
+        counter['count'] += 1
+
+    def churn(topic: str):
+        listeners = [EventBusListener(topic, wrap_func(cb), NoEventFilter()) for _ in range(20)]
+        while not stop.is_set():
+            for listener in listeners:
+                eb.add_listener(listener)
+            for listener in listeners:
+                eb.remove_listener(listener)
+
+    eb.add_listener(EventBusListener('test', wrap_func(cb), NoEventFilter()))
+    eb.add_listener(EventBusListener('test*', wrap_func(cb), NoEventFilter()))
+
+    threads = [Thread(target=churn, args=(t, )) for t in ('test', 'test*', 'tes*')]
+    for t in threads:
+        t.start()
+    try:
+        for _ in range(5000):
+            eb.post_event('test', 'event')
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+    # The permanent listeners must always be notified
+    assert counter['count'] >= 10_000
+    assert len(eb._listeners) == 1 and len(eb._listeners['test']) == 1
+    assert len(eb._pattern_listeners.match('test')) == 1
+
+
+class CountingFilter(EventFilter):
+    def __init__(self, event_class):
+        super().__init__(event_class)
+        self.calls = 0
+
+    def trigger(self, event) -> bool:
+        self.calls += 1
+        return super().trigger(event)
+
+    def get_event_classes(self):
+        # the custom trigger only matches the event class
+        return (self.event_class, )
+
+
+def test_type_index(sync_worker):
+    event_history = []
+    eb = EventBus()
+
+    def append_event(event):
+        event_history.append(event)
+    func = wrap_func(append_event)
+
+    f_update = CountingFilter(ValueUpdateEvent)
+    f_change = CountingFilter(ValueChangeEvent)
+    f_str = CountingFilter(str)
+    for f in (f_update, f_change, f_str):
+        eb.add_listener(EventBusListener('test', func, f))
+    eb.add_listener(EventBusListener('test', func, NoEventFilter()))
+    eb.add_listener(EventBusListener('te*', func, f_str))
+
+    eb.post_event('test', ValueUpdateEvent('test', 1))
+    assert (f_update.calls, f_change.calls, f_str.calls) == (1, 0, 0)
+    eb.post_event('test', ValueChangeEvent('test', 1, 2))
+    assert (f_update.calls, f_change.calls, f_str.calls) == (1, 1, 0)
+    eb.post_event('test', 'str_event')
+    assert (f_update.calls, f_change.calls, f_str.calls) == (1, 1, 2)
+    assert len(event_history) == 7
+
+    # Subclasses are matched, too
+    class UpdateSubclass(ValueUpdateEvent):
+        pass
+
+    eb.post_event('test', UpdateSubclass('test', 1))
+    assert (f_update.calls, f_change.calls, f_str.calls) == (2, 1, 2)
+    assert len(event_history) == 9
+
+
+async def test_coalescing_listener(parent_rule, sync_worker):
+    event_history = []
+    eb = EventBus()
+
+    skipped = []
+
+    def append_event(event: CoalescedEvent):
+        assert event.name == 'test'
+        event_history.append(event.event)
+        skipped.append(event.skipped)
+
+    listener = CoalescingEventBusListener('test', wrap_func(append_event), NoEventFilter(), 0.1,
+                                          parent_ctx=parent_rule._habapp_ctx)
+    eb.add_listener(listener)
+
+    # first event gets delivered immediately
+    for i in range(5):
+        eb.post_event('test', i)
+    assert event_history == [0]
+    assert skipped == [0]
+
+    # latest event is delivered at the end of the interval
+    await asyncio.sleep(0.15)
+    assert event_history == [0, 4]
+    assert skipped == [0, 3]
+    assert listener.skipped_total == 3
+
+    # pending events are dropped on cancel
+    eb.post_event('test', 5)
+    listener.cancel()
+    await asyncio.sleep(0.15)
+    assert event_history == [0, 4]
@@ -0,0 +1,56 @@
+import logging
+
+from HABApp.core.events import ValueUpdateEvent
+from HABApp.core.internals.event_bus.event_log import EventLogMsg, EventLogSampler, event_log, log_event
+
+
+class StrEvent:
+    def __init__(self):
+        self.called = 0
+
+    def __str__(self):
+        self.called += 1
+        return 'StrEvent'
+
+
+def test_msg():
+    assert str(EventLogMsg('Topic', 'val')) == "               Topic: 'val'"
+    assert str(EventLogMsg('Topic', 'a\nb')) == "               Topic: 'a\\nb'"
+    assert str(EventLogMsg('Topic', 'a' * 121)) == f"               Topic: '{'a' * 120} ...'"
+    assert str(EventLogMsg('Topic', ValueUpdateEvent('Topic', 1))) == \
+           '               Topic: <ValueUpdateEvent name: Topic, value: 1>'
+
+
+def test_lazy_format(caplog):
+    event = StrEvent()
+
+    caplog.set_level(logging.WARNING, event_log.name)
+    log_event('Topic', event)
+    assert not event.called
+
+    caplog.set_level(logging.INFO, event_log.name)
+    log_event('Topic', event)
+    assert event.called
+    assert caplog.records[-1].getMessage() == '               Topic: StrEvent'
+
+
+def test_sampler_topics():
+    s = EventLogSampler()
+    assert all(s.log_event('Power', 1) for _ in range(5))
+
+    s.set_rates({'Power': 3, 'Energy_*': 2}, {})
+    assert [s.log_event('Power', 1) for _ in range(7)] == [True, False, False, True, False, False, True]
+    assert [s.log_event('Energy_1', 1) for _ in range(4)] == [True, False, True, False]
+    assert [s.log_event('Energy_2', 1) for _ in range(2)] == [True, False]
+    assert all(s.log_event('Other', 1) for _ in range(5))
+
+
+def test_sampler_events():
+    s = EventLogSampler()
+    s.set_rates({'Power': 3}, {'ValueUpdateEvent': 2})
+
+    assert [s.log_event('Item', ValueUpdateEvent()) for _ in range(4)] == [True, False, True, False]
+    assert [s.log_event('Item', 'str') for _ in range(2)] == [True, True]
+
+    # topic takes precedence
+    assert [s.log_event('Power', ValueUpdateEvent()) for _ in range(4)] == [True, False, False, True]
@@ -88,3 +88,59 @@ def test_filter_groups_or():
     assert f.trigger(ValueChangeEvent(value=2)) is True
     assert f.trigger(ValueChangeEvent(value=1, old_value=3)) is False
     assert f.trigger(ValueChangeEvent(value=1, old_value=1)) is True
+
+
+def test_event_classes():
+    assert NoEventFilter().get_event_classes() is None
+    assert EventFilter(str).get_event_classes() == (str, )
+    assert ValueUpdateEventFilter().get_event_classes() == (ValueUpdateEvent, )
+
+    class CustomFilter(EventFilter):
+        def trigger(self, event) -> bool:
+            return True
+
+    assert CustomFilter(str).get_event_classes() is None
+
+    f = OrFilterGroup(ValueChangeEventFilter(old_value=1), ValueChangeEventFilter(value=2), ValueUpdateEventFilter())
+    assert f.get_event_classes() == (ValueChangeEvent, ValueUpdateEvent)
+    assert OrFilterGroup(ValueChangeEventFilter(), NoEventFilter()).get_event_classes() is None
+
+    f = AndFilterGroup(NoEventFilter(), OrFilterGroup(ValueChangeEventFilter(), ValueUpdateEventFilter()),
+                       ValueChangeEventFilter(value=2))
+    assert f.get_event_classes() == (ValueChangeEvent, )
+    assert AndFilterGroup(NoEventFilter(), NoEventFilter()).get_event_classes() is None
+
+
+def test_compile_trigger():
+    class CustomFilter(EventFilter):
+        def trigger(self, event) -> bool:
+            return getattr(event, 'value', None) == 5
+
+    filters = (
+        NoEventFilter(),
+        EventFilter(ValueUpdateEvent),
+        ValueUpdateEventFilter(value=2),
+        ValueChangeEventFilter(value=2),
+        ValueChangeEventFilter(old_value=1),
+        ValueChangeEventFilter(value=2, old_value=1),
+        OrFilterGroup(),
+        AndFilterGroup(),
+        OrFilterGroup(ValueChangeEventFilter(old_value=1), ValueChangeEventFilter(value=2)),
+        AndFilterGroup(ValueChangeEventFilter(old_value=1), ValueChangeEventFilter(value=2)),
+        AndFilterGroup(
+            OrFilterGroup(ValueUpdateEventFilter(value=5), ValueChangeEventFilter(value=5)),
+            OrFilterGroup(NoEventFilter(), ValueUpdateEventFilter(value=3)),
+        ),
+        CustomFilter(ValueUpdateEvent),
+        OrFilterGroup(CustomFilter(ValueUpdateEvent), ValueChangeEventFilter(old_value=1)),
+    )
+    events = (
+        'str', None, ValueUpdateEvent(), ValueUpdateEvent(value=2), ValueUpdateEvent(value=5),
+        ValueChangeEvent(), ValueChangeEvent(value=1), ValueChangeEvent(value=2), ValueChangeEvent(value=5),
+        ValueChangeEvent(value=2, old_value=1), ValueChangeEvent(value=1, old_value=1),
+    )
+
+    for f in filters:
+        trigger = f.compile_trigger()
+        for event in events:
+            assert trigger(event) is f.trigger(event), f'{f.describe()}: {event}'
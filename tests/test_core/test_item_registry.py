@@ -1,5 +1,7 @@
 from HABApp.core.items import Item
 from HABApp.core.internals import ItemRegistry
+from HABApp.openhab.items import OpenhabItem, SwitchItem
+from HABApp.openhab.items.base_item import MetaData
 
 
 def test_basics():
@@ -17,3 +19,68 @@ def test_basics():
 
     assert created_item == ir.pop_item(item_name)
     assert ir.get_items() == tuple()
+
+
+def test_index():
+    ir = ItemRegistry()
+    item1 = OpenhabItem('item_1', tags=frozenset(['tag1', 'tag2']), groups=frozenset(['grp1']),
+                        metadata={'meta1': MetaData('v1')})
+    item2 = SwitchItem('item_2', tags=frozenset(['tag2']), groups=frozenset(['grp1', 'grp2']))
+    item3 = Item('item_3')
+    for item in (item2, item1, item3):
+        ir.add_item(item)
+
+    # items are returned in the order they were added
+    assert ir.find_items() == (item2, item1, item3)
+    assert ir.find_items(OpenhabItem) == (item2, item1)
+    assert ir.find_items((SwitchItem, Item)) == (item2, item3)
+
+    assert ir.find_items(all_of=[('tag', 'tag2')]) == (item2, item1)
+    assert ir.find_items(all_of=[('tag', 'tag2'), ('group', 'grp2')]) == (item2, )
+    assert ir.find_items(all_of=[('tag', 'tag3')]) == ()
+    assert ir.find_items(any_of=[('metadata', 'meta1'), ('tag', 'tag2')]) == (item2, item1)
+    assert ir.find_items(any_of=[]) == ()
+    assert ir.find_items(SwitchItem, all_of=[('group', 'grp1')]) == (item2, )
+
+    assert sorted(ir.get_index_values('tag')) == ['tag1', 'tag2']
+    assert ir.get_index_values('metadata') == ('meta1', )
+
+    # update of the indexed values
+    item1.tags = frozenset(['tag3'])
+    ir.update_index(item1)
+    assert ir.find_items(all_of=[('tag', 'tag2')]) == (item2, )
+    assert ir.find_items(all_of=[('tag', 'tag3')]) == (item1, )
+
+    ir.pop_item(item1)
+    ir.pop_item(item2)
+    assert ir.get_index_values('tag') == ()
+    assert ir.find_items(all_of=[('group', 'grp1')]) == ()
+    assert ir._index == {}
+    assert ir._by_class == {Item: {'item_3'}}
+
+
+def test_bulk_update():
+    ir = ItemRegistry()
+    keep = ir.add_item(Item('keep'))
+    old = ir.add_item(OpenhabItem('old'))
+    changed = ir.add_item(OpenhabItem('changed', tags=frozenset(['tag1'])))
+    type_changed = ir.add_item(Item('type_changed'))
+
+    new_changed = OpenhabItem('changed', tags=frozenset(['tag2']))
+    new_type = SwitchItem('type_changed')
+    added = SwitchItem('added')
+
+    def update(existing: OpenhabItem, item: OpenhabItem):
+        existing.tags = item.tags
+
+    result = ir.bulk_update(
+        [new_changed, new_type, added], update=update, remove=lambda x: isinstance(x, OpenhabItem))
+
+    assert result.added == (new_type, added)
+    assert result.updated == (changed, )
+    assert result.removed == (type_changed, old)
+
+    assert ir.get_items() == (keep, changed, new_type, added)
+    assert changed.tags == frozenset(['tag2'])
+    assert ir.find_items(all_of=[('tag', 'tag2')]) == (changed, )
+    assert ir.find_items(all_of=[('tag', 'tag1')]) == ()
@@ -1,5 +1,6 @@
 import unittest
 from datetime import timedelta
+from time import time
 
 from pendulum import UTC
 from pendulum import now as pd_now
@@ -23,8 +24,8 @@ class TestCasesItem(unittest.TestCase):
     def test_time_update(self):
         i = Item('test')
         i.set_value('test')
-        i._last_change.set(pd_now(UTC) - timedelta(seconds=5), events=False)
-        i._last_update.set(pd_now(UTC) - timedelta(seconds=5), events=False)
+        i._last_change.set(time() - 5, events=False)
+        i._last_update.set(time() - 5, events=False)
         i.set_value('test')
 
         self.assertGreater(i._last_update.dt, pd_now(UTC) - timedelta(milliseconds=100))
@@ -33,8 +34,8 @@ class TestCasesItem(unittest.TestCase):
     def test_time_change(self):
         i = Item('test')
         i.set_value('test')
-        i._last_change.set(pd_now(UTC) - timedelta(seconds=5))
-        i._last_update.set(pd_now(UTC) - timedelta(seconds=5))
+        i._last_change.set(time() - 5)
+        i._last_update.set(time() - 5)
         i.set_value('test1')
 
         self.assertGreater(i._last_update.dt, pd_now(UTC) - timedelta(milliseconds=100))
@@ -1,6 +1,12 @@
 import asyncio
+import collections
+import random
+import statistics
+
+import pytest
 
 from HABApp.core.items import AggregationItem, Item
+from HABApp.core.items.aggregators import MinAggregator, TimeWeightedMeanAggregator, get_aggregator
 
 
 async def test_aggregation_item():
@@ -73,3 +79,94 @@ async def test_aggregation_item_cleanup():
 
     agg.aggregation_period(INTERVAL)
     assert list(agg._vals) == [7, 9]
+
+
+@pytest.mark.parametrize('name, func', (
+    ('count', lambda x: len([v for v in x if v is not None])),
+    ('sum', lambda x: sum(v for v in x if v is not None)),
+    ('mean', lambda x: statistics.mean(v for v in x if v is not None)),
+    ('min', lambda x: min(v for v in x if v is not None)),
+    ('max', lambda x: max(v for v in x if v is not None)),
+    ('variance', lambda x: statistics.variance(v for v in x if v is not None)),
+    ('pvariance', lambda x: statistics.pvariance(v for v in x if v is not None)),
+))
+def test_aggregators(name, func):
+    rnd = random.Random(1)
+    agg = get_aggregator(name)
+    window = collections.deque()
+
+    for i in range(500):
+        value = None if not i % 7 else rnd.choice((rnd.randint(-100, 100), rnd.random() * 10))
+        window.append(value)
+        agg.add(i, value)
+        while len(window) > 10:
+            agg.remove(0, window.popleft())
+
+        if sum(v is not None for v in window) < 2:
+            continue
+        assert agg.get(0, i) == pytest.approx(func(window)), i
+
+
+def test_aggregator_name():
+    assert isinstance(get_aggregator('min'), MinAggregator)
+    with pytest.raises(ValueError):
+        get_aggregator('asdf')
+
+
+def test_time_weighted_mean():
+    agg = TimeWeightedMeanAggregator()
+    assert agg.get(0, 10) is None
+
+    # invalid values are not added
+    with pytest.raises(ValueError):
+        agg.add(0, 'asdf')
+    assert agg.get(0, 10) is None
+
+    agg.add(0, 10)
+    assert agg.get(0, 10) == 10
+
+    agg.add(10, 20)
+    assert agg.get(0, 15) == pytest.approx(200 / 15)
+    # oldest value is only valid from the start of the window
+    assert agg.get(5, 15) == pytest.approx(150 / 10)
+
+    agg.add(15, 0)
+    agg.remove(0, 10)
+    assert agg.get(10, 20) == pytest.approx(100 / 10)
+    assert agg.get(12, 20) == pytest.approx(60 / 8)
+
+
+async def test_aggregation_item_named():
+    agg = AggregationItem.get_create_item('MyNamedAggregation')
+    src = Item.get_create_item('MyNamedSource')
+
+    INTERVAL = 0.2
+
+    agg.aggregation_period(INTERVAL * 3)
+    agg.aggregation_source(src)
+    agg.aggregation_func('max')
+
+    async def post_val(t, v):
+        await asyncio.sleep(t)
+        src.post_value(v)
+
+    asyncio.create_task(post_val(1 * INTERVAL, 5))
+    asyncio.create_task(post_val(2 * INTERVAL, 1))
+    asyncio.create_task(post_val(3 * INTERVAL, 3))
+
+    await asyncio.sleep(3 * INTERVAL + INTERVAL / 2)
+    assert agg.value == 5
+
+    # functions are always called with the values, only names use the incremental aggregation
+    agg.aggregation_func(max)
+    assert agg._AggregationItem__aggregator is None
+
+    # switching the aggregation uses the existing values
+    agg.aggregation_func('count')
+    src.post_value(2)
+    await asyncio.sleep(0.05)
+    assert agg.value == 4
+
+    await asyncio.sleep(INTERVAL * 2)
+    assert agg.value == 3
+    assert list(agg._vals) == [1, 3, 2]
@@ -0,0 +1,183 @@
+from datetime import timedelta
+from threading import Thread
+from time import time
+
+import pytest
+
+from HABApp.core.internals import HINT_ITEM_REGISTRY
+from HABApp.core.items import Item, ItemHistory
+from HABApp.core.items.item_history import HISTORY_BUDGET, HISTORY_SIZES
+from HABApp.openhab.items import StringItem
+
+
+def test_ring_buffer():
+    h = ItemHistory(3)
+    assert len(h) == 0
+    assert h.values() == []
+    assert h.last(2) == []
+    assert h.min() is None
+    assert h.mean() is None
+
+    h.append(1, 'a')
+    h.append(2, 'b')
+    assert h.last(5) == [(1, 'a'), (2, 'b')]
+
+    for i in range(3, 8):
+        h.append(i, i)
+        assert len(h) == 3
+    assert h.values() == [5, 6, 7]
+    assert h.last(2) == [(6, 6), (7, 7)]
+    assert h.last(0) == []
+
+    h.clear()
+    assert h.values() == []
+
+
+def test_concurrent_query():
+    h = ItemHistory(50)
+    done = False
+
+    def append():
+        for i in range(1, 50_000):
+            h.append(i, i)
+        nonlocal done
+        done = True
+
+    t = Thread(target=append)
+    t.start()
+    while not done:
+        entries = h.last(50)
+        # the entries must always be consistent
+        assert all(ts == value for ts, value in entries)
+        assert all(b[0] - a[0] == 1 for a, b in zip(entries, entries[1:]))
+    t.join()
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        ItemHistory(0)
+
+    h = ItemHistory(3)
+    h.append(time(), 1)
+    with pytest.raises(ValueError):
+        h.percentile(101)
+    with pytest.raises(ValueError):
+        h.values(-1)
+
+
+def test_window():
+    h = ItemHistory(10)
+    now = time()
+    for i in range(15):
+        h.append(now - 14 + i, i)
+
+    assert h.values(3.5) == [11, 12, 13, 14]
+    assert h.values(timedelta(seconds=3.5)) == [11, 12, 13, 14]
+    assert h.since(0.5) == [(now, 14)]
+    assert h.values(100) == list(range(5, 15))
+
+    assert h.min(3.5) == 11
+    assert h.max(3.5) == 14
+    assert h.mean(3.5) == 12.5
+    assert h.percentile(50) == 9
+    assert h.percentile(0) == 5
+    assert h.percentile(100) == 14
+
+
+def test_none_values():
+    h = ItemHistory(5)
+    h.append(1, None)
+    h.append(2, 4)
+    h.append(3, 2)
+    assert h.min() == 2
+    assert h.mean() == 3
+
+    # values which are not numbers are ignored
+    h.append(4, 'asdf')
+    h.append(5, (1, 2))
+    assert h.min() == 2
+    assert h.max() == 4
+    assert h.mean() == 3
+    assert h.percentile(50) == 2
+
+
+def test_item_history():
+    i = Item('test')
+    assert i.history is None
+
+    h = i.enable_history(5)
+    assert i.history is h
+    i.set_value(1)
+    i.post_value(2)
+    i.set_value(2)
+    assert h.values() == [1, 2, 2]
+    assert h.last(1)[0][0] == i._last_update.ts
+
+    # resizing keeps the newest values
+    h = i.enable_history(2)
+    assert h.values() == [2, 2]
+    h = i.enable_history(4)
+    assert h.values() == [2, 2]
+
+    i.disable_history()
+    assert i.history is None
+
+
+def test_budget(monkeypatch):
+    monkeypatch.setattr(HISTORY_BUDGET, 'max_entries', HISTORY_BUDGET.used + 10)
+
+    i1 = Item('test1')
+    i2 = Item('test2')
+    i1.enable_history(8)
+    with pytest.raises(ValueError):
+        i2.enable_history(3)
+
+    # replacing the history releases the old entries
+    i1.enable_history(10)
+    i1.disable_history()
+    i2.enable_history(3)
+    i2.disable_history()
+
+
+def test_registry_pattern(ir: HINT_ITEM_REGISTRY):
+    HISTORY_SIZES.set_sizes({'Temp_*': 20, 'Power': 10})
+    try:
+        temp = ir.add_item(Item('Temp_Living'))
+        power = ir.add_item(Item('Power'))
+        other = ir.add_item(Item('Other'))
+
+        assert temp.history.size == 20
+        assert power.history.size == 10
+        assert other.history is None
+
+        used = HISTORY_BUDGET.used
+        ir.pop_item('Temp_Living')
+        assert temp.history is None
+        assert HISTORY_BUDGET.used == used - 20
+
+        ir.pop_item('Power')
+        ir.pop_item('Other')
+    finally:
+        HISTORY_SIZES.set_sizes({})
+
+
+def test_registry_replace(ir: HINT_ITEM_REGISTRY):
+    HISTORY_SIZES.set_sizes({'Temp': 20})
+    try:
+        old = ir.add_item(Item('Temp', 1))
+        old.set_value(2)
+        h = old.history
+        used = HISTORY_BUDGET.used
+
+        # the history is kept when the item is replaced because the type has changed
+        new = StringItem('Temp', 'a')
+        result = ir.bulk_update([new], replace=lambda existing, item: item._take_history(existing))
+        assert result.removed == (old, )
+        assert new.history is h
+        assert old.history is None
+        assert h.values() == [2]
+        assert HISTORY_BUDGET.used == used
+
+        ir.pop_item('Temp')
+    finally:
+        HISTORY_SIZES.set_sizes({})
@@ -1,9 +1,9 @@
 import asyncio
+from time import time
 from unittest.mock import MagicMock
 
 import pytest
-from pendulum import UTC
-from pendulum import now as pd_now
+from pendulum import UTC, DateTime
 
 import HABApp
 import HABApp.core.items.tmp_data
@@ -12,11 +12,12 @@ from HABApp.core.items.base_item import ChangedTime, UpdatedTime
 from tests.helpers import TestEventBus
 from HABApp.core.internals import wrap_func, HINT_ITEM_REGISTRY, HINT_EVENT_BUS
 from HABApp.core.items import Item
+from eascheduler.const import local_tz
 
 
 @pytest.fixture(scope="function")
 def u():
-    a = UpdatedTime('test', pd_now(UTC))
+    a = UpdatedTime('test', time())
     w1 = a.add_watch(1)
     w2 = a.add_watch(3)
 
@@ -31,7 +32,7 @@ def u():
 
 @pytest.fixture(scope="function")
 def c():
-    a = ChangedTime('test', pd_now(UTC))
+    a = ChangedTime('test', time())
     w1 = a.add_watch(1)
     w2 = a.add_watch(3)
 
@@ -45,7 +46,7 @@ def c():
 
 
 def test_sec_timedelta(parent_rule):
-    a = UpdatedTime('test', pd_now(UTC))
+    a = UpdatedTime('test', time())
     w1 = a.add_watch(1)
 
     # We return the same object because it is the same time
@@ -65,31 +66,31 @@ async def test_rem(parent_rule, u: UpdatedTime):
 
 
 async def test_cancel_running(parent_rule, u: UpdatedTime):
-    u.set(pd_now(UTC))
+    u.set(time())
 
     w1 = u.tasks[0]
     w2 = u.tasks[1]
 
     await asyncio.sleep(1.1)
-    assert w1.fut.task.done()
-    assert not w2.fut.task.done()
+    assert not w1.fut.is_pending
+    assert w2.fut.is_pending
 
     assert w2 in u.tasks
     w2.cancel()
     await asyncio.sleep(0.05)
-    u.set(pd_now(UTC))
+    u.set(time())
     await asyncio.sleep(0.05)
     assert w2 not in u.tasks
 
 
 async def test_event_update(parent_rule, u: UpdatedTime, sync_worker, eb: HINT_EVENT_BUS):
     m = MagicMock()
-    u.set(pd_now(UTC))
+    u.set(time())
     list = HABApp.core.internals.EventBusListener('test', wrap_func(m, name='MockFunc'), NoEventFilter())
     eb.add_listener(list)
 
-    u.set(pd_now(UTC))
-    await asyncio.sleep(1)
+    u.set(time())
+    await asyncio.sleep(0.95)
     m.assert_not_called()
 
     await asyncio.sleep(0.1)
@@ -113,12 +114,12 @@ async def test_event_update(parent_rule, u: UpdatedTime, sync_worker, eb: HINT_E
 
 async def test_event_change(parent_rule, c: ChangedTime, sync_worker, eb: HINT_EVENT_BUS):
     m = MagicMock()
-    c.set(pd_now(UTC))
+    c.set(time())
     list = HABApp.core.internals.EventBusListener('test', wrap_func(m, name='MockFunc'), NoEventFilter())
     eb.add_listener(list)
 
-    c.set(pd_now(UTC))
-    await asyncio.sleep(1)
+    c.set(time())
+    await asyncio.sleep(0.95)
     m.assert_not_called()
 
     await asyncio.sleep(0.1)
@@ -206,3 +207,27 @@ async def test_watcher_update_cleanup(monkeypatch, parent_rule, c: ChangedTime,
 
     assert text_warning == 'Item test_save_restore has been deleted 0.7s ago even though it has item watchers.' \
                            ' If it will be added again the watchers have to be created again, too!'
+
+
+def test_timestamp_conversion():
+    a = UpdatedTime('test', DateTime(2001, 2, 3, 4, 5, 6, 789000, tzinfo=UTC).timestamp())
+    dt = a.dt
+    assert dt == DateTime(2001, 2, 3, 4, 5, 6, 789000, tzinfo=UTC)
+    assert a.dt is dt
+    assert a.local_dt is a.local_dt
+    assert a.local_dt.tzinfo is None
+    assert a.local_dt == dt.in_timezone(local_tz).naive()
+
+    a.set(DateTime(2001, 2, 3, 5, tzinfo=UTC).timestamp())
+    assert a.dt == DateTime(2001, 2, 3, 5, tzinfo=UTC)
+    assert a.age > 0
+
+
+def test_secs_since():
+    i = Item('test')
+    assert 0 <= i.secs_since_update < 1
+    assert 0 <= i.secs_since_change < 1
+
+    i._last_change.set(time() - 10, events=False)
+    assert 9.9 < i.secs_since_change < 11
+    assert i.secs_since_update < 1
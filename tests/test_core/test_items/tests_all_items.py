@@ -1,5 +1,6 @@
 import typing
 from datetime import timedelta
+from time import time
 
 from pendulum import UTC
 from pendulum import now as pd_now
@@ -43,8 +44,8 @@ class ItemTests:
         for value in self.TEST_VALUES:
             i = self.CLS('test')
             i.set_value(value)
-            i._last_change.set(pd_now(UTC) - timedelta(seconds=5), events=False)
-            i._last_update.set(pd_now(UTC) - timedelta(seconds=5), events=False)
+            i._last_change.set(time() - 5, events=False)
+            i._last_update.set(time() - 5, events=False)
             i.set_value(value)
 
             assert i._last_update.dt > pd_now(UTC) - timedelta(milliseconds=100)
@@ -53,8 +54,8 @@ class ItemTests:
     def test_time_value_change(self):
         i = self.CLS('test')
         for value in self.TEST_VALUES:
-            i._last_change.set(pd_now(UTC) - timedelta(seconds=5), events=False)
-            i._last_update.set(pd_now(UTC) - timedelta(seconds=5), events=False)
+            i._last_change.set(time() - 5, events=False)
+            i._last_update.set(time() - 5, events=False)
             i.set_value(value)
 
             assert i._last_update.dt > pd_now(UTC) - timedelta(milliseconds=100)
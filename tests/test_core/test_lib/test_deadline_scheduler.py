@@ -0,0 +1,105 @@
+import asyncio
+from threading import Thread
+from unittest.mock import MagicMock
+
+import pytest
+
+from HABApp.core.lib.deadline_scheduler import Deadline, DeadlineScheduler
+from tests.helpers import TestEventBus
+
+
+@pytest.fixture
+def scheduler():
+    return DeadlineScheduler()
+
+
+def test_invalid_secs(scheduler):
+    with pytest.raises(ValueError):
+        Deadline(lambda: None, -1, scheduler)
+    with pytest.raises(ValueError):
+        Deadline(lambda: None, '1', scheduler)
+
+
+async def test_run(scheduler):
+    m1 = MagicMock()
+    m2 = MagicMock()
+    d1 = Deadline(m1, 0.05, scheduler)
+    d2 = Deadline(m2, 0.1, scheduler)
+
+    d2.reset()
+    d1.reset()
+    assert d1.is_pending
+    assert len(scheduler) == 2
+
+    await asyncio.sleep(0.07)
+    m1.assert_called_once()
+    m2.assert_not_called()
+    assert not d1.is_pending
+
+    await asyncio.sleep(0.05)
+    m1.assert_called_once()
+    m2.assert_called_once()
+    assert len(scheduler) == 0
+
+
+async def test_reset(scheduler):
+    m = MagicMock()
+    d = Deadline(m, 0.1, scheduler)
+
+    for _ in range(4):
+        d.reset()
+        # moving the deadline doesn't create new entries
+        assert len(scheduler) == 1
+        await asyncio.sleep(0.05)
+        m.assert_not_called()
+
+    await asyncio.sleep(0.07)
+    m.assert_called_once()
+
+    # can be reset again
+    d.reset()
+    await asyncio.sleep(0.12)
+    assert m.call_count == 2
+
+
+async def test_cancel(scheduler):
+    m = MagicMock()
+    d = Deadline(m, 0.05, scheduler)
+    d.reset()
+    d.cancel()
+
+    d.reset()
+    assert not d.is_pending
+
+    await asyncio.sleep(0.07)
+    m.assert_not_called()
+    assert len(scheduler) == 0
+
+
+async def test_reset_thread(scheduler):
+    m = MagicMock()
+    d = Deadline(m, 0.05, scheduler)
+
+    t = Thread(target=d.reset)
+    t.start()
+    t.join()
+
+    await asyncio.sleep(0.07)
+    m.assert_called_once()
+
+
+async def test_exception(scheduler, caplog, eb: TestEventBus):
+    eb.allow_errors = True
+    m = MagicMock()
+
+    def fail():
+        raise ValueError('Fail')
+
+    d1 = Deadline(fail, 0.01, scheduler)
+    d2 = Deadline(m, 0.01, scheduler)
+    d1.reset()
+    d2.reset()
+
+    await asyncio.sleep(0.05)
+    m.assert_called_once()
+    assert 'Error Fail in fail:' in caplog.text
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from HABApp.core.lib.json_stream import JsonArrayStream
+
+
+DATA = [
+    {'name': 'a', 'value': 'with "quotes" and \\ backslash', 'list': [1, 2, {'nested': '}]'}]},
+    {'name': 'b', 'unicode': 'äöü € 😀', 'empty': {}},
+    {'name': 'c', 'escaped': '\\"}\\\\', 'tags': []},
+]
+
+
+@pytest.mark.parametrize('chunk_size', (1, 2, 3, 7, 64, 100_000))
+def test_json_stream(chunk_size: int):
+    data = json.dumps(DATA, ensure_ascii=False, indent=2).encode('utf-8')
+
+    stream = JsonArrayStream()
+    ret = []
+    for i in range(0, len(data), chunk_size):
+        ret.extend(stream.feed_bytes(data[i: i + chunk_size]))
+    stream.close()
+
+    assert ret == DATA
+
+
+def test_json_stream_objects_before_end():
+    stream = JsonArrayStream()
+    assert stream.feed('[{"a": 1}, {"b": ') == [{'a': 1}]
+    assert stream.feed('2}') == [{'b': 2}]
+    assert stream.feed(']') == []
+    stream.close()
+
+
+def test_json_stream_empty():
+    stream = JsonArrayStream()
+    assert stream.feed(' [ ] ') == []
+    stream.close()
+
+
+def test_json_stream_errors():
+    stream = JsonArrayStream()
+    stream.feed('[{"a": 1}')
+    with pytest.raises(ValueError):
+        stream.close()
+
+    with pytest.raises(ValueError):
+        JsonArrayStream().feed('{"a": 1}')
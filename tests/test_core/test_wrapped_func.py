@@ -1,4 +1,5 @@
 import asyncio
+import time
 from unittest.mock import AsyncMock
 from unittest.mock import Mock
 
@@ -9,6 +10,9 @@ from HABApp.core.const.topics import TOPIC_ERRORS as TOPIC_ERRORS
 from HABApp.core.events import NoEventFilter
 from HABApp.core.internals import EventBusListener
 from HABApp.core.internals import wrap_func
+from HABApp.core.internals.wrapped_function import profiler, wrapped_thread
+from HABApp.core.internals.wrapped_function.profiler import StackSamplingWatchdog
+from HABApp.core.internals.wrapped_function.wrapped_thread import WrappedThreadFunction
 from tests.helpers import TestEventBus
 
 
@@ -70,3 +74,63 @@ async def test_async_error_wrapper(eb: TestEventBus, name, func, sync_worker):
     assert err.func_name == name
     assert isinstance(err.exception, ZeroDivisionError)
     assert err.traceback.startswith('File ')
+
+
+def slow_func():
+    time.sleep(0.15)
+
+
+@pytest.mark.parametrize('mode', ('always', 'sampled', 'watchdog', 'off'))
+def test_profiler_modes(sync_worker, monkeypatch, caplog, mode):
+    monkeypatch.setattr(profiler, 'WARN_DURATION', 0.1)
+    monkeypatch.setattr(profiler, 'WATCHDOG', StackSamplingWatchdog(threshold=0.05, interval=0.02))
+    monkeypatch.setattr(profiler, 'SAMPLE_RATE', 2)
+    monkeypatch.setattr(profiler, 'MODE', mode)
+    monkeypatch.setattr(wrapped_thread, 'log_profile', log_profile := Mock())
+    profiler.WATCHDOG.start()
+
+    f = WrappedThreadFunction(slow_func)
+    try:
+        for _ in range(2):
+            caplog.clear()
+            f.run()
+            lines = [r.getMessage() for r in caplog.records]
+            assert lines[0].startswith('Execution of slow_func took too long')
+    finally:
+        profiler.WATCHDOG.stop()
+
+    assert log_profile.call_count == {'always': 2, 'sampled': 1}.get(mode, 0)
+    if mode == 'watchdog':
+        assert lines[1].startswith('Stack sampled ')
+        assert lines[-1].endswith('in slow_func')
+    else:
+        assert len(lines) == 1
+
+
+def test_profiler_sampled(sync_worker, monkeypatch):
+    monkeypatch.setattr(profiler, 'SAMPLE_RATE', 3)
+    monkeypatch.setattr(profiler, 'MODE', 'sampled')
+
+    f = WrappedThreadFunction(lambda: None)
+    assert [f._profile_sample() for _ in range(6)] == [False, False, True, False, False, True]
+
+
+def test_serial_key(parent_rule, monkeypatch):
+    submit = Mock()
+    monkeypatch.setattr(wrapped_thread.DISPATCH_QUEUE, 'submit', submit)
+
+    class Event:
+        name = 'item'
+
+    ctx = parent_rule._habapp_ctx
+    f_rule = WrappedThreadFunction(lambda x: None, context=ctx, serial='topic')
+    f_other = WrappedThreadFunction(lambda x: None, serial='topic')
+
+    # the same item in different rules must not wait for each other
+    f_rule.run(Event())
+    f_other.run(Event())
+    assert submit.call_args_list[0].kwargs['serial'] == ('topic', ctx, 'item')
+    assert submit.call_args_list[1].kwargs['serial'] == ('topic', f_other, 'item')
+
+    WrappedThreadFunction(lambda x: None, context=ctx, serial='rule').run(Event())
+    assert submit.call_args_list[2].kwargs['serial'] is ctx
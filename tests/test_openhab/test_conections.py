@@ -1,4 +1,8 @@
+from unittest.mock import Mock
+
+from HABApp.openhab.connection_handler import http_connection
 from HABApp.openhab.connection_handler.http_connection import is_disconnect_exception
+from tests.helpers import TestEventBus
 
 
 def test_aiohttp_sse_client_exceptions():
@@ -8,3 +12,40 @@ def test_aiohttp_sse_client_exceptions():
             raise k()
         except Exception as e:
             assert is_disconnect_exception(e)
+
+
+def state_event(name: str, type: str, value: str) -> str:
+    return f'{{"topic":"openhab/items/{name}/state",' \
+           f'"payload":"{{\\"type\\":\\"{type}\\",\\"value\\":\\"{value}\\"}}","type":"ItemStateEvent"}}'
+
+
+async def test_sse_invalid_state_event(monkeypatch, eb: TestEventBus):
+    eb.allow_errors = True
+
+    class FakeEventSource:
+        def __init__(self, **kwargs):
+            pass
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc_val, exc_tb):
+            return False
+
+        async def __aiter__(self):
+            for data in (state_event('Item1', 'Decimal', 'abc'), state_event('Item2', 'Decimal', '1')):
+                yield Mock(data=data)
+
+    events = []
+    set_offline = Mock()
+    monkeypatch.setattr(http_connection.sse_client, 'EventSource', FakeEventSource)
+    monkeypatch.setattr(http_connection, 'on_openhab_event', events.append)
+    monkeypatch.setattr(http_connection, 'set_offline', set_offline)
+
+    await http_connection.start_sse_event_listener()
+
+    # the invalid event is skipped and the listener keeps running
+    set_offline.assert_not_called()
+    assert len(events) == 1
+    assert events[0].name == 'Item2'
+    assert events[0].value == 1
@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any, List, Tuple
+
+from HABApp.openhab.connection_handler.output_queue import OutputQueue
+
+
+class Sender:
+    def __init__(self):
+        self.sent: List[Tuple[str, Any, bool]] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def send(self, item: str, state: Any, is_cmd: bool):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.sent.append((item, state, is_cmd))
+        self.running -= 1
+
+
+async def run_queue(q: OutputQueue, sender: Sender, workers: int):
+    task = asyncio.create_task(q.run(workers, sender.send, lambda e: None))
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if not q.size and not sender.running:
+            break
+    task.cancel()
+
+
+async def test_coalesce():
+    q = OutputQueue()
+    sender = Sender()
+
+    q.put('a', 1, False)
+    q.put('a', 2, False)
+    q.put('a', 'ON', True)
+    q.put('a', 'OFF', True)
+    q.put('a', 3, False)
+    q.put('a', 4, False)
+    q.put('b', 1, False)
+    assert q.size == 5
+    assert q.get_metrics()['Coalesced'] == 2
+
+    await run_queue(q, sender, 4)
+    assert [x for x in sender.sent if x[0] == 'a'] == [
+        ('a', 2, False), ('a', 'ON', True), ('a', 'OFF', True), ('a', 4, False)]
+    assert ('b', 1, False) in sender.sent
+
+    # at most one request per item
+    assert sender.max_running == 2
+    assert q._pending == {}
+
+    metrics = q.get_metrics()
+    assert metrics['Sent'] == 5
+    assert metrics['QueueSize'] == 0
+    assert metrics['LatencyMax'] >= metrics['LatencyMean'] > 0
+
+    # reading the metrics doesn't change them
+    assert q.get_metrics() == metrics
+
+    q.reset_metrics()
+    metrics = q.get_metrics()
+    assert metrics['LatencyMax'] == 0
+    assert metrics['LatencyMean'] == 0
+    assert metrics['Sent'] == 5
+
+
+async def test_concurrent():
+    q = OutputQueue()
+    sender = Sender()
+
+    for i in range(10):
+        q.put(f'item_{i}', i, True)
+
+    await run_queue(q, sender, 4)
+    assert sorted(sender.sent) == sorted((f'item_{i}', i, True) for i in range(10))
+    assert sender.max_running == 4
+
+
+async def test_error():
+    q = OutputQueue()
+    errors = []
+
+    async def send(item: str, state: Any, is_cmd: bool):
+        if state == 1:
+            raise ValueError()
+
+    q.put('a', 1, True)
+    q.put('a', 2, True)
+
+    task = asyncio.create_task(q.run(1, send, errors.append))
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert len(errors) == 1
+    assert q.get_metrics()['Errors'] == 1
+    assert q.sent == 1
@@ -0,0 +1,64 @@
+import pytest
+
+from HABApp.openhab.connection_handler.request_stats import Histogram, RequestStats, get_endpoint_template
+
+
+@pytest.mark.parametrize('url, template', (
+    ('/rest/items', '/rest/items'),
+    ('/rest/items?metadata=.+', '/rest/items'),
+    ('/rest/items/MyItem', '/rest/items/{name}'),
+    ('/rest/items/MyItem/state', '/rest/items/{name}/state'),
+    ('/rest/items/state/state', '/rest/items/{name}/state'),
+    ('/rest/items/MyItem/metadata/ns', '/rest/items/{name}/metadata/{id}'),
+    ('/rest/things/zwave:device:1/config', '/rest/things/{uid}/config'),
+    ('/rest/links/MyItem/zwave:device:1:channel', '/rest/links/{item}/{id}'),
+    ('/rest/persistence/items/MyItem', '/rest/persistence/items/{id}'),
+))
+def test_endpoint_template(url: str, template: str):
+    assert get_endpoint_template(url) == template
+
+
+def test_histogram():
+    h = Histogram()
+    assert h.percentile(95) == 0
+    assert h.mean == 0
+
+    for _ in range(90):
+        h.add(0.003)
+    for _ in range(10):
+        h.add(0.3)
+
+    assert h.count == 100
+    assert h.percentile(50) == 0.005
+    assert h.percentile(95) == 0.3
+    assert h.max == 0.3
+    assert h.mean == pytest.approx(0.0327)
+
+    h.add(20)
+    assert h.percentile(100) == 20
+
+
+def test_request_stats():
+    stats = RequestStats()
+    stats.get_endpoint('PUT', '/rest/items/a/state').add(0.01, 202, 5, 0)
+    stats.get_endpoint('PUT', '/rest/items/b/state').add(0.03, 404, 5, 10)
+    stats.get_endpoint('GET', '/rest/items').add(0.5, None, None, None)
+    stats.add_ping(0.02)
+
+    summary = stats.get_stats()
+    assert list(summary) == ['GET /rest/items', 'PING /rest/items/{name}/state', 'PUT /rest/items/{name}/state']
+
+    put = summary['PUT /rest/items/{name}/state']
+    assert put.count == 2
+    assert put.status == {202: 1, 404: 1}
+    assert put.bytes_sent == 10
+    assert put.bytes_received == 10
+    assert put.mean == pytest.approx(0.02)
+    assert summary['GET /rest/items'].errors == 1
+
+    metrics = stats.get_metrics()
+    assert metrics['PUT_items_name_state_Count'] == 2
+    assert metrics['PUT_items_name_state_LatencyMean'] == 20
+    assert metrics['PING_items_name_state_Count'] == 1
+    assert metrics['BytesSent'] == 10
+    assert metrics['InFlight'] == 0
@@ -0,0 +1,53 @@
+from HABApp.core.events import NoEventFilter
+from HABApp.core.internals import EventBus, EventBusListener, wrap_func
+from HABApp.openhab.connection_handler.topic_filter import BASE_FILTER, build_topic_filter
+
+
+def get_items(topic_filter: str):
+    parts = topic_filter.split(',')
+    assert tuple(parts[:len(BASE_FILTER)]) == BASE_FILTER
+    return parts[len(BASE_FILTER):]
+
+
+def test_topic_filter():
+    assert get_items(build_topic_filter([])) == []
+    assert get_items(build_topic_filter(['Item_B', 'Item_A', 'HABApp.Errors', 'mqtt/topic', 'zwave:device:1'])) == [
+        'openhab/items/Item_A/*', 'openhab/items/Item_B/*']
+
+    assert get_items(build_topic_filter(['Temp_*'])) == ['openhab/items/Temp_*/*']
+
+    # all items are required
+    assert build_topic_filter(['*']) is None
+    assert build_topic_filter(['Item_[ab]*']) is None
+
+    # patterns for topics which can not be items are ignored
+    assert get_items(build_topic_filter(['mqtt/*'])) == []
+
+
+def test_topic_filter_shorten():
+    names = [f'Room_{r}_Temp_{i}' for r in range(3) for i in range(100)]
+    base = len(','.join(BASE_FILTER))
+
+    assert get_items(build_topic_filter(names, base + 90)) == [
+        'openhab/items/Room_0_Temp_*/*', 'openhab/items/Room_1_Temp_*/*', 'openhab/items/Room_2_Temp_*/*']
+    assert get_items(build_topic_filter(names, base + 80)) == [
+        'openhab/items/Room_0_*/*', 'openhab/items/Room_1_*/*', 'openhab/items/Room_2_*/*']
+    assert get_items(build_topic_filter(names, base + 30)) == ['openhab/items/Room_*/*']
+    assert build_topic_filter(names, base + 10) is None
+
+
+def test_listener_topics(sync_worker):
+    eb = EventBus()
+    assert eb.get_listener_topics() == ()
+    version = eb.version
+
+    func = wrap_func(lambda x: x)
+    listener = EventBusListener('Item_A', func, NoEventFilter())
+    eb.add_listener(listener)
+    eb.add_listener(EventBusListener('Temp_*', func, NoEventFilter()))
+    assert eb.version == version + 2
+    assert sorted(eb.get_listener_topics()) == ['Item_A', 'Temp_*']
+
+    eb.remove_listener(listener)
+    assert eb.get_listener_topics() == ('Temp_*', )
+    assert eb.version == version + 3
@@ -5,7 +5,9 @@ from HABApp.openhab.events import ChannelTriggeredEvent, GroupItemStateChangedEv
     ItemStateChangedEvent, ItemStateEvent, ItemStatePredictedEvent, ItemUpdatedEvent, \
     ThingStatusInfoChangedEvent, ThingStatusInfoEvent, ThingFirmwareStatusInfoEvent, ChannelDescriptionChangedEvent, \
     ThingAddedEvent, ThingRemovedEvent, ThingUpdatedEvent
-from HABApp.openhab.map_events import get_event, EVENT_LIST
+from HABApp.core.const.json import load_json
+from HABApp.openhab.map_events import get_event, get_event_fast, EVENT_LIST
+from tests.benchmarks.bench_sse_events import load_corpus
 
 
 def test_ItemStateEvent():
@@ -276,3 +278,32 @@ def test_event_has_name(cls):
     # this test ensure that alle events have a name argument
     c = cls('asdf')
     assert c.name == 'asdf'
+
+
+def test_get_event_fast():
+    for line in load_corpus():
+        event = get_event_fast(line)
+        expected = get_event(load_json(line))
+        if event is None:
+            # the event types of the fast path must only be rejected if the payload contains escaped chars
+            if expected.__class__ in (ItemStateEvent, ItemStateChangedEvent, GroupItemStateChangedEvent):
+                assert '\\\\' in line
+            continue
+
+        assert event.__class__ is expected.__class__
+        # the values don't implement __eq__
+        assert {k: str(v) for k, v in vars(event).items()} == {k: str(v) for k, v in vars(expected).items()}
+
+    event = get_event_fast(
+        '{"topic":"openhab/items/Ping/state","payload":"{\\"type\\":\\"String\\",\\"value\\":\\"NONE\\"}",'
+        '"type":"ItemStateEvent","source":"abc"}'
+    )
+    assert isinstance(event, ItemStateEvent)
+    assert event.name == 'Ping'
+    assert event.value is None
+
+    # inconsistent topic and event type
+    assert get_event_fast(
+        '{"topic":"openhab/items/Ping/state","payload":"{\\"type\\":\\"String\\",\\"value\\":\\"1\\"}",'
+        '"type":"ItemStateChangedEvent"}'
+    ) is None
@@ -9,7 +9,8 @@ from HABApp.openhab.interface import \
     get_item, item_exists, remove_item, create_item, \
     get_thing, get_persistence_data, set_thing_enabled, \
     remove_metadata, set_metadata, \
-    get_channel_link, remove_channel_link, channel_link_exists, create_channel_link
+    get_channel_link, remove_channel_link, channel_link_exists, create_channel_link, \
+    get_request_stats
 
 
 @pytest.mark.parametrize('func', [
@@ -46,3 +47,8 @@ async def test_item_has_name(func, args):
     else:
         # call the function to make sure it doesn't raise an exception
         func(*args)
+
+
+def test_request_stats():
+    # does not do a request so it can be called from everywhere
+    assert isinstance(get_request_stats(), dict)
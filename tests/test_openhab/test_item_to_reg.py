@@ -1,6 +1,11 @@
+from HABApp.core.const.topics import TOPIC_ITEM_REGISTRY
+from HABApp.core.events import NoEventFilter
+from HABApp.core.events.habapp_events import ItemRegistrySyncEvent
 from HABApp.core.internals import ItemRegistry
-from HABApp.openhab.item_to_reg import MEMBERS, get_members
-from HABApp.openhab.items import StringItem
+from HABApp.core.items import Item
+from HABApp.openhab.item_to_reg import MEMBERS, ItemSync, get_members, refresh_item_state
+from HABApp.openhab.items import NumberItem, StringItem
+from tests.helpers import TestEventBus
 
 
 def test_get_members(monkeypatch, clean_objs, ir: ItemRegistry):
@@ -11,3 +16,78 @@ def test_get_members(monkeypatch, clean_objs, ir: ItemRegistry):
     monkeypatch.setitem(MEMBERS, 'test_grp', {d.name, c.name, b.name, a.name})
 
     assert get_members('test_grp') == (a, b, c, d)
+
+
+def test_item_sync(clean_objs, ir: ItemRegistry, eb: TestEventBus, sync_worker):
+    events = []
+    eb.listen_events(TOPIC_ITEM_REGISTRY, events.append, NoEventFilter())
+
+    a = ir.add_item(StringItem('a', 'old'))
+    ir.add_item(StringItem('b'))
+    c = ir.add_item(Item('c'))
+
+    new_a = StringItem('a', 'new', groups=frozenset(['grp']))
+    new_d = StringItem('d', groups=frozenset(['grp']))
+    sync = ItemSync()
+    sync.add([new_a])
+    sync.add([new_d])
+    sync.finish()
+
+    assert ir.get_items() == (a, c, new_d)
+    assert a.value == 'new'
+    assert MEMBERS == {'grp': {'a', 'd'}}
+
+    assert len(events) == 1
+    event = events[0]
+    assert isinstance(event, ItemRegistrySyncEvent)
+    assert event.added == ('d', )
+    assert event.updated == ('a', )
+    assert event.removed == ('b', )
+
+
+def test_refresh_item_state(clean_objs, ir: ItemRegistry, sync_worker):
+    a = ir.add_item(StringItem('a', 'old'))
+    b = ir.add_item(StringItem('b', 'same'))
+    c = ir.add_item(StringItem('c', 'old'))
+
+    assert refresh_item_state(StringItem('a', 'new'))
+    assert a.value == 'new'
+
+    assert not refresh_item_state(StringItem('b', 'same'))
+    assert not refresh_item_state(StringItem('d', 'new'))
+    assert not ir.item_exists('d')
+
+    # item type changed -> this is handled by the item sync
+    assert not refresh_item_state(NumberItem('c', 1))
+    assert c.value == 'old'
+    assert ir.get_item('c') is c
+    assert ir.get_item('b') is b
+
+
+def test_sync_members(clean_objs, ir: ItemRegistry, sync_worker):
+    MEMBERS.clear()
+    MEMBERS['old_grp'] = {'a'}
+
+    sync = ItemSync()
+    sync.add([StringItem('a', groups=frozenset(['grp']))])
+
+    # the members are replaced when the sync is finished
+    assert MEMBERS == {'old_grp': {'a'}}
+    sync.finish()
+    assert MEMBERS == {'grp': {'a'}}
+
+
+def test_sync_type_change_history(clean_objs, ir: ItemRegistry, sync_worker):
+    old = ir.add_item(StringItem('a', 'old'))
+    h = old.enable_history(5)
+    old.set_value('1')
+
+    new = NumberItem('a', 1)
+    sync = ItemSync()
+    sync.add([new])
+    sync.finish()
+
+    assert ir.get_item('a') is new
+    assert new.history is h
+    assert h.values() == ['1']
+    new.disable_history()
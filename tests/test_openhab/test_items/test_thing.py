@@ -7,10 +7,12 @@ from HABApp.openhab.events import ThingStatusInfoEvent, ThingUpdatedEvent
 from HABApp.openhab.items import Thing
 from HABApp.openhab.map_events import get_event
 from pendulum import set_test_now, DateTime, UTC
+from pendulum import now as pd_now
 
 
 @pytest.fixture(scope="function")
-def test_thing(ir: HINT_ITEM_REGISTRY):
+def test_thing(ir: HINT_ITEM_REGISTRY, monkeypatch):
+    monkeypatch.setattr(HABApp.openhab.items.thing_item, 'time', lambda: pd_now(UTC).timestamp())
     set_test_now(DateTime(2000, 1, 1, tzinfo=UTC))
     thing = HABApp.openhab.items.Thing('test_thing')
 
@@ -1,6 +1,8 @@
-from datetime import datetime
+from datetime import datetime, timezone
 
-from HABApp.openhab.map_values import map_openhab_values
+import pytest
+
+from HABApp.openhab.map_values import map_openhab_values, parse_datetime
 
 
 def test_type_none():
@@ -37,3 +39,31 @@ def test_quantity():
     q = map_openhab_values('Quantity', '22 W/m²')
     assert q.value == 22
     assert q.unit == 'W/m²'
+
+
+def test_type_datetime_parse():
+    for value in ('2022-05-04T18:22:13.034+0200', '2022-01-04T08:02:03.000-0530', '2022-10-30T01:30:00.999+0000',
+                  '1999-12-31T23:59:59.500+1400'):
+        expected = datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z').astimezone(None).replace(tzinfo=None)
+        assert parse_datetime(value) == expected
+
+    # other formats are still parsed
+    assert parse_datetime('2022-05-04T18:22:13.123456+02:00') == \
+        datetime(2022, 5, 4, 16, 22, 13, 123456, tzinfo=timezone.utc).astimezone(None).replace(tzinfo=None)
+
+
+def test_values():
+    # the values are mutable so they must not be shared
+    assert map_openhab_values('OnOff', 'ON') is not map_openhab_values('OnOff', 'ON')
+    assert map_openhab_values('OnOff', 'OFF').on is False
+    assert map_openhab_values('OpenClosed', 'OPEN').open is True
+    assert map_openhab_values('UpDown', 'DOWN').up is False
+    with pytest.raises(AssertionError):
+        map_openhab_values('OnOff', 'asdf')
+
+    p = map_openhab_values('Percent', '55.5')
+    assert p.value == 55.5
+    assert p is not map_openhab_values('Percent', '55.5')
+    assert map_openhab_values('HSB', '1,2,3').value == (1, 2, 3)
+    assert map_openhab_values('Quantity', '5 W') is not map_openhab_values('Quantity', '5 W')
+    assert map_openhab_values('String', 'asdf') == 'asdf'
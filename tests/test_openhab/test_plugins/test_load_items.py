@@ -0,0 +1,100 @@
+import logging
+from unittest.mock import AsyncMock
+
+from HABApp.core.internals import ItemRegistry
+from HABApp.openhab.connection_logic import plugin_load_items
+from HABApp.openhab.connection_logic.plugin_load_items import LoadAllOpenhabItems
+from HABApp.openhab.connection_logic.sync_cache import freeze, item_fingerprint
+from HABApp.openhab.items import NumberItem, StringItem, Thing
+
+
+def get_item(name: str, state: str, type='String', tags=(), metadata=None):
+    ret = {'name': name, 'type': type, 'state': state, 'label': None, 'tags': list(tags), 'groupNames': []}
+    if metadata is not None:
+        ret['metadata'] = metadata
+    return ret
+
+
+def get_thing(uid: str, status: str = 'ONLINE'):
+    return {
+        'UID': uid, 'thingTypeUID': 'test:type', 'label': 'Label', 'configuration': {'a': [1, 2]}, 'properties': {},
+        'channels': [], 'statusInfo': {'status': status, 'statusDetail': 'NONE'}, 'editable': True,
+    }
+
+
+def test_fingerprint():
+    assert freeze({'b': [1, {'c': 2}], 'a': 1}) == (('a', 1), ('b', (1, (('c', 2), ))))
+
+    assert item_fingerprint(get_item('a', '1', metadata={'m': {'value': 'v'}})) == \
+        item_fingerprint(get_item('a', '1', metadata={'m': {'value': 'v'}}))
+    assert item_fingerprint(get_item('a', '1')) != item_fingerprint(get_item('a', '2'))
+    assert item_fingerprint(get_item('a', '1')) != item_fingerprint(get_item('a', '1', tags=['t']))
+
+
+async def test_incremental_sync(monkeypatch, ir: ItemRegistry, sync_worker, caplog):
+    items = [get_item('a', 'val_a'), get_item('b', '1', type='Number'), get_item('c', 'val_c')]
+    things = [get_thing('test:thing:1'), get_thing('test:thing:2')]
+
+    async def get_items_stream(**kwargs):
+        # deliver the items in two batches
+        yield items[:1]
+        yield items[1:]
+
+    monkeypatch.setattr(plugin_load_items, 'async_get_items_stream', get_items_stream)
+    monkeypatch.setattr(plugin_load_items, 'async_get_things_raw', AsyncMock(side_effect=lambda: things))
+
+    plugin = LoadAllOpenhabItems()
+    await plugin.on_connect_function()
+
+    a = ir.get_item('a')
+    b = ir.get_item('b')
+    c = ir.get_item('c')
+    thing1 = ir.get_item('test:thing:1')
+    assert isinstance(a, StringItem)
+    assert isinstance(b, NumberItem)
+    assert isinstance(thing1, Thing)
+    assert b.value == 1
+
+    map_item = plugin_load_items.map_item
+    mapped = []
+
+    def map_item_spy(name, *args):
+        mapped.append(name)
+        return map_item(name, *args)
+
+    monkeypatch.setattr(plugin_load_items, 'map_item', map_item_spy)
+
+    # Nothing changed
+    caplog.set_level(logging.INFO, logger='HABApp.openhab.items')
+    caplog.clear()
+    await plugin.on_connect_function()
+    assert mapped == []
+    assert [r.message for r in caplog.records if r.name == 'HABApp.openhab.items'] == [
+        'Updated 3 Items (3 unchanged, 0 updated, 0 added, 0 removed)',
+        'Updated 2 Things (2 unchanged, 0 updated, 0 added, 0 removed)',
+    ]
+    assert ir.get_items() == (a, b, c, thing1, ir.get_item('test:thing:2'))
+
+    # Changed state, changed value through an event and removed item
+    items = [get_item('a', 'val_a'), get_item('b', '2', type='Number'), get_item('d', 'val_d')]
+    things = [get_thing('test:thing:1', 'OFFLINE')]
+    a.set_value('changed')
+
+    caplog.clear()
+    await plugin.on_connect_function()
+    assert [r.message for r in caplog.records if r.name == 'HABApp.openhab.items'] == [
+        'Updated 3 Items (0 unchanged, 2 updated, 1 added, 1 removed)',
+        'Updated 1 Things (0 unchanged, 1 updated, 0 added, 1 removed)',
+    ]
+    assert mapped == ['a', 'b', 'd']
+    assert ir.get_item('a') is a
+    assert a.value == 'val_a'
+    assert b.value == 2
+    assert not ir.item_exists('c')
+    assert not ir.item_exists('test:thing:2')
+    assert thing1.status == 'OFFLINE'
+
+    # Everything is cached again
+    mapped.clear()
+    await plugin.on_connect_function()
+    assert mapped == []
@@ -0,0 +1,65 @@
+import asyncio
+
+import aiohttp
+
+from HABApp.core.const.json import load_json
+from HABApp.openhab.events import ItemAddedEvent, ItemStateChangedEvent, ItemStateEvent
+from HABApp.openhab.map_events import get_event, get_event_fast
+from HABApp.rule_manager.benchmark.openhab_emulator import OpenhabEmulator
+
+
+async def read_events(resp: aiohttp.ClientResponse, count: int):
+    events = []
+    async for line in resp.content:
+        line = line.decode('utf-8').strip()
+        if line.startswith('data: '):
+            events.append(line[6:])
+            if len(events) >= count:
+                break
+    return events
+
+
+async def test_emulator():
+    emulator = OpenhabEmulator(items=5, things=2, port=0)
+    await emulator.start()
+    try:
+        async with aiohttp.ClientSession(emulator.url) as session:
+            async with session.get('/rest/systeminfo') as resp:
+                assert (await resp.json())['systemInfo']['startLevel'] == 100
+
+            async with session.get('/rest/items') as resp:
+                items = await resp.json()
+            assert len(items) == 5
+            async with session.get('/rest/things') as resp:
+                assert len(await resp.json()) == 2
+
+            async with session.get('/rest/events', params={'topics': 'openhab/items/*'}) as events:
+                await asyncio.sleep(0.05)
+
+                async with session.put('/rest/items/NewItem', json={'type': 'String', 'name': 'NewItem'}) as resp:
+                    assert resp.status == 201
+                async with session.put('/rest/items/NewItem/state', data='asdf') as resp:
+                    assert resp.status == 202
+
+                received = await asyncio.wait_for(read_events(events, 3), 5)
+
+            event = get_event(load_json(received[0]))
+            assert isinstance(event, ItemAddedEvent)
+            assert event.name == 'NewItem'
+
+            event = get_event_fast(received[1])
+            assert isinstance(event, ItemStateEvent)
+            assert event.value == 'asdf'
+
+            event = get_event_fast(received[2])
+            assert isinstance(event, ItemStateChangedEvent)
+            assert event.old_value is None
+
+            async with session.get('/rest/persistence/items/NewItem') as resp:
+                assert (await resp.json())['datapoints'] == '1'
+            async with session.delete('/rest/items/NewItem') as resp:
+                assert resp.status == 200
+            async with session.get('/rest/items/NewItem') as resp:
+                assert resp.status == 404
+    finally:
+        await emulator.stop()
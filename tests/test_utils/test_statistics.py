@@ -1,3 +1,5 @@
+import random
+import statistics
 import unittest
 
 from HABApp.util import Statistics
@@ -25,6 +27,69 @@ class TestCases(unittest.TestCase):
         stat.add_value(0)
         self.assertEqual(stat.median, 1.5)
 
+    def test_invalid_value(self):
+        stat = Statistics(max_samples=5)
+        stat.add_value(1)
+        for value in (None, 'asdf', float('nan')):
+            with self.assertRaises(ValueError):
+                stat.add_value(value)
+
+        # nothing was added
+        self.assertEqual(list(stat.values), [1])
+        self.assertEqual(len(stat.timestamps), 1)
+        self.assertEqual(stat.last_value, 1)
+
+    def test_max_samples(self):
+        rnd = random.Random(1)
+        stat = Statistics(max_samples=7, percentiles=(0, 25, 100))
+        values = []
+        for _ in range(200):
+            value = rnd.choice((rnd.randint(-20, 20), rnd.random() * 1000))
+            values = (values + [value])[-7:]
+            stat.add_value(value)
+
+            self.assertEqual(list(stat.values), values)
+            self.assertAlmostEqual(stat.sum, sum(values), places=8)
+            self.assertEqual(stat.min, min(values))
+            self.assertEqual(stat.max, max(values))
+            self.assertAlmostEqual(stat.mean, statistics.mean(values), places=8)
+            self.assertEqual(stat.median, statistics.median(values))
+            self.assertEqual(stat.percentiles[0], min(values))
+            self.assertEqual(stat.percentiles[100], max(values))
+            if len(values) >= 2:
+                self.assertAlmostEqual(stat.stdev, statistics.stdev(values), places=6)
+
+    def test_percentile(self):
+        stat = Statistics(max_samples=10, percentiles=(90, ))
+        self.assertIsNone(stat.get_percentile(50))
+        self.assertEqual(stat.percentiles, {90: None})
+
+        for i in range(1, 6):
+            stat.add_value(i * 10)
+        self.assertEqual(stat.get_percentile(50), 30)
+        self.assertEqual(stat.get_percentile(25), 20)
+        self.assertEqual(stat.get_percentile(90), 46)
+        self.assertEqual(stat.percentiles, {90: 46})
+        self.assertIsNone(Statistics(max_samples=1).stdev)
+
+        with self.assertRaises(ValueError):
+            stat.get_percentile(101)
+        with self.assertRaises(ValueError):
+            Statistics(max_samples=10, percentiles=(-1, ))
+
+    def test_max_age(self):
+        stat = Statistics(max_age=10)
+        stat.add_value(5)
+        stat.add_value(1)
+        stat.timestamps[0] -= 11
+        stat.update()
+        self.assertEqual(list(stat.values), [1])
+        self.assertEqual((stat.sum, stat.min, stat.max, stat.median, stat.stdev), (1, 1, 1, 1, None))
+
+        stat.timestamps[0] -= 11
+        stat.update()
+        self.assertEqual((stat.sum, stat.min, stat.max, stat.median), (None, None, None, None))
+
 
 if __name__ == '__main__':
     unittest.main()